@@ -0,0 +1,43 @@
+"""
+Authenticated Principal
+
+Slim identity resolved for every authenticated request.
+Only the columns needed for authorization are read, so authenticating a
+request never hydrates the User relationship graph.
+"""
+
+import uuid
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User, UserRole
+
+
+@dataclass(frozen=True, slots=True)
+class AuthPrincipal:
+    """Who is calling and which tenant they belong to."""
+
+    id: uuid.UUID
+    role: UserRole
+    university_id: uuid.UUID | None
+    is_active: bool
+
+
+async def load_principal(db: AsyncSession, user_id: uuid.UUID) -> AuthPrincipal | None:
+    """Load the principal for a user ID from the four auth columns only."""
+    result = await db.execute(
+        select(User.id, User.role, User.university_id, User.is_active).where(
+            User.id == user_id
+        )
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+    return AuthPrincipal(
+        id=row.id,
+        role=row.role,
+        university_id=row.university_id,
+        is_active=row.is_active,
+    )
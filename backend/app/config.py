@@ -45,6 +45,14 @@ class Settings(BaseSettings):
     SUPABASE_ANON_KEY: str = ""
     SUPABASE_SERVICE_ROLE_KEY: str = ""
     SUPABASE_STORAGE_BUCKET: str = "documents"
+    UPLOAD_CHUNK_SIZE: int = 256 * 1024  # bytes read/written per step while streaming an upload
+    UPLOAD_TIMEOUT_SECONDS: float = 60.0
+    STORAGE_BACKEND: str = "auto"  # "supabase" (REST), "supabase-sdk" (sync SDK in threads), "local"; auto: supabase if configured
+    STORAGE_MAX_CONNECTIONS: int = 20  # pooled HTTP connections to Supabase Storage
+    STORAGE_SDK_THREADS: int = 8  # worker threads for the sync SDK backend
+    SIGNED_URL_EXPIRES_SECONDS: int = 3600
+    SIGNED_URL_REFRESH_MARGIN_SECONDS: int = 300  # re-sign cached URLs this long before they expire
+    SIGNED_URL_CACHE_MAX_ENTRIES: int = 20000
 
     # ── JWT (hardcoded defaults – no env var needed) ─────
     JWT_SECRET_KEY: str = "campusai-secret-key-change-in-production-32c"
@@ -52,9 +60,55 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # ── AI Assistant ─────────────────────────────────────
+    LLM_PROVIDER: str = "openai"  # "openai", "fake" (deterministic, no network) or "none"
+    OPENAI_API_KEY: str = ""  # empty: rule-based fallback replies only
+    OPENAI_MODEL: str = "gpt-3.5-turbo"
+    LLM_TIMEOUT_SECONDS: float = 20.0  # per completion / per streamed chunk
+    LLM_MAX_CONNECTIONS: int = 50  # pooled HTTP connections to the provider
+    LLM_TENANT_CONCURRENCY: int = 8  # in-flight completions per university
+    LLM_QUEUE_TIMEOUT_SECONDS: float = 2.0  # wait for a tenant slot before falling back
+    LLM_BREAKER_FAILURE_RATE: float = 0.5
+    LLM_BREAKER_MIN_CALLS: int = 10
+    LLM_BREAKER_WINDOW: int = 50
+    LLM_BREAKER_COOLDOWN_SECONDS: float = 30.0
+    LLM_FAKE_LATENCY_SECONDS: float = 0.0
+    CHAT_CONTEXT_MESSAGES: int = 10  # conversation window sent to the model
+    CHAT_CONTEXT_CACHE_TTL_SECONDS: int = 300
+    CHAT_RESPONSE_CACHE_TTL_SECONDS: int = 3600
+    CHAT_RESPONSE_CACHE_MAX_ENTRIES: int = 5000
+    CHAT_RESPONSE_CACHE_MAX_WORDS: int = 12  # longer questions are too specific to share a reply
+
     # ── Rate Limiting ────────────────────────────────────
     RATE_LIMIT_PER_MINUTE: int = 60
 
+    # ── Cache ────────────────────────────────────────────
+    CACHE_BACKEND: str = "memory"  # "memory" (per process) or "redis" (shared)
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_MAX_ENTRIES: int = 10000
+    CACHE_DEFAULT_TTL_SECONDS: int = 300
+    CACHE_STATE_TOKEN_TTL_SECONDS: int = 86400
+    DASHBOARD_CACHE_TTL_SECONDS: int = 60
+    TIMETABLE_CACHE_TTL_SECONDS: int = 3600
+    DOCUMENT_ACCESS_CACHE_TTL_SECONDS: int = 300  # owner/tenant facts behind the file endpoint
+    DOCUMENT_FILE_MAX_AGE_SECONDS: int = 3600  # browser Cache-Control for served documents
+
+    # ── Real-time (WebSockets) ───────────────────────────
+    PUBSUB_BACKEND: str = "memory"  # "memory" (per process) or "redis" (all workers)
+    PUBSUB_REDIS_URL: str = "redis://localhost:6379/0"
+    PUBSUB_QUEUE_SIZE: int = 100  # events a subscriber may fall behind before it is disconnected
+
+    # ── Analytics ────────────────────────────────────────
+    ANALYTICS_RECONCILE_INTERVAL_SECONDS: int = 900  # 0 disables the background job
+    ESCALATION_DOCUMENT_AGE_DAYS: int = 3  # pending documents older than this are escalated
+
+    # ── Mentoring ────────────────────────────────────────
+    MENTOR_DEFAULT_CAPACITY: int = 30  # active students per mentor in batch matching
+
+    # ── Timetable Generator ──────────────────────────────
+    TIMETABLE_GENERATOR_MAX_WORKERS: int = 4  # size of the per-process generator pool (1 disables it)
+    TIMETABLE_GENERATOR_BACKTRACK_BUDGET: int = 20000  # search steps per attempt before finishing greedily
+
     @property
     def is_production(self) -> bool:
         return self.APP_ENV == "production"
@@ -0,0 +1,244 @@
+"""
+Application cache – named caches over a pluggable backend.
+
+- InMemoryCache: per-process LRU with per-entry TTL (default)
+- RedisCache: shared across workers, enabled with CACHE_BACKEND=redis
+
+Values must be JSON-serializable so both backends behave the same.
+Every named cache keeps hit/miss counters for the stats endpoint.
+
+State tokens version cached data per scope (a student, a university).
+Entries are keyed by the current token; invalidating a scope just issues a
+new token, so stale entries are never read again and age out on their own.
+"""
+
+import json
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import after_commit
+
+settings = get_settings()
+
+
+class CacheBackend(ABC):
+    """Key/value store with per-entry expiry."""
+
+    name = "abstract"
+
+    @abstractmethod
+    async def get(self, key: str) -> Any | None: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float) -> None: ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    async def clear(self) -> None: ...
+
+    def size(self) -> int | None:
+        return None
+
+
+class InMemoryCache(CacheBackend):
+    """Bounded LRU; expired entries are dropped lazily on read."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    async def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class RedisCache(CacheBackend):
+    """Redis-backed cache shared by all workers (requires the `redis` package)."""
+
+    name = "redis"
+
+    def __init__(self, url: str, prefix: str):
+        try:
+            from redis import asyncio as aioredis
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package") from exc
+        self._redis = aioredis.from_url(url)
+        self._prefix = prefix
+
+    async def get(self, key: str) -> Any | None:
+        raw = await self._redis.get(self._prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        await self._redis.set(self._prefix + key, json.dumps(value), px=max(int(ttl * 1000), 1))
+
+    async def delete(self, key: str) -> None:
+        await self._redis.delete(self._prefix + key)
+
+    async def clear(self) -> None:
+        async for key in self._redis.scan_iter(match=self._prefix + "*"):
+            await self._redis.delete(key)
+
+
+class Cache:
+    """A named cache with its own TTL and hit/miss counters."""
+
+    def __init__(self, name: str, backend: CacheBackend, ttl: float):
+        self.name = name
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._by_label: dict[str, list[int]] = {}
+
+    async def get(self, key: str, label: str | None = None) -> Any | None:
+        """Look up `key`; `label` (e.g. a tenant) additionally gets its own hit/miss counters."""
+        value = await self.backend.get(key)
+        hit = value is not None
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        if label is not None:
+            counters = self._by_label.setdefault(label, [0, 0])
+            counters[0 if hit else 1] += 1
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        await self.backend.set(key, value, self.ttl if ttl is None else ttl)
+
+    async def delete(self, key: str) -> None:
+        await self.backend.delete(key)
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+
+    def stats(self) -> dict:
+        stats = {
+            "backend": self.backend.name,
+            **_counter_stats(self.hits, self.misses),
+            "entries": self.backend.size(),
+            "ttl_seconds": self.ttl,
+        }
+        if self._by_label:
+            stats["by_label"] = {
+                label: _counter_stats(hits, misses) for label, (hits, misses) in self._by_label.items()
+            }
+        return stats
+
+
+def _counter_stats(hits: int, misses: int) -> dict:
+    lookups = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+    }
+
+
+_caches: dict[str, Cache] = {}
+
+
+def _make_backend(name: str, max_entries: int) -> CacheBackend:
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCache(settings.CACHE_REDIS_URL, prefix=f"campusai:{name}:")
+    return InMemoryCache(max_entries)
+
+
+def get_cache(name: str, ttl: float | None = None, max_entries: int | None = None) -> Cache:
+    """Return the named cache, creating it on first use."""
+    cache = _caches.get(name)
+    if cache is None:
+        backend = _make_backend(name, max_entries or settings.CACHE_MAX_ENTRIES)
+        cache = Cache(name, backend, ttl if ttl is not None else settings.CACHE_DEFAULT_TTL_SECONDS)
+        _caches[name] = cache
+    return cache
+
+
+def cache_stats() -> dict[str, dict]:
+    """Hit/miss counters for every cache created in this process."""
+    return {name: cache.stats() for name, cache in _caches.items()}
+
+
+# ── State tokens ─────────────────────────────────────────
+def _tokens() -> Cache:
+    return get_cache("state_tokens", ttl=settings.CACHE_STATE_TOKEN_TTL_SECONDS)
+
+
+def student_scope(user_id: uuid.UUID) -> str:
+    return f"student:{user_id}"
+
+
+def university_scope(university_id: uuid.UUID | None) -> str:
+    return f"university:{university_id}"
+
+
+def timetable_scope(university_id: uuid.UUID | None) -> str:
+    return f"timetable:{university_id}"
+
+
+async def state_token(scope: str) -> str:
+    """Current token for `scope`; a missing token is replaced, never reused."""
+    tokens = _tokens()
+    token = await tokens.get(scope)
+    if token is None:
+        token = uuid.uuid4().hex
+        await tokens.set(scope, token)
+    return token
+
+
+async def bump_state_token(scope: str) -> None:
+    await _tokens().set(scope, uuid.uuid4().hex)
+
+
+async def invalidate_scope(db: AsyncSession, scope: str) -> None:
+    """
+    Invalidate cached state for `scope` now and again after commit, so a read
+    that raced the write cannot leave an entry built from uncommitted data.
+    """
+    await bump_state_token(scope)
+    after_commit(db, lambda: bump_state_token(scope))
+
+
+async def invalidate_student(db: AsyncSession, user_id: uuid.UUID) -> None:
+    await invalidate_scope(db, student_scope(user_id))
+
+
+async def invalidate_university(db: AsyncSession, university_id: uuid.UUID | None) -> None:
+    await invalidate_scope(db, university_scope(university_id))
+
+
+async def invalidate_timetable(db: AsyncSession, university_id: uuid.UUID | None) -> None:
+    await invalidate_scope(db, timetable_scope(university_id))
@@ -1,28 +1,35 @@
 """
 FastAPI Dependencies – authentication and authorization.
+
+Two levels of identity are available to routes:
+- get_current_principal: id, role, university_id, is_active (one narrow query)
+- get_current_user: the full User row, without any relationships loaded
+
+Routes that only need to know who is calling should use the principal.
+Routes that need related objects must load them explicitly. Long-lived
+responses (streams) use get_streaming_principal, whose session is released
+before the handler runs.
 """
 
+import uuid
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.jwt_handler import decode_access_token
-from app.database import get_db
+from app.auth.principal import AuthPrincipal, load_principal
+from app.database import get_db, get_unit_of_work
+from app.models.loaders import LoadProfile, load_options
 from app.models.user import User, UserRole
 
 security_scheme = HTTPBearer()
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security_scheme),
-    db: AsyncSession = Depends(get_db),
-) -> User:
-    """
-    Extract and validate JWT from Authorization header.
-    Returns the authenticated User object.
-    """
-    token = credentials.credentials
-    payload = decode_access_token(token)
+def _token_subject(credentials: HTTPAuthorizationCredentials) -> uuid.UUID:
+    """Validate the bearer token and return the user ID it was issued for."""
+    payload = decode_access_token(credentials.credentials)
 
     if payload is None:
         raise HTTPException(
@@ -38,22 +45,75 @@ async def get_current_user(
             detail="Token missing subject claim",
         )
 
-    from sqlalchemy import select
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    try:
+        return uuid.UUID(user_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token subject",
+        )
 
-    if user is None:
+
+def _ensure_active(account: User | AuthPrincipal | None) -> None:
+    if account is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
 
-    if not user.is_active:
+    if not account.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Account is deactivated",
         )
 
+
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> AuthPrincipal:
+    """
+    Extract and validate JWT from Authorization header.
+    Returns the slim authenticated principal (no ORM object).
+    """
+    user_id = _token_subject(credentials)
+    principal = await load_principal(db, user_id)
+    _ensure_active(principal)
+    return principal
+
+
+async def get_streaming_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security_scheme),
+    unit_of_work=Depends(get_unit_of_work),
+) -> AuthPrincipal:
+    """
+    As get_current_principal, but loaded in its own short unit of work, so
+    no pooled connection stays checked out for the life of the response.
+    """
+    user_id = _token_subject(credentials)
+    async with unit_of_work() as db:
+        principal = await load_principal(db, user_id)
+    _ensure_active(principal)
+    return principal
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """
+    Extract and validate JWT from Authorization header.
+    Returns the authenticated User row. Relationships are not loaded and
+    raise on access; query related data explicitly.
+    """
+    user_id = _token_subject(credentials)
+    result = await db.execute(
+        select(User)
+        .options(*load_options(User, LoadProfile.AUTH))
+        .where(User.id == user_id)
+    )
+    user = result.scalar_one_or_none()
+    _ensure_active(user)
     return user
 
 
@@ -62,12 +122,12 @@ def require_role(*roles: UserRole):
     Factory for role-based access control dependency.
     Usage: dependencies=[Depends(require_role(UserRole.ADMIN))]
     """
-    async def role_checker(current_user: User = Depends(get_current_user)):
-        if current_user.role not in roles:
+    async def role_checker(principal: AuthPrincipal = Depends(get_current_principal)):
+        if principal.role not in roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Insufficient permissions. Required: {[r.value for r in roles]}",
             )
-        return current_user
+        return principal
 
     return role_checker
@@ -0,0 +1,226 @@
+"""
+Publish/subscribe hub for real-time pushes (WebSockets).
+
+Subscribers register per channel with this process's hub. Events go through
+a pluggable broker:
+- LocalBroker: in-process fan-out (default, single worker)
+- RedisBroker: Redis pub/sub, so every worker's subscribers see every event;
+  enabled with PUBSUB_BACKEND=redis
+
+Each subscription has a bounded queue. A consumer that falls PUBSUB_QUEUE_SIZE
+events behind is cut off (SlowConsumer) rather than buffering without limit or
+slowing down publishers; clients reconnect and catch up over REST.
+
+Events must be JSON-serializable so both brokers behave the same.
+"""
+
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from contextlib import asynccontextmanager, suppress
+from typing import Any
+
+from app.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+Deliver = Callable[[str, dict], None]
+
+
+class SlowConsumer(Exception):
+    """The subscriber's queue overflowed; events were dropped."""
+
+
+class Broker(ABC):
+    """Moves events from publishers to the hubs subscribed to a channel."""
+
+    name = "abstract"
+
+    @abstractmethod
+    async def publish(self, channel: str, event: dict) -> None: ...
+
+    async def subscribe(self, channel: str) -> None:
+        """Called when this process gains its first subscriber on `channel`."""
+
+    async def unsubscribe(self, channel: str) -> None:
+        """Called when this process loses its last subscriber on `channel`."""
+
+    async def close(self) -> None:
+        return None
+
+
+class LocalBroker(Broker):
+    """Delivers straight to this process's subscribers."""
+
+    name = "memory"
+
+    def __init__(self, deliver: Deliver):
+        self._deliver = deliver
+
+    async def publish(self, channel: str, event: dict) -> None:
+        self._deliver(channel, json.loads(json.dumps(event)))
+
+
+class RedisBroker(Broker):
+    """Redis pub/sub shared by all workers (requires the `redis` package)."""
+
+    name = "redis"
+
+    def __init__(self, url: str, prefix: str, deliver: Deliver):
+        try:
+            from redis import asyncio as aioredis
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError("PUBSUB_BACKEND=redis requires the 'redis' package") from exc
+        self._redis = aioredis.from_url(url)
+        self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        self._prefix = prefix
+        self._deliver = deliver
+        self._listener: asyncio.Task | None = None
+
+    async def publish(self, channel: str, event: dict) -> None:
+        await self._redis.publish(self._prefix + channel, json.dumps(event))
+
+    async def subscribe(self, channel: str) -> None:
+        await self._pubsub.subscribe(self._prefix + channel)
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def unsubscribe(self, channel: str) -> None:
+        await self._pubsub.unsubscribe(self._prefix + channel)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                message = await self._pubsub.get_message(timeout=1.0)
+            except Exception:  # connection hiccup: back off, the client reconnects
+                logger.exception("Redis pub/sub listener failed")
+                await asyncio.sleep(1.0)
+                continue
+            if message is None or message["type"] != "message":
+                continue
+            channel = message["channel"]
+            if isinstance(channel, bytes):
+                channel = channel.decode()
+            self._deliver(channel[len(self._prefix):], json.loads(message["data"]))
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._listener
+        await self._pubsub.aclose()
+        await self._redis.aclose()
+
+
+_OVERFLOW = object()
+
+
+class Subscription:
+    """One consumer's bounded queue on a channel; iterate it to receive events."""
+
+    def __init__(self, channel: str, maxsize: int):
+        self.channel = channel
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize + 1)  # +1 for the overflow marker
+        self._maxsize = maxsize
+        self.overflowed = False
+
+    def _offer(self, event: dict) -> bool:
+        """Queue `event`; on overflow drop the backlog and mark the subscription. Returns False if dropped."""
+        if self.overflowed:
+            return False
+        if self._queue.qsize() >= self._maxsize:
+            self.overflowed = True
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(_OVERFLOW)
+            return False
+        self._queue.put_nowait(event)
+        return True
+
+    async def get(self) -> dict:
+        event = await self._queue.get()
+        if event is _OVERFLOW:
+            raise SlowConsumer(self.channel)
+        return event
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> dict:
+        return await self.get()
+
+
+class PubSubHub:
+    """This process's subscriptions, fed by the configured broker."""
+
+    def __init__(self, queue_size: int, broker_factory: Callable[[Deliver], Broker] = LocalBroker):
+        self.queue_size = queue_size
+        self.broker = broker_factory(self._deliver)
+        self._channels: dict[str, set[Subscription]] = {}
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    async def publish(self, channel: str, event: dict) -> None:
+        self.published += 1
+        await self.broker.publish(channel, event)
+
+    def _deliver(self, channel: str, event: dict) -> None:
+        for subscription in list(self._channels.get(channel, ())):
+            if subscription._offer(event):
+                self.delivered += 1
+            else:
+                self.dropped += 1
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str):
+        subscription = Subscription(channel, self.queue_size)
+        subscribers = self._channels.setdefault(channel, set())
+        first = not subscribers
+        subscribers.add(subscription)
+        try:
+            if first:
+                await self.broker.subscribe(channel)
+            yield subscription
+        finally:
+            subscribers.discard(subscription)
+            if not subscribers:
+                self._channels.pop(channel, None)
+                await self.broker.unsubscribe(channel)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "broker": self.broker.name,
+            "channels": len(self._channels),
+            "subscribers": sum(len(s) for s in self._channels.values()),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "queue_size": self.queue_size,
+        }
+
+
+_hub: PubSubHub | None = None
+
+
+def get_hub() -> PubSubHub:
+    global _hub
+    if _hub is None:
+        if settings.PUBSUB_BACKEND == "redis":
+            _hub = PubSubHub(
+                settings.PUBSUB_QUEUE_SIZE,
+                lambda deliver: RedisBroker(settings.PUBSUB_REDIS_URL, "campusai:pubsub:", deliver),
+            )
+        else:
+            _hub = PubSubHub(settings.PUBSUB_QUEUE_SIZE)
+    return _hub
+
+
+async def close_hub() -> None:
+    global _hub
+    if _hub is not None:
+        await _hub.broker.close()
+        _hub = None
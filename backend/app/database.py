@@ -5,14 +5,18 @@ Async SQLAlchemy engine + session factory.
 Provides dependency injection for FastAPI routes.
 """
 
-from collections.abc import AsyncGenerator
+import logging
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from contextlib import asynccontextmanager
 
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
 from app.config import get_settings
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 engine = create_async_engine(
     settings.DATABASE_URL,
@@ -34,13 +38,79 @@ class Base(DeclarativeBase):
     pass
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+def dialect_insert(session: AsyncSession, table):
+    """
+    INSERT construct for the session's database, so callers can use
+    on_conflict_do_update / on_conflict_do_nothing (Postgres in production,
+    SQLite in tests).
+    """
+    if session.get_bind().dialect.name == "sqlite":
+        return sqlite.insert(table)
+    return postgresql.insert(table)
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], Awaitable[None]]) -> None:
+    """Run `callback` once the request's transaction has committed."""
+    session.info.setdefault("post_commit", []).append(callback)
+
+
+async def run_post_commit(session: AsyncSession) -> None:
+    """
+    Best effort: the transaction has already committed, so a failing callback
+    is logged and the rest still run.
+    """
+    for callback in session.info.pop("post_commit", []):
+        try:
+            await callback()
+        except Exception:
+            logger.warning("Post-commit callback failed", exc_info=True)
+
+
+def after_rollback(session: AsyncSession, callback: Callable[[], Awaitable[None]]) -> None:
+    """Run `callback` if the request's transaction rolls back instead (undo side effects)."""
+    session.info.setdefault("post_rollback", []).append(callback)
+
+
+async def run_post_rollback(session: AsyncSession) -> None:
+    """Best effort: runs while the original error propagates, so failures are only logged."""
+    for callback in session.info.pop("post_rollback", []):
+        try:
+            await callback()
+        except Exception:
+            logger.warning("Post-rollback callback failed", exc_info=True)
+
+
+@asynccontextmanager
+async def unit_of_work() -> AsyncGenerator[AsyncSession, None]:
+    """
+    A session that commits (then runs post-commit callbacks) or rolls back
+    (then runs post-rollback callbacks) on exit.
+    """
     async with async_session() as session:
         try:
             yield session
             await session.commit()
         except Exception:
+            session.info.pop("post_commit", None)
             await session.rollback()
+            await run_post_rollback(session)
             raise
         finally:
             await session.close()
+        # Outside the try: nothing after the commit can turn it into a rollback
+        session.info.pop("post_rollback", None)
+        await run_post_commit(session)
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    async with unit_of_work() as session:
+        yield session
+
+
+def get_unit_of_work() -> Callable[[], AsyncGenerator[AsyncSession, None]]:
+    """
+    Dependency for long-lived connections (WebSockets): open a short
+    unit_of_work per action instead of holding one session for the whole
+    connection.
+    """
+    return unit_of_work
@@ -4,14 +4,16 @@ CampusAI – FastAPI Application Entry Point
 Configures middleware, routers, exception handlers, and lifespan events.
 """
 
-import os
-from contextlib import asynccontextmanager
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
 from app.config import get_settings
+from app.core.pubsub import close_hub
+from app.database import async_session
 from app.routers import (
     admin,
     auth,
@@ -29,8 +31,25 @@ from app.routers import (
     users,
 )
 from app.routers import dashboard
+from app.services.analytics_service import AnalyticsService
+from app.services.llm_provider import close_llm
+from app.services.storage_backends import close_storage
+from app.services.timetable_service import close_generator_pool
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+async def _reconcile_analytics_periodically(interval: int) -> None:
+    """Recompute every university's analytics rollup to correct drift."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with async_session() as session:
+                await AnalyticsService.reconcile_all(session)
+                await session.commit()
+        except Exception:
+            logger.exception("Analytics reconciliation failed")
 
 
 # ── Lifespan ─────────────────────────────────────────────
@@ -39,8 +58,21 @@ async def lifespan(app: FastAPI):
     """Startup and shutdown events."""
     # Startup
     print(f"🚀 {settings.APP_NAME} starting in {settings.APP_ENV} mode")
+    reconcile_task = None
+    if settings.ANALYTICS_RECONCILE_INTERVAL_SECONDS > 0:
+        reconcile_task = asyncio.create_task(
+            _reconcile_analytics_periodically(settings.ANALYTICS_RECONCILE_INTERVAL_SECONDS)
+        )
     yield
     # Shutdown
+    if reconcile_task is not None:
+        reconcile_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await reconcile_task
+    await close_llm()
+    await close_hub()
+    await close_storage()
+    close_generator_pool()
     print(f"👋 {settings.APP_NAME} shutting down")
 
 
@@ -89,9 +121,3 @@ async def health_check():
         "service": settings.APP_NAME,
         "environment": settings.APP_ENV,
     }
-
-
-# ── Serve local uploads ─────────────────────────────────
-uploads_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "uploads")
-os.makedirs(uploads_dir, exist_ok=True)
-app.mount("/uploads", StaticFiles(directory=uploads_dir), name="uploads")
@@ -7,9 +7,9 @@ All SQLAlchemy models are imported here for Alembic auto-detection.
 from app.models.university import University, SubscriptionPlan
 from app.models.user import User, UserRole
 from app.models.onboarding import OnboardingChecklist, ChecklistItem
-from app.models.document import Document, DocumentStatus
+from app.models.document import Document, DocumentStatus, StoredBlob
 from app.models.payment import Payment, PaymentStatus
-from app.models.hostel import HostelApplication, RoomType, ApplicationStatus
+from app.models.hostel import HostelApplication, HostelRoom, RoomType, ApplicationStatus
 from app.models.lms import LMSActivation
 from app.models.chat import ChatSession, ChatMessage
 from app.models.notification import Notification
@@ -17,6 +17,7 @@ from app.models.course import Course, Subject, Enrollment, EnrollmentStatus
 from app.models.timetable import SubjectSchedule, DayOfWeek
 from app.models.mentor import MentorAssignment, MentorMeeting, MentorMessage, MeetingStatus
 from app.models.compliance import ComplianceItem, StudentCompliance, ComplianceType
+from app.models.analytics import UniversityAnalytics
 
 __all__ = [
     "University",
@@ -27,9 +28,11 @@ __all__ = [
     "ChecklistItem",
     "Document",
     "DocumentStatus",
+    "StoredBlob",
     "Payment",
     "PaymentStatus",
     "HostelApplication",
+    "HostelRoom",
     "RoomType",
     "ApplicationStatus",
     "LMSActivation",
@@ -49,4 +52,5 @@ __all__ = [
     "ComplianceItem",
     "StudentCompliance",
     "ComplianceType",
+    "UniversityAnalytics",
 ]
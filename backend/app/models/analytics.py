@@ -0,0 +1,41 @@
+"""
+Per-university onboarding analytics rollup.
+One row per university, maintained incrementally by the service layer and
+periodically reconciled against the source tables.
+"""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, ForeignKey, Integer, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class UniversityAnalytics(Base):
+    __tablename__ = "university_analytics"
+
+    university_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("universities.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    total_students: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    onboarding_completed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    documents_total: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    documents_approved: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    documents_pending: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    payments_revenue: Mapped[float] = mapped_column(Float, default=0, nullable=False)
+    payments_pending: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    hostel_pending: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    hostel_allocated: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    reconciled_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return f"<UniversityAnalytics {self.university_id}>"
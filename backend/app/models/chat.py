@@ -6,7 +6,7 @@ Stores conversation history for context-aware AI responses.
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -36,10 +36,14 @@ class ChatSession(Base):
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
+    __table_args__ = (
+        Index("ix_chat_sessions_user_updated", "user_id", "updated_at", "id"),
+    )
+
     # Relationships
-    user = relationship("User", back_populates="chat_sessions")
+    user = relationship("User", back_populates="chat_sessions", lazy="raise")
     messages = relationship(
-        "ChatMessage", back_populates="session", lazy="selectin",
+        "ChatMessage", back_populates="session", lazy="raise",
         order_by="ChatMessage.created_at",
     )
 
@@ -64,8 +68,12 @@ class ChatMessage(Base):
         DateTime(timezone=True), server_default=func.now()
     )
 
+    __table_args__ = (
+        Index("ix_chat_messages_session_created", "session_id", "created_at", "id"),
+    )
+
     # Relationships
-    session = relationship("ChatSession", back_populates="messages")
+    session = relationship("ChatSession", back_populates="messages", lazy="raise")
 
     def __repr__(self) -> str:
         preview = self.content[:50] + "..." if len(self.content) > 50 else self.content
@@ -84,5 +84,5 @@ class StudentCompliance(Base):
     )
 
     # Relationships
-    user = relationship("User", lazy="selectin")
-    compliance_item = relationship("ComplianceItem", lazy="selectin")
+    user = relationship("User", lazy="raise")
+    compliance_item = relationship("ComplianceItem", lazy="raise")
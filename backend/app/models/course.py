@@ -48,8 +48,8 @@ class Course(Base):
     )
 
     # Relationships
-    university = relationship("University", lazy="selectin")
-    subjects = relationship("Subject", back_populates="course", lazy="selectin")
+    university = relationship("University", lazy="raise")
+    subjects = relationship("Subject", back_populates="course", lazy="raise")
 
 
 class Subject(Base):
@@ -84,8 +84,8 @@ class Subject(Base):
     )
 
     # Relationships
-    course = relationship("Course", back_populates="subjects", lazy="selectin")
-    schedules = relationship("SubjectSchedule", back_populates="subject", lazy="selectin")
+    course = relationship("Course", back_populates="subjects", lazy="raise")
+    schedules = relationship("SubjectSchedule", back_populates="subject", lazy="raise")
 
 
 class Enrollment(Base):
@@ -131,6 +131,6 @@ class Enrollment(Base):
     )
 
     # Relationships
-    user = relationship("User", lazy="selectin")
-    course = relationship("Course", lazy="selectin")
-    subject = relationship("Subject", lazy="selectin")
+    user = relationship("User", lazy="raise")
+    course = relationship("Course", lazy="raise")
+    subject = relationship("Subject", lazy="raise")
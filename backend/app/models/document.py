@@ -7,7 +7,7 @@ import enum
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, Enum, ForeignKey, String, Text, func
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Integer, String, Text, UniqueConstraint, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -41,6 +41,7 @@ class Document(Base):
     file_url: Mapped[str] = mapped_column(String(512), nullable=False)
     file_size: Mapped[int] = mapped_column(default=0)  # bytes
     mime_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)  # SHA-256 → StoredBlob
     status: Mapped[DocumentStatus] = mapped_column(
         Enum(DocumentStatus), default=DocumentStatus.PENDING, nullable=False
     )
@@ -58,9 +59,54 @@ class Document(Base):
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
+    __table_args__ = (
+        # Admin review queue / escalation aging: only pending rows are indexed.
+        Index(
+            "ix_documents_pending_queue",
+            "university_id", "status", "created_at",
+            postgresql_where=text("status = 'PENDING'"),
+            sqlite_where=text("status = 'PENDING'"),
+        ),
+    )
+
     # Relationships
-    user = relationship("User", back_populates="documents", foreign_keys=[user_id])
-    reviewer = relationship("User", foreign_keys=[reviewed_by], lazy="selectin")
+    user = relationship("User", back_populates="documents", foreign_keys=[user_id], lazy="raise")
+    reviewer = relationship("User", foreign_keys=[reviewed_by], lazy="raise")
 
     def __repr__(self) -> str:
         return f"<Document {self.document_type} – {self.status.value}>"
+
+
+class StoredBlob(Base):
+    """
+    One stored file, addressed by its SHA-256 within a university.
+    Documents with identical content share a blob; `ref_count` tracks how
+    many do, and the file is removed when the last one goes.
+    """
+
+    __tablename__ = "stored_blobs"
+    __table_args__ = (
+        UniqueConstraint("university_id", "content_hash", name="uq_stored_blobs_university_hash"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    university_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("universities.id"), nullable=False,
+    )
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    storage_path: Mapped[str] = mapped_column(String(512), nullable=False)
+    file_url: Mapped[str] = mapped_column(String(512), nullable=False)
+    file_size: Mapped[int] = mapped_column(Integer, nullable=False)
+    mime_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    ref_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return f"<StoredBlob {self.content_hash[:12]} ×{self.ref_count}>"
@@ -1,12 +1,12 @@
 """
-Hostel application and room allocation model.
+Hostel room inventory, applications and room allocation models.
 """
 
 import enum
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Integer, String, Text, func
+from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Integer, String, Text, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -19,6 +19,14 @@ class RoomType(str, enum.Enum):
     TRIPLE = "triple"
 
 
+# Beds per room unless a room says otherwise
+ROOM_TYPE_CAPACITY = {
+    RoomType.SINGLE: 1,
+    RoomType.DOUBLE: 2,
+    RoomType.TRIPLE: 3,
+}
+
+
 class ApplicationStatus(str, enum.Enum):
     PENDING = "pending"
     APPROVED = "approved"
@@ -50,6 +58,9 @@ class HostelApplication(Base):
         String(50), nullable=True
     )
     allocated_block: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    room_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("hostel_rooms.id", ondelete="SET NULL"), nullable=True, index=True,
+    )
     floor: Mapped[int | None] = mapped_column(Integer, nullable=True)
     special_requirements: Mapped[str | None] = mapped_column(Text, nullable=True)
     admin_notes: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -67,7 +78,40 @@ class HostelApplication(Base):
     )
 
     # Relationships
-    user = relationship("User", back_populates="hostel_application", foreign_keys=[user_id])
+    user = relationship("User", back_populates="hostel_application", foreign_keys=[user_id], lazy="raise")
 
     def __repr__(self) -> str:
         return f"<HostelApplication {self.room_type_preference.value} – {self.status.value}>"
+
+
+class HostelRoom(Base):
+    """One room of a university's hostel inventory (block → floor → room)."""
+
+    __tablename__ = "hostel_rooms"
+    __table_args__ = (
+        UniqueConstraint("university_id", "block", "room_number", name="uq_hostel_rooms_block_number"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    university_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("universities.id"), nullable=False, index=True,
+    )
+    block: Mapped[str] = mapped_column(String(50), nullable=False)
+    floor: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    room_number: Mapped[str] = mapped_column(String(50), nullable=False)
+    room_type: Mapped[RoomType] = mapped_column(Enum(RoomType), nullable=False)
+    capacity: Mapped[int] = mapped_column(Integer, nullable=False)
+    occupied: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    is_accessible: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return f"<HostelRoom {self.block}-{self.room_number} {self.occupied}/{self.capacity}>"
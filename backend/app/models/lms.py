@@ -42,7 +42,7 @@ class LMSActivation(Base):
     )
 
     # Relationships
-    user = relationship("User", back_populates="lms_activation")
+    user = relationship("User", back_populates="lms_activation", lazy="raise")
 
     def __repr__(self) -> str:
         status = "activated" if self.is_activated else "inactive"
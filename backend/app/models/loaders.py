@@ -0,0 +1,83 @@
+"""
+Loader profiles for ORM relationships.
+
+Every relationship is declared with lazy="raise", so nothing related is
+fetched unless a query asks for it. Services pick a profile describing the
+object graph they render and pass it to their select():
+
+    select(MentorAssignment).options(*load_options(MentorAssignment, LoadProfile.ADMIN_LIST))
+
+Profiles:
+- AUTH:       the row itself, nothing related
+- DASHBOARD:  labels needed for the student-facing summaries
+- ADMIN_LIST: labels needed for admin list rows (names / emails only)
+- DETAIL:     everything a single-object view renders
+"""
+
+import enum
+
+from sqlalchemy.orm import joinedload, raiseload
+from sqlalchemy.orm.interfaces import ORMOption
+
+from app.models.course import Course, Enrollment, Subject
+from app.models.document import Document
+from app.models.mentor import MentorAssignment, MentorMeeting, MentorMessage
+from app.models.timetable import SubjectSchedule
+from app.models.user import User
+
+
+class LoadProfile(str, enum.Enum):
+    AUTH = "auth"
+    DASHBOARD = "dashboard"
+    ADMIN_LIST = "admin_list"
+    DETAIL = "detail"
+
+
+def _user_label(attr) -> ORMOption:
+    """Join a related User, reading only what is shown next to a row."""
+    return joinedload(attr).load_only(User.first_name, User.last_name, User.email)
+
+
+def _subject_label(attr) -> ORMOption:
+    return joinedload(attr).load_only(Subject.name, Subject.code)
+
+
+_SCHEDULE_WITH_SUBJECT = (_subject_label(SubjectSchedule.subject),)
+_ASSIGNMENT_PEOPLE = (
+    _user_label(MentorAssignment.student),
+    _user_label(MentorAssignment.mentor),
+)
+_MEETING_PEOPLE = (
+    _user_label(MentorMeeting.student),
+    _user_label(MentorMeeting.mentor),
+)
+
+_PROFILES: dict[tuple[LoadProfile, type], tuple[ORMOption, ...]] = {
+    (LoadProfile.AUTH, User): (),
+    (LoadProfile.DASHBOARD, Enrollment): (
+        _subject_label(Enrollment.subject),
+        joinedload(Enrollment.course).load_only(Course.name),
+    ),
+    (LoadProfile.DASHBOARD, SubjectSchedule): _SCHEDULE_WITH_SUBJECT,
+    (LoadProfile.DASHBOARD, MentorMeeting): _MEETING_PEOPLE,
+    (LoadProfile.ADMIN_LIST, SubjectSchedule): _SCHEDULE_WITH_SUBJECT,
+    (LoadProfile.ADMIN_LIST, Document): (_user_label(Document.user),),
+    (LoadProfile.ADMIN_LIST, MentorAssignment): _ASSIGNMENT_PEOPLE,
+    (LoadProfile.ADMIN_LIST, MentorMeeting): _MEETING_PEOPLE,
+    (LoadProfile.ADMIN_LIST, MentorMessage): (_user_label(MentorMessage.sender),),
+    (LoadProfile.DETAIL, SubjectSchedule): _SCHEDULE_WITH_SUBJECT,
+    (LoadProfile.DETAIL, Document): (
+        _user_label(Document.user),
+        _user_label(Document.reviewer),
+    ),
+    (LoadProfile.DETAIL, MentorAssignment): _ASSIGNMENT_PEOPLE,
+    (LoadProfile.DETAIL, MentorMeeting): _MEETING_PEOPLE,
+}
+
+
+def load_options(model: type, profile: LoadProfile) -> list[ORMOption]:
+    """
+    Loader options for `model` under `profile`.
+    Anything the profile does not name stays unloaded and raises on access.
+    """
+    return [*_PROFILES.get((profile, model), ()), raiseload("*")]
@@ -7,7 +7,7 @@ import uuid
 from datetime import date, datetime, time
 
 from sqlalchemy import (
-    Boolean, Date, DateTime, Enum, ForeignKey, String, Text, Time,
+    Boolean, Date, DateTime, Enum, ForeignKey, Index, String, Text, Time,
     UniqueConstraint, func,
 )
 from sqlalchemy.dialects.postgresql import UUID
@@ -58,10 +58,10 @@ class MentorAssignment(Base):
     )
 
     # Relationships
-    student = relationship("User", foreign_keys=[student_id], lazy="selectin")
-    mentor = relationship("User", foreign_keys=[mentor_id], lazy="selectin")
-    meetings = relationship("MentorMeeting", back_populates="assignment", lazy="selectin")
-    messages = relationship("MentorMessage", back_populates="assignment", lazy="selectin")
+    student = relationship("User", foreign_keys=[student_id], lazy="raise")
+    mentor = relationship("User", foreign_keys=[mentor_id], lazy="raise")
+    meetings = relationship("MentorMeeting", back_populates="assignment", lazy="raise")
+    messages = relationship("MentorMessage", back_populates="assignment", lazy="raise")
 
 
 class MentorMeeting(Base):
@@ -104,9 +104,9 @@ class MentorMeeting(Base):
     )
 
     # Relationships
-    assignment = relationship("MentorAssignment", back_populates="meetings", lazy="selectin")
-    student = relationship("User", foreign_keys=[student_id], lazy="selectin")
-    mentor = relationship("User", foreign_keys=[mentor_id], lazy="selectin")
+    assignment = relationship("MentorAssignment", back_populates="meetings", lazy="raise")
+    student = relationship("User", foreign_keys=[student_id], lazy="raise")
+    mentor = relationship("User", foreign_keys=[mentor_id], lazy="raise")
 
 
 class MentorMessage(Base):
@@ -129,6 +129,13 @@ class MentorMessage(Base):
         DateTime(timezone=True), server_default=func.now()
     )
 
+    __table_args__ = (
+        # Keyset pagination of a thread, newest first
+        Index("ix_mentor_messages_assignment_created", "assignment_id", "created_at", "id"),
+        # Unread counts and read receipts are answered from the index alone
+        Index("ix_mentor_messages_unread", "assignment_id", "is_read", "sender_id"),
+    )
+
     # Relationships
-    assignment = relationship("MentorAssignment", back_populates="messages", lazy="selectin")
-    sender = relationship("User", lazy="selectin")
+    assignment = relationship("MentorAssignment", back_populates="messages", lazy="raise")
+    sender = relationship("User", lazy="raise")
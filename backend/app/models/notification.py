@@ -31,7 +31,7 @@ class Notification(Base):
     )
 
     # Relationships
-    user = relationship("User", backref="notifications")
+    user = relationship("User", backref="notifications", lazy="raise")
 
     def __repr__(self) -> str:
         return f"<Notification {self.title[:30]}>"
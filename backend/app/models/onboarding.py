@@ -39,9 +39,9 @@ class OnboardingChecklist(Base):
     )
 
     # Relationships
-    user = relationship("User", back_populates="onboarding")
+    user = relationship("User", back_populates="onboarding", lazy="raise")
     items = relationship(
-        "ChecklistItem", back_populates="checklist", lazy="selectin",
+        "ChecklistItem", back_populates="checklist", lazy="raise",
         order_by="ChecklistItem.order",
     )
 
@@ -76,4 +76,4 @@ class ChecklistItem(Base):
     )
 
     # Relationships
-    checklist = relationship("OnboardingChecklist", back_populates="items")
+    checklist = relationship("OnboardingChecklist", back_populates="items", lazy="raise")
@@ -60,7 +60,7 @@ class Payment(Base):
     )
 
     # Relationships
-    user = relationship("User", back_populates="payments")
+    user = relationship("User", back_populates="payments", lazy="raise")
 
     def __repr__(self) -> str:
         return f"<Payment {self.payment_type} – {self.amount} {self.currency}>"
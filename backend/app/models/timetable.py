@@ -6,7 +6,7 @@ import enum
 import uuid
 from datetime import datetime, time
 
-from sqlalchemy import DateTime, Enum, ForeignKey, String, Time, func
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, String, Time, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -50,5 +50,10 @@ class SubjectSchedule(Base):
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
+    __table_args__ = (
+        # Conflict checks scan one university's day by time window
+        Index("ix_subject_schedules_university_day_start", "university_id", "day_of_week", "start_time"),
+    )
+
     # Relationships
-    subject = relationship("Subject", back_populates="schedules", lazy="selectin")
+    subject = relationship("Subject", back_populates="schedules", lazy="raise")
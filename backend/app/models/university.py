@@ -39,7 +39,7 @@ class University(Base):
     )
 
     # Relationships
-    users = relationship("User", back_populates="university", lazy="selectin")
+    users = relationship("User", back_populates="university", lazy="raise")
 
     def __repr__(self) -> str:
         return f"<University {self.name}>"
@@ -64,33 +64,33 @@ class User(Base):
     )
 
     # Relationships
-    university = relationship("University", back_populates="users", lazy="selectin")
+    university = relationship("University", back_populates="users", lazy="raise")
     documents = relationship(
         "Document", back_populates="user",
-        foreign_keys="[Document.user_id]", lazy="selectin",
+        foreign_keys="[Document.user_id]", lazy="raise",
     )
-    payments = relationship("Payment", back_populates="user", lazy="selectin")
+    payments = relationship("Payment", back_populates="user", lazy="raise")
     hostel_application = relationship(
         "HostelApplication", back_populates="user",
-        uselist=False, foreign_keys="[HostelApplication.user_id]", lazy="selectin",
+        uselist=False, foreign_keys="[HostelApplication.user_id]", lazy="raise",
     )
     lms_activation = relationship(
-        "LMSActivation", back_populates="user", uselist=False, lazy="selectin",
+        "LMSActivation", back_populates="user", uselist=False, lazy="raise",
     )
     onboarding = relationship(
-        "OnboardingChecklist", back_populates="user", uselist=False, lazy="selectin",
+        "OnboardingChecklist", back_populates="user", uselist=False, lazy="raise",
     )
-    chat_sessions = relationship("ChatSession", back_populates="user", lazy="selectin")
-    enrollments = relationship("Enrollment", back_populates="user", lazy="selectin")
+    chat_sessions = relationship("ChatSession", back_populates="user", lazy="raise")
+    enrollments = relationship("Enrollment", back_populates="user", lazy="raise")
     mentor_assignments_as_student = relationship(
         "MentorAssignment", back_populates="student",
-        foreign_keys="[MentorAssignment.student_id]", lazy="selectin",
+        foreign_keys="[MentorAssignment.student_id]", lazy="raise",
     )
     mentor_assignments_as_mentor = relationship(
         "MentorAssignment", back_populates="mentor",
-        foreign_keys="[MentorAssignment.mentor_id]", lazy="selectin",
+        foreign_keys="[MentorAssignment.mentor_id]", lazy="raise",
     )
-    compliance_statuses = relationship("StudentCompliance", back_populates="user", lazy="selectin")
+    compliance_statuses = relationship("StudentCompliance", back_populates="user", lazy="raise")
 
     @property
     def full_name(self) -> str:
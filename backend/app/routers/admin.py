@@ -11,9 +11,10 @@ from typing import Optional
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.dependencies import get_current_user, require_role
+from app.auth.principal import AuthPrincipal
+from app.core.dependencies import get_current_principal, require_role
 from app.database import get_db
-from app.models.user import User, UserRole
+from app.models.user import UserRole
 from app.schemas.document import DocumentListResponse
 from app.schemas.user import UserListResponse
 from app.services.admin_service import AdminService
@@ -30,7 +31,7 @@ async def list_students(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
     search: Optional[str] = None,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """List all students in the admin's university with pagination."""
@@ -42,7 +43,7 @@ async def list_students(
     summary="Onboarding analytics",
 )
 async def get_analytics(
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get onboarding analytics for the admin's university."""
@@ -64,7 +65,7 @@ async def get_analytics(
     summary="Pending document reviews",
 )
 async def pending_documents(
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """List all documents pending review in the admin's university."""
@@ -81,7 +82,7 @@ async def list_documents(
     page: int = Query(1, ge=1),
     per_page: int = Query(50, ge=1, le=100),
     search: Optional[str] = Query(None, description="Search by student name, email, or document type"),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """List all documents in the admin's university with status filtering, pagination, and student info."""
@@ -93,8 +94,11 @@ async def list_documents(
     summary="Get escalated issues",
 )
 async def get_escalations(
-    current_user: User = Depends(get_current_user),
+    older_than_days: Optional[int] = Query(
+        None, ge=0, le=365, description="Age threshold for escalating pending documents"
+    ),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get escalated onboarding issues requiring admin attention."""
-    return await AdminService.get_escalations(db, current_user)
+    return await AdminService.get_escalations(db, current_user, older_than_days)
@@ -1,17 +1,19 @@
 """
 AI Chat Router
 
-Endpoints: send message, get history, list sessions.
+Endpoints: send message (plain or streamed over SSE), get history, list sessions.
 """
 
 import uuid
+from typing import Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.dependencies import get_current_user
-from app.database import get_db
-from app.models.user import User
+from app.auth.principal import AuthPrincipal
+from app.core.dependencies import get_current_principal, get_streaming_principal
+from app.database import get_db, get_unit_of_work
 from app.schemas.chat import ChatMessageRequest, ChatSessionListResponse, ChatSessionResponse
 from app.services.chat_service import ChatService
 
@@ -25,11 +27,29 @@ router = APIRouter()
 )
 async def send_message(
     data: ChatMessageRequest,
-    current_user: User = Depends(get_current_user),
+    transcript: bool = Query(False, description="Return the latest page of the transcript instead of just the new pair"),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
-    """Send a message to the AI assistant and get a response."""
-    return await ChatService.send_message(db, current_user, data)
+    """Send a message to the AI assistant; returns the new user/assistant message pair."""
+    reply = await ChatService.send_message(db, current_user, data)
+    if transcript:
+        return await ChatService.get_session(db, current_user, reply.id)
+    return reply
+
+
+@router.post(
+    "/message/stream",
+    summary="Send message and stream the AI reply",
+    response_class=StreamingResponse,
+)
+async def stream_message(
+    data: ChatMessageRequest,
+    current_user: AuthPrincipal = Depends(get_streaming_principal),
+    unit_of_work=Depends(get_unit_of_work),
+):
+    """Send a message and receive the reply as Server-Sent Events (session, token…, done)."""
+    return await ChatService.stream_message(unit_of_work, current_user, data)
 
 
 @router.get(
@@ -38,11 +58,13 @@ async def send_message(
     summary="Get chat history",
 )
 async def get_chat_history(
-    current_user: User = Depends(get_current_user),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
-    """List all chat sessions for the authenticated user."""
-    return await ChatService.get_history(db, current_user)
+    """List chat sessions for the authenticated user, most recently active first."""
+    return await ChatService.get_history(db, current_user, limit, cursor)
 
 
 @router.get(
@@ -52,8 +74,10 @@ async def get_chat_history(
 )
 async def get_session(
     session_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor to load older messages"),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
-    """Get a specific chat session with all messages."""
-    return await ChatService.get_session(db, current_user, session_id)
+    """Get a chat session with its most recent messages."""
+    return await ChatService.get_session(db, current_user, session_id, limit, cursor)
@@ -1,17 +1,19 @@
 """
 Documents Router
 
-Endpoints: upload, list, get details, admin review.
+Endpoints: upload, list, get details, file download, delete, admin review.
 """
 
 import uuid
 
-from fastapi import APIRouter, Depends, File, Form, UploadFile
+from fastapi import APIRouter, Depends, File, Form, Request, UploadFile
+from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.dependencies import get_current_user, require_role
+from app.auth.principal import AuthPrincipal
+from app.core.dependencies import get_current_principal, require_role
 from app.database import get_db
-from app.models.user import User, UserRole
+from app.models.user import UserRole
 from app.schemas.document import (
     DocumentListResponse,
     DocumentResponse,
@@ -31,7 +33,7 @@ router = APIRouter()
 async def upload_document(
     document_type: str = Form(...),
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Upload a document to Supabase Storage and create a DB record."""
@@ -44,7 +46,7 @@ async def upload_document(
     summary="List user documents",
 )
 async def list_documents(
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """List all documents for the authenticated user."""
@@ -58,13 +60,41 @@ async def list_documents(
 )
 async def get_document(
     document_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get a specific document's details."""
     return await DocumentService.get_by_id(db, current_user, document_id)
 
 
+@router.get(
+    "/{document_id}/file",
+    summary="Download a document's file",
+    response_class=FileResponse,
+)
+async def get_document_file(
+    document_id: uuid.UUID,
+    request: Request,
+    current_user: AuthPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    """Serve the file (Range requests, ETag / If-None-Match) to its owner or the university's admins."""
+    return await DocumentService.serve_file(db, current_user, document_id, request.headers)
+
+
+@router.delete(
+    "/{document_id}",
+    summary="Delete a document",
+)
+async def delete_document(
+    document_id: uuid.UUID,
+    current_user: AuthPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    """Withdraw a pending or rejected document; its file goes with the last reference."""
+    return await DocumentService.delete(db, current_user, document_id)
+
+
 @router.put(
     "/{document_id}/review",
     response_model=DocumentResponse,
@@ -74,7 +104,7 @@ async def get_document(
 async def review_document(
     document_id: uuid.UUID,
     data: DocumentReviewRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Approve or reject a student's document submission."""
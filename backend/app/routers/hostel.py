@@ -1,7 +1,7 @@
 """
 Hostel Router
 
-Endpoints: apply, check status, admin allocation.
+Endpoints: apply, check status, admin allocation, room inventory, batch allocation.
 """
 
 import uuid
@@ -9,13 +9,19 @@ import uuid
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.dependencies import get_current_user, require_role
+from app.auth.principal import AuthPrincipal
+from app.core.dependencies import get_current_principal, require_role
 from app.database import get_db
-from app.models.user import User, UserRole
+from app.models.user import UserRole
 from app.schemas.hostel import (
     HostelAllocationRequest,
     HostelApplicationRequest,
     HostelApplicationResponse,
+    HostelBatchAllocationRequest,
+    HostelBatchAllocationResponse,
+    HostelInventoryResponse,
+    HostelRoomBulkCreate,
+    HostelRoomBulkCreateResponse,
 )
 from app.services.hostel_service import HostelService
 
@@ -29,7 +35,7 @@ router = APIRouter()
 )
 async def apply_hostel(
     data: HostelApplicationRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Submit a new hostel room application."""
@@ -42,7 +48,7 @@ async def apply_hostel(
     summary="Check hostel application status",
 )
 async def get_hostel_status(
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get the current hostel application status."""
@@ -58,8 +64,52 @@ async def get_hostel_status(
 async def allocate_room(
     application_id: uuid.UUID,
     data: HostelAllocationRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Admin: approve/reject and allocate a hostel room."""
     return await HostelService.allocate(db, current_user, application_id, data)
+
+
+@router.post(
+    "/rooms",
+    response_model=HostelRoomBulkCreateResponse,
+    summary="Add hostel rooms to the inventory (Admin)",
+    dependencies=[Depends(require_role(UserRole.ADMIN))],
+)
+async def create_rooms(
+    data: HostelRoomBulkCreate,
+    current_user: AuthPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    """Admin: bulk-add rooms (block, floor, number, type, beds)."""
+    return await HostelService.create_rooms(db, current_user, data)
+
+
+@router.get(
+    "/rooms",
+    response_model=HostelInventoryResponse,
+    summary="Hostel inventory and occupancy (Admin)",
+    dependencies=[Depends(require_role(UserRole.ADMIN))],
+)
+async def get_inventory(
+    current_user: AuthPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    """Admin: beds and occupancy per block and room type."""
+    return await HostelService.get_inventory(db, current_user)
+
+
+@router.post(
+    "/allocate/batch",
+    response_model=HostelBatchAllocationResponse,
+    summary="Allocate all pending applications (Admin)",
+    dependencies=[Depends(require_role(UserRole.ADMIN))],
+)
+async def allocate_batch(
+    data: HostelBatchAllocationRequest,
+    current_user: AuthPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    """Admin: assign every pending application to a free bed in one transaction."""
+    return await HostelService.allocate_batch(db, current_user, data)
@@ -7,7 +7,8 @@ Endpoints: activate, check status.
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.dependencies import get_current_user
+from app.auth.principal import AuthPrincipal
+from app.core.dependencies import get_current_principal, get_current_user
 from app.database import get_db
 from app.models.user import User
 from app.services.lms_service import LMSService
@@ -32,7 +33,7 @@ async def activate_lms(
     summary="Check LMS activation status",
 )
 async def lms_status(
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Check if the student's LMS access is activated."""
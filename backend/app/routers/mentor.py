@@ -2,13 +2,16 @@
 Mentor Router
 """
 import uuid
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, WebSocket
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.dependencies import get_current_user, require_role
-from app.database import get_db
+from app.auth.principal import AuthPrincipal
+from app.core.dependencies import get_current_principal, get_current_user, require_role
+from app.database import get_db, get_unit_of_work
 from app.models.user import User, UserRole
 from app.schemas.mentor import (
     MentorAssignmentCreate, MentorAssignmentResponse, MentorAssignmentListResponse,
+    MentorBatchAssignRequest, MentorBatchAssignResponse,
     MeetingCreate, MeetingUpdateStatus, MeetingResponse, MeetingListResponse,
     MessageCreate, MessageResponse, MessageListResponse, MentorProfileResponse,
 )
@@ -18,38 +21,42 @@ router = APIRouter()
 
 # ── Admin ────────────────────────────────────
 @router.post("/assign", response_model=MentorAssignmentResponse, dependencies=[Depends(require_role(UserRole.ADMIN))])
-async def assign_mentor(data: MentorAssignmentCreate, current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def assign_mentor(data: MentorAssignmentCreate, current_user: AuthPrincipal = Depends(get_current_principal), db: AsyncSession = Depends(get_db)):
     return await MentorService.assign_mentor(db, current_user, data)
 
+@router.post("/assign/batch", response_model=MentorBatchAssignResponse, dependencies=[Depends(require_role(UserRole.ADMIN))])
+async def assign_batch(data: MentorBatchAssignRequest, current_user: AuthPrincipal = Depends(get_current_principal), db: AsyncSession = Depends(get_db)):
+    return await MentorService.assign_batch(db, current_user, data)
+
 @router.get("/assignments", response_model=MentorAssignmentListResponse, dependencies=[Depends(require_role(UserRole.ADMIN))])
-async def list_assignments(current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def list_assignments(current_user: AuthPrincipal = Depends(get_current_principal), db: AsyncSession = Depends(get_db)):
     return await MentorService.list_assignments(db, current_user.university_id)
 
 @router.delete("/assignments/{assignment_id}", dependencies=[Depends(require_role(UserRole.ADMIN))])
-async def deactivate_assignment(assignment_id: uuid.UUID, current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def deactivate_assignment(assignment_id: uuid.UUID, current_user: AuthPrincipal = Depends(get_current_principal), db: AsyncSession = Depends(get_db)):
     return await MentorService.deactivate_assignment(db, current_user, assignment_id)
 
 # ── Student ──────────────────────────────────
 @router.get("/me", response_model=MentorProfileResponse)
-async def get_my_mentor(current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def get_my_mentor(current_user: AuthPrincipal = Depends(get_current_principal), db: AsyncSession = Depends(get_db)):
     return await MentorService.get_my_mentor(db, current_user)
 
 # ── Mentor role ──────────────────────────────
 @router.get("/students", response_model=MentorAssignmentListResponse)
-async def get_my_students(current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def get_my_students(current_user: AuthPrincipal = Depends(get_current_principal), db: AsyncSession = Depends(get_db)):
     return await MentorService.get_my_students(db, current_user)
 
 # ── Meetings ─────────────────────────────────
 @router.post("/meetings", response_model=MeetingResponse)
-async def book_meeting(data: MeetingCreate, current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def book_meeting(data: MeetingCreate, current_user: AuthPrincipal = Depends(get_current_principal), db: AsyncSession = Depends(get_db)):
     return await MentorService.book_meeting(db, current_user, data)
 
 @router.put("/meetings/{meeting_id}", response_model=MeetingResponse)
-async def update_meeting(meeting_id: uuid.UUID, data: MeetingUpdateStatus, current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def update_meeting(meeting_id: uuid.UUID, data: MeetingUpdateStatus, current_user: AuthPrincipal = Depends(get_current_principal), db: AsyncSession = Depends(get_db)):
     return await MentorService.update_meeting_status(db, current_user, meeting_id, data)
 
 @router.get("/meetings", response_model=MeetingListResponse)
-async def list_meetings(current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+async def list_meetings(current_user: AuthPrincipal = Depends(get_current_principal), db: AsyncSession = Depends(get_db)):
     return await MentorService.list_meetings(db, current_user)
 
 # ── Messages ─────────────────────────────────
@@ -58,5 +65,20 @@ async def send_message(assignment_id: uuid.UUID, data: MessageCreate, current_us
     return await MentorService.send_message(db, current_user, assignment_id, data)
 
 @router.get("/{assignment_id}/messages", response_model=MessageListResponse)
-async def get_messages(assignment_id: uuid.UUID, current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
-    return await MentorService.get_messages(db, current_user, assignment_id)
+async def get_messages(
+    assignment_id: uuid.UUID,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor to load older messages"),
+    current_user: AuthPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    return await MentorService.get_messages(db, current_user, assignment_id, limit, cursor)
+
+@router.websocket("/{assignment_id}/ws")
+async def message_socket(
+    websocket: WebSocket,
+    assignment_id: uuid.UUID,
+    token: str = Query(..., description="Access token (browsers cannot set headers on WebSockets)"),
+    unit_of_work=Depends(get_unit_of_work),
+):
+    await MentorService.serve_socket(websocket, unit_of_work, assignment_id, token)
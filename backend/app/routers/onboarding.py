@@ -9,9 +9,9 @@ import uuid
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.dependencies import get_current_user
+from app.auth.principal import AuthPrincipal
+from app.core.dependencies import get_current_principal
 from app.database import get_db
-from app.models.user import User
 from app.schemas.onboarding import ChecklistItemUpdate, OnboardingProgressResponse
 from app.services.onboarding_service import OnboardingService
 
@@ -24,7 +24,7 @@ router = APIRouter()
     summary="Get onboarding progress",
 )
 async def get_progress(
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Return the student's onboarding checklist and overall progress."""
@@ -39,7 +39,7 @@ async def get_progress(
 async def update_checklist_item(
     item_id: uuid.UUID,
     data: ChecklistItemUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Mark a checklist item as completed or incomplete."""
@@ -10,7 +10,8 @@ from fastapi import APIRouter, Depends
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.dependencies import get_current_user
+from app.auth.principal import AuthPrincipal
+from app.core.dependencies import get_current_principal, get_current_user
 from app.database import get_db
 from app.models.user import User
 from app.schemas.payment import PaymentInitiateRequest, PaymentListResponse, PaymentResponse
@@ -26,7 +27,7 @@ router = APIRouter()
 )
 async def initiate_payment(
     data: PaymentInitiateRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Create a new payment record and initiate (simulated) payment flow."""
@@ -40,7 +41,7 @@ async def initiate_payment(
 )
 async def verify_payment(
     payment_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Simulate payment verification — marks payment as completed."""
@@ -53,7 +54,7 @@ async def verify_payment(
     summary="List user payments",
 )
 async def list_payments(
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """List all payments for the authenticated user."""
@@ -10,10 +10,14 @@ import uuid
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.dependencies import get_current_user, require_role
+from app.auth.principal import AuthPrincipal
+from app.core.cache import cache_stats
+from app.core.pubsub import get_hub
+from app.core.dependencies import get_current_principal, require_role
 from app.database import get_db
-from app.models.user import User, UserRole
+from app.models.user import UserRole
 from app.schemas.university import UniversityCreate, UniversityListResponse, UniversityResponse, UniversityUpdate
+from app.services.llm_provider import get_llm
 from app.services.superadmin_service import SuperAdminService
 
 router = APIRouter(dependencies=[Depends(require_role(UserRole.SUPERADMIN))])
@@ -25,7 +29,7 @@ router = APIRouter(dependencies=[Depends(require_role(UserRole.SUPERADMIN))])
     summary="List all universities",
 )
 async def list_universities(
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """List all registered universities on the platform."""
@@ -39,7 +43,7 @@ async def list_universities(
 )
 async def create_university(
     data: UniversityCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Register a new university on the platform."""
@@ -54,7 +58,7 @@ async def create_university(
 async def update_university(
     university_id: uuid.UUID,
     data: UniversityUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Update university details."""
@@ -66,7 +70,7 @@ async def update_university(
     summary="List subscription plans",
 )
 async def list_subscriptions(
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """List all subscription plans."""
@@ -78,8 +82,42 @@ async def list_subscriptions(
     summary="Super admin dashboard stats",
 )
 async def dashboard_stats(
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get platform-wide statistics for super admin dashboard."""
     return await SuperAdminService.get_dashboard_stats(db)
+
+
+@router.get(
+    "/cache/stats",
+    summary="Cache hit/miss counters",
+)
+async def get_cache_stats(
+    current_user: AuthPrincipal = Depends(get_current_principal),
+):
+    """Hit/miss counters for the caches in this worker process."""
+    return cache_stats()
+
+
+@router.get(
+    "/llm/stats",
+    summary="LLM gateway status",
+)
+async def get_llm_stats(
+    current_user: AuthPrincipal = Depends(get_current_principal),
+):
+    """Provider, circuit breaker state and in-flight calls per tenant in this worker process."""
+    llm = get_llm()
+    return llm.stats() if llm is not None else {"provider": "none"}
+
+
+@router.get(
+    "/pubsub/stats",
+    summary="Real-time hub status",
+)
+async def get_pubsub_stats(
+    current_user: AuthPrincipal = Depends(get_current_principal),
+):
+    """Broker, live subscriptions and dropped events in this worker process."""
+    return get_hub().stats()
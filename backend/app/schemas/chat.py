@@ -29,10 +29,22 @@ class ChatSessionResponse(BaseModel):
     messages: list[ChatMessageResponse]
     created_at: datetime
     updated_at: datetime
+    next_cursor: str | None = None  # pass back to fetch older messages
 
     model_config = {"from_attributes": True}
 
 
+class ChatSessionSummary(BaseModel):
+    id: uuid.UUID
+    title: str
+    message_count: int
+    last_message_preview: str | None
+    last_message_role: str | None
+    last_message_at: datetime | None
+    created_at: datetime
+    updated_at: datetime
+
+
 class ChatSessionListResponse(BaseModel):
-    sessions: list[ChatSessionResponse]
-    total: int
+    sessions: list[ChatSessionSummary]
+    next_cursor: str | None = None  # pass back to fetch the next page
@@ -114,3 +114,18 @@ class EnrollmentListResponse(BaseModel):
 
 class EnrollmentDropRequest(BaseModel):
     subject_id: uuid.UUID
+
+
+class EnrollmentImportError(BaseModel):
+    row: int
+    email: str | None = None
+    error: str
+
+
+class EnrollmentImportResponse(BaseModel):
+    rows_total: int
+    rows_imported: int
+    rows_failed: int
+    enrollments_written: int
+    errors: list[EnrollmentImportError]
+    errors_truncated: bool = False
@@ -48,6 +48,7 @@ class DocumentResponse(BaseModel):
     reviewed_by: uuid.UUID | None
     reviewed_at: datetime | None
     created_at: datetime
+    signed_url: str | None = None  # time-limited link (admin lists)
     # Student info (populated for admin views)
     student_name: str | None = None
     student_email: str | None = None
@@ -5,7 +5,7 @@ Hostel application schemas.
 import uuid
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.models.hostel import ApplicationStatus, RoomType
 
@@ -31,9 +31,72 @@ class HostelApplicationResponse(BaseModel):
     allocated_room_number: str | None
     allocated_block: str | None
     floor: int | None
+    room_id: uuid.UUID | None = None
     special_requirements: str | None
     admin_notes: str | None
     processed_at: datetime | None
     created_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+# ── Room inventory ───────────────────────────
+
+class HostelRoomCreate(BaseModel):
+    block: str = Field(..., min_length=1, max_length=50)
+    floor: int = Field(0, ge=0)
+    room_number: str = Field(..., min_length=1, max_length=50)
+    room_type: RoomType
+    capacity: int | None = Field(None, ge=1, le=20)  # defaults to the room type's bed count
+    is_accessible: bool = False
+
+
+class HostelRoomBulkCreate(BaseModel):
+    rooms: list[HostelRoomCreate] = Field(..., min_length=1, max_length=5000)
+
+
+class HostelRoomBulkCreateResponse(BaseModel):
+    created: int
+    skipped: int  # block/room number already in the inventory
+
+
+class HostelInventoryBucket(BaseModel):
+    block: str
+    room_type: RoomType
+    rooms: int
+    beds: int
+    occupied: int
+    free: int
+
+
+class HostelInventoryResponse(BaseModel):
+    buckets: list[HostelInventoryBucket]
+    total_beds: int
+    occupied_beds: int
+    free_beds: int
+
+
+# ── Batch allocation ─────────────────────────
+
+class HostelBatchAllocationRequest(BaseModel):
+    allow_other_room_types: bool = False  # fall back to the nearest room type when the preferred one is full
+    dry_run: bool = False
+    admin_notes: str | None = None
+
+
+class HostelBatchAllocation(BaseModel):
+    application_id: uuid.UUID
+    user_id: uuid.UUID
+    room_id: uuid.UUID
+    block: str
+    floor: int
+    room_number: str
+    room_type: RoomType
+
+
+class HostelBatchAllocationResponse(BaseModel):
+    allocated: int
+    unallocated: int
+    allocations: list[HostelBatchAllocation]
+    unallocated_application_ids: list[uuid.UUID]
+    dry_run: bool
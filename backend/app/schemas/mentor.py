@@ -26,6 +26,7 @@ class MentorAssignmentResponse(BaseModel):
     mentor_email: str | None = None
     student_name: str | None = None
     student_email: str | None = None
+    unread_messages: int = 0  # for the viewer
 
     model_config = {"from_attributes": True}
 
@@ -35,6 +36,34 @@ class MentorAssignmentListResponse(BaseModel):
     total: int
 
 
+class MentorCapacity(BaseModel):
+    mentor_id: uuid.UUID
+    capacity: int | None = Field(None, ge=1)  # defaults to default_capacity
+    course_ids: list[uuid.UUID] = []  # courses this mentor covers; empty = any course
+
+
+class MentorBatchAssignRequest(BaseModel):
+    """Match every student without an active mentor. Omitting `mentors` uses the current mentors."""
+    mentors: list[MentorCapacity] | None = None
+    default_capacity: int | None = Field(None, ge=1)
+    dry_run: bool = False
+
+
+class MentorLoad(BaseModel):
+    mentor_id: uuid.UUID
+    mentor_name: str
+    capacity: int
+    students: int  # active students after this batch
+    assigned: int  # added by this batch
+
+
+class MentorBatchAssignResponse(BaseModel):
+    assigned: int
+    unassigned_student_ids: list[uuid.UUID]
+    mentors: list[MentorLoad]
+    dry_run: bool
+
+
 # ─── Mentor Meeting ──────────────────────────────────
 class MeetingCreate(BaseModel):
     title: str = Field(..., max_length=255)
@@ -96,7 +125,8 @@ class MessageResponse(BaseModel):
 
 class MessageListResponse(BaseModel):
     messages: list[MessageResponse]
-    total: int
+    total: int  # messages on this page
+    next_cursor: str | None = None  # pass back to fetch older messages
 
 
 # ─── Mentor Profile (for student view) ───────────────
@@ -57,6 +57,18 @@ class TimetableEntry(BaseModel):
     instructor: str | None
 
 
+class ScheduleConflict(BaseModel):
+    """Two schedules that overlap on a shared room, instructor or student."""
+    kind: str  # "room" | "instructor" | "student"
+    day: str
+    resource: str | None = None  # room or instructor name
+    schedule_ids: list[uuid.UUID]
+    subject_codes: list[str]
+    overlap_start: time
+    overlap_end: time
+    students_affected: int | None = None
+
+
 class TimetableDayResponse(BaseModel):
     day: str
     entries: list[TimetableEntry]
@@ -67,3 +79,66 @@ class WeeklyTimetableResponse(BaseModel):
     days: list[TimetableDayResponse]
     total_subjects: int
     total_hours: float
+    clashes: list[ScheduleConflict] = []
+
+
+class TimetableValidationResponse(BaseModel):
+    """Result of checking a university's whole timetable."""
+    total_schedules: int
+    room_conflicts: list[ScheduleConflict]
+    instructor_conflicts: list[ScheduleConflict]
+    student_clashes: list[ScheduleConflict]
+    is_valid: bool
+
+
+# ── Generator ────────────────────────────────
+
+class GeneratorRoom(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+    capacity: int = Field(..., ge=1)
+
+
+class GeneratorSubject(BaseModel):
+    subject_id: uuid.UUID
+    instructor: str | None = Field(None, max_length=255)
+    sessions_per_week: int | None = Field(None, ge=1, le=6)  # defaults to the subject's credits
+
+
+class TimetableGenerateRequest(BaseModel):
+    """Generate a clash-free weekly timetable. Omitting `subjects` schedules every active subject."""
+    rooms: list[GeneratorRoom] = Field(..., min_length=1)
+    subjects: list[GeneratorSubject] | None = None
+    days: list[str] | None = None  # defaults to monday..saturday
+    day_start: time = time(9, 0)
+    day_end: time = time(17, 0)
+    period_minutes: int = Field(60, ge=15, le=240)
+    attempts: int = Field(4, ge=1, le=32)
+    workers: int = Field(1, ge=1, le=32)  # > 1 spreads attempts over the shared generator pool
+    apply: bool = False  # replace the subjects' existing schedules with the result
+
+
+class GeneratedSchedule(BaseModel):
+    subject_id: uuid.UUID
+    subject_code: str
+    day_of_week: str
+    start_time: time
+    end_time: time
+    room: str
+    instructor: str | None
+
+
+class UnplacedSubject(BaseModel):
+    subject_id: uuid.UUID
+    subject_code: str
+    sessions_missing: int
+
+
+class TimetableGenerateResponse(BaseModel):
+    schedules: list[GeneratedSchedule]
+    unplaced: list[UnplacedSubject]
+    sessions_requested: int
+    sessions_placed: int
+    room_utilization: float
+    attempts: int
+    elapsed_ms: int
+    applied: bool
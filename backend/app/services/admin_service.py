@@ -4,19 +4,26 @@ Admin Service
 Handles admin panel operations: student management, analytics, document review queue.
 """
 
+from datetime import datetime, timedelta, timezone
+
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from app.auth.principal import AuthPrincipal
+from app.config import get_settings
 from app.models.document import Document, DocumentStatus
 from app.models.hostel import HostelApplication, ApplicationStatus
 from app.models.lms import LMSActivation
-from app.models.onboarding import OnboardingChecklist
+from app.models.loaders import LoadProfile, load_options
 from app.models.payment import Payment, PaymentStatus
 from app.models.user import User, UserRole
 from app.schemas.document import DocumentListResponse, DocumentResponse
 from app.schemas.user import UserListResponse, UserResponse
+from app.services.analytics_service import AnalyticsService
 from app.services.document_service import _doc_to_response
+from app.services.storage_service import StorageService
+
+settings = get_settings()
 
 
 class AdminService:
@@ -24,7 +31,7 @@ class AdminService:
 
     @staticmethod
     async def list_students(
-        db: AsyncSession, admin: User, page: int, per_page: int, search: str | None
+        db: AsyncSession, admin: AuthPrincipal, page: int, per_page: int, search: str | None
     ) -> UserListResponse:
         """List students in the admin's university with search and pagination."""
         query = select(User).where(
@@ -57,95 +64,34 @@ class AdminService:
         )
 
     @staticmethod
-    async def get_analytics(db: AsyncSession, admin: User) -> dict:
-        """Get onboarding analytics for the admin's university."""
-        uni_id = admin.university_id
-
-        # Total students
-        total_result = await db.execute(
-            select(func.count()).where(
-                User.university_id == uni_id,
-                User.role == UserRole.STUDENT,
-            )
-        )
-        total_students = total_result.scalar() or 0
-
-        # Completed onboarding
-        completed_result = await db.execute(
-            select(func.count()).where(
-                OnboardingChecklist.university_id == uni_id,
-                OnboardingChecklist.is_completed == True,
-            )
-        )
-        completed = completed_result.scalar() or 0
-
-        # Documents
-        docs_total = await db.execute(
-            select(func.count()).where(Document.university_id == uni_id)
-        )
-        docs_approved = await db.execute(
-            select(func.count()).where(
-                Document.university_id == uni_id,
-                Document.status == DocumentStatus.APPROVED,
-            )
-        )
-        docs_pending = await db.execute(
-            select(func.count()).where(
-                Document.university_id == uni_id,
-                Document.status == DocumentStatus.PENDING,
-            )
-        )
-
-        # Payments
-        payments_total = await db.execute(
-            select(func.coalesce(func.sum(Payment.amount), 0)).where(
-                Payment.university_id == uni_id,
-                Payment.status == PaymentStatus.COMPLETED,
-            )
-        )
-        payments_pending = await db.execute(
-            select(func.count()).where(
-                Payment.university_id == uni_id,
-                Payment.status == PaymentStatus.PENDING,
-            )
-        )
-
-        # Hostel
-        hostel_pending = await db.execute(
-            select(func.count()).where(
-                HostelApplication.university_id == uni_id,
-                HostelApplication.status == ApplicationStatus.PENDING,
-            )
-        )
-        hostel_allocated = await db.execute(
-            select(func.count()).where(
-                HostelApplication.university_id == uni_id,
-                HostelApplication.status.in_([ApplicationStatus.APPROVED, ApplicationStatus.ALLOCATED]),
-            )
-        )
+    async def get_analytics(db: AsyncSession, admin: AuthPrincipal) -> dict:
+        """Get onboarding analytics for the admin's university (from the rollup row)."""
+        stats = await AnalyticsService.get(db, admin.university_id)
+        total_students = stats["total_students"]
+        completed = stats["onboarding_completed"]
 
         return {
             "total_students": total_students,
             "onboarding_completed": completed,
             "completion_rate": round((completed / total_students * 100), 1) if total_students > 0 else 0,
             "documents": {
-                "total": docs_total.scalar() or 0,
-                "approved": docs_approved.scalar() or 0,
-                "pending": docs_pending.scalar() or 0,
+                "total": stats["documents_total"],
+                "approved": stats["documents_approved"],
+                "pending": stats["documents_pending"],
             },
             "payments": {
-                "revenue": float(payments_total.scalar() or 0),
-                "pending_count": payments_pending.scalar() or 0,
+                "revenue": float(stats["payments_revenue"]),
+                "pending_count": stats["payments_pending"],
             },
             "hostel": {
-                "pending": hostel_pending.scalar() or 0,
-                "allocated": hostel_allocated.scalar() or 0,
+                "pending": stats["hostel_pending"],
+                "allocated": stats["hostel_allocated"],
             },
         }
 
     @staticmethod
     async def get_pending_documents(
-        db: AsyncSession, admin: User
+        db: AsyncSession, admin: AuthPrincipal
     ) -> DocumentListResponse:
         """List documents pending review in the admin's university."""
         return await AdminService.get_documents(db, admin, status_filter="pending")
@@ -153,7 +99,7 @@ class AdminService:
     @staticmethod
     async def get_documents(
         db: AsyncSession,
-        admin: User,
+        admin: AuthPrincipal,
         status_filter: str | None = None,
         page: int = 1,
         per_page: int = 50,
@@ -162,7 +108,7 @@ class AdminService:
         """List all documents in admin's university with status filtering, pagination, and student info."""
         query = (
             select(Document)
-            .options(selectinload(Document.user))
+            .options(*load_options(Document, LoadProfile.ADMIN_LIST))
             .where(Document.university_id == admin.university_id)
         )
 
@@ -195,47 +141,64 @@ class AdminService:
         result = await db.execute(query)
         docs = result.scalars().all()
 
+        # One batch signing call (or none, when cached) for the whole page
+        signed = await StorageService.sign_blobs(
+            db, admin.university_id, [d.content_hash for d in docs if d.content_hash]
+        )
         return DocumentListResponse(
-            documents=[_doc_to_response(d) for d in docs],
+            documents=[_doc_to_response(d, signed_url=signed.get(d.content_hash)) for d in docs],
             total=total,
         )
 
     @staticmethod
-    async def get_escalations(db: AsyncSession, admin: User) -> dict:
-        """Get escalated issues requiring admin attention."""
+    async def get_escalations(
+        db: AsyncSession, admin: AuthPrincipal, older_than_days: int | None = None
+    ) -> dict:
+        """Get escalated issues requiring admin attention, counted in one statement."""
         uni_id = admin.university_id
-
-        # Pending documents older than 3 days
-        pending_docs = await db.execute(
-            select(func.count()).where(
+        age_days = settings.ESCALATION_DOCUMENT_AGE_DAYS if older_than_days is None else older_than_days
+        cutoff = datetime.now(timezone.utc) - timedelta(days=age_days)
+
+        # Both document buckets are served by the partial ix_documents_pending_queue index
+        documents = (
+            select(
+                func.count().label("pending_documents"),
+                func.count().filter(Document.created_at < cutoff).label("aged_pending_documents"),
+            )
+            .where(
                 Document.university_id == uni_id,
                 Document.status == DocumentStatus.PENDING,
             )
+            .subquery("documents")
         )
-
-        # Pending hostel applications
-        pending_hostel = await db.execute(
-            select(func.count()).where(
-                HostelApplication.university_id == uni_id,
-                HostelApplication.status == ApplicationStatus.PENDING,
-            )
+        pending_hostel = select(func.count()).where(
+            HostelApplication.university_id == uni_id,
+            HostelApplication.status == ApplicationStatus.PENDING,
+        )
+        failed_payments = select(func.count()).where(
+            Payment.university_id == uni_id,
+            Payment.status == PaymentStatus.FAILED,
         )
 
-        # Failed payments
-        failed_payments = await db.execute(
-            select(func.count()).where(
-                Payment.university_id == uni_id,
-                Payment.status == PaymentStatus.FAILED,
+        result = await db.execute(
+            select(
+                documents.c.pending_documents,
+                documents.c.aged_pending_documents,
+                pending_hostel.scalar_subquery().label("pending_hostel_applications"),
+                failed_payments.scalar_subquery().label("failed_payments"),
             )
         )
+        counts = result.mappings().one()
 
         return {
-            "pending_documents": pending_docs.scalar() or 0,
-            "pending_hostel_applications": pending_hostel.scalar() or 0,
-            "failed_payments": failed_payments.scalar() or 0,
+            "pending_documents": counts["pending_documents"],
+            "aged_pending_documents": counts["aged_pending_documents"],
+            "document_age_days": age_days,
+            "pending_hostel_applications": counts["pending_hostel_applications"],
+            "failed_payments": counts["failed_payments"],
             "total_escalations": (
-                (pending_docs.scalar() or 0)
-                + (pending_hostel.scalar() or 0)
-                + (failed_payments.scalar() or 0)
+                counts["pending_documents"]
+                + counts["pending_hostel_applications"]
+                + counts["failed_payments"]
             ),
         }
@@ -0,0 +1,192 @@
+"""
+Analytics Service
+
+Maintains the per-university analytics rollup.
+Write paths apply small deltas inside their own transaction; reconcile()
+recomputes a row from the source tables and is run periodically to correct
+any drift.
+"""
+
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import dialect_insert
+from app.models.analytics import UniversityAnalytics
+from app.models.document import Document, DocumentStatus
+from app.models.hostel import ApplicationStatus, HostelApplication
+from app.models.onboarding import OnboardingChecklist
+from app.models.payment import Payment, PaymentStatus
+from app.models.university import University
+from app.models.user import User, UserRole
+
+COUNTERS = (
+    "total_students",
+    "onboarding_completed",
+    "documents_total",
+    "documents_approved",
+    "documents_pending",
+    "payments_revenue",
+    "payments_pending",
+    "hostel_pending",
+    "hostel_allocated",
+)
+
+_DOCUMENT_COUNTERS = {
+    DocumentStatus.APPROVED: "documents_approved",
+    DocumentStatus.PENDING: "documents_pending",
+}
+
+_HOSTEL_ALLOCATED = (ApplicationStatus.APPROVED, ApplicationStatus.ALLOCATED)
+
+
+def _status_deltas(counter_for, old, new) -> dict[str, int]:
+    """Counter deltas for an entity moving from status `old` to `new` (either may be None)."""
+    deltas: dict[str, int] = {}
+    if old is not None and counter_for(old):
+        deltas[counter_for(old)] = deltas.get(counter_for(old), 0) - 1
+    if new is not None and counter_for(new):
+        deltas[counter_for(new)] = deltas.get(counter_for(new), 0) + 1
+    return {k: v for k, v in deltas.items() if v}
+
+
+def _hostel_counter(s: ApplicationStatus) -> str | None:
+    if s == ApplicationStatus.PENDING:
+        return "hostel_pending"
+    if s in _HOSTEL_ALLOCATED:
+        return "hostel_allocated"
+    return None
+
+
+class AnalyticsService:
+    """Per-university analytics rollup."""
+
+    @staticmethod
+    async def compute(db: AsyncSession, university_id: uuid.UUID) -> dict:
+        """Recompute every counter from the source tables in one statement."""
+        counters = {
+            "total_students": select(func.count()).where(
+                User.university_id == university_id,
+                User.role == UserRole.STUDENT,
+            ),
+            "onboarding_completed": select(func.count()).where(
+                OnboardingChecklist.university_id == university_id,
+                OnboardingChecklist.is_completed == True,
+            ),
+            "documents_total": select(func.count()).where(
+                Document.university_id == university_id,
+            ),
+            "documents_approved": select(func.count()).where(
+                Document.university_id == university_id,
+                Document.status == DocumentStatus.APPROVED,
+            ),
+            "documents_pending": select(func.count()).where(
+                Document.university_id == university_id,
+                Document.status == DocumentStatus.PENDING,
+            ),
+            "payments_revenue": select(func.coalesce(func.sum(Payment.amount), 0)).where(
+                Payment.university_id == university_id,
+                Payment.status == PaymentStatus.COMPLETED,
+            ),
+            "payments_pending": select(func.count()).where(
+                Payment.university_id == university_id,
+                Payment.status == PaymentStatus.PENDING,
+            ),
+            "hostel_pending": select(func.count()).where(
+                HostelApplication.university_id == university_id,
+                HostelApplication.status == ApplicationStatus.PENDING,
+            ),
+            "hostel_allocated": select(func.count()).where(
+                HostelApplication.university_id == university_id,
+                HostelApplication.status.in_(_HOSTEL_ALLOCATED),
+            ),
+        }
+        result = await db.execute(
+            select(*(query.scalar_subquery().label(name) for name, query in counters.items()))
+        )
+        counts = dict(result.mappings().one())
+        counts["payments_revenue"] = float(counts["payments_revenue"] or 0)
+        return counts
+
+    @staticmethod
+    async def reconcile(db: AsyncSession, university_id: uuid.UUID) -> dict:
+        """Overwrite the rollup row for a university with freshly computed counters."""
+        counts = await AnalyticsService.compute(db, university_id)
+        now = datetime.now(timezone.utc)
+        stmt = dialect_insert(db, UniversityAnalytics).values(
+            university_id=university_id, reconciled_at=now, **counts
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[UniversityAnalytics.university_id],
+            set_={**counts, "reconciled_at": now, "updated_at": func.now()},
+        )
+        await db.execute(stmt)
+        return counts
+
+    @staticmethod
+    async def reconcile_all(db: AsyncSession) -> int:
+        """Reconcile every university; returns how many rows were refreshed."""
+        result = await db.execute(select(University.id))
+        university_ids = [row[0] for row in result.all()]
+        for university_id in university_ids:
+            await AnalyticsService.reconcile(db, university_id)
+        return len(university_ids)
+
+    @staticmethod
+    async def apply(db: AsyncSession, university_id: uuid.UUID | None, **deltas: float) -> None:
+        """
+        Atomically add deltas to a university's counters.
+        If the row does not exist yet it is built by reconcile(), which already
+        sees this transaction's changes, so the deltas are not applied on top.
+        """
+        deltas = {k: v for k, v in deltas.items() if v}
+        if university_id is None or not deltas:
+            return
+        columns = UniversityAnalytics.__table__.c
+        result = await db.execute(
+            update(UniversityAnalytics)
+            .where(UniversityAnalytics.university_id == university_id)
+            .values({columns[name]: columns[name] + value for name, value in deltas.items()})
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            await AnalyticsService.reconcile(db, university_id)
+
+    @staticmethod
+    async def document_status_changed(
+        db: AsyncSession,
+        university_id: uuid.UUID,
+        old: DocumentStatus | None,
+        new: DocumentStatus | None,
+    ) -> None:
+        deltas = _status_deltas(_DOCUMENT_COUNTERS.get, old, new)
+        if old is None:
+            deltas["documents_total"] = 1
+        elif new is None:
+            deltas["documents_total"] = -1
+        await AnalyticsService.apply(db, university_id, **deltas)
+
+    @staticmethod
+    async def hostel_status_changed(
+        db: AsyncSession,
+        university_id: uuid.UUID,
+        old: ApplicationStatus | None,
+        new: ApplicationStatus | None,
+    ) -> None:
+        await AnalyticsService.apply(db, university_id, **_status_deltas(_hostel_counter, old, new))
+
+    @staticmethod
+    async def get(db: AsyncSession, university_id: uuid.UUID) -> dict:
+        """Read the rollup row, building it on first access."""
+        columns = UniversityAnalytics.__table__.c
+        result = await db.execute(
+            select(*(columns[name] for name in COUNTERS)).where(
+                UniversityAnalytics.university_id == university_id
+            )
+        )
+        row = result.mappings().one_or_none()
+        if row is None:
+            return await AnalyticsService.reconcile(db, university_id)
+        return dict(row)
@@ -30,6 +30,7 @@ from app.schemas.auth import (
     TokenResponse,
     VerifyEmailRequest,
 )
+from app.services.analytics_service import AnalyticsService
 
 settings = get_settings()
 
@@ -94,6 +95,7 @@ class AuthService:
         )
         db.add(user)
         await db.flush()
+        await AnalyticsService.apply(db, university.id, total_students=1)
 
         return MessageResponse(
             message="Account created successfully! You can now sign in.",
@@ -1,19 +1,28 @@
 """
 Chat Service
 
-Handles AI assistant conversations using OpenAI API.
+Handles AI assistant conversations through the configured LLM provider.
 Fetches real user data from DB to provide contextual responses.
-Stores conversation history in DB.
+Stores conversation history in DB; replies can be streamed over SSE.
 """
 
+import hashlib
+import json
+import logging
+import re
 import uuid
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
 from datetime import datetime, timezone
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
+from app.auth.principal import AuthPrincipal
+from app.core.cache import get_cache, state_token, student_scope
 from app.models.chat import ChatMessage, ChatSession
 from app.models.document import Document, DocumentStatus
 from app.models.hostel import HostelApplication
@@ -25,15 +34,44 @@ from app.schemas.chat import (
     ChatMessageResponse,
     ChatSessionListResponse,
     ChatSessionResponse,
+    ChatSessionSummary,
 )
+from app.services.llm_provider import LLMUnavailable, get_llm
+from app.utils.helpers import decode_cursor, encode_cursor, utc_now
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
+PREVIEW_LENGTH = 120
 
-async def _build_user_context(db: AsyncSession, user: User) -> str:
+
+@dataclass
+class ChatTurn:
+    """State gathered for one user message before the assistant replies."""
+
+    session: ChatSession
+    user_message: ChatMessage
+    context: list[dict]
+    user_context: str
+
+
+def _decode_cursor(cursor: str, *types: type) -> tuple:
+    try:
+        return decode_cursor(cursor, *types)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor.",
+        )
+
+
+async def _build_user_context(db: AsyncSession, user_id: uuid.UUID) -> str:
     """Fetch real user data from DB and build a context summary for the AI."""
-    user_id = user.id
-    parts = [f"Student: {user.full_name} ({user.email})"]
+    user_result = await db.execute(
+        select(User.first_name, User.last_name, User.email).where(User.id == user_id)
+    )
+    first_name, last_name, email = user_result.one()
+    parts = [f"Student: {first_name} {last_name} ({email})"]
 
     # Documents
     doc_result = await db.execute(select(Document).where(Document.user_id == user_id))
@@ -80,43 +118,158 @@ async def _build_user_context(db: AsyncSession, user: User) -> str:
     return "\n".join(parts)
 
 
-async def _get_ai_response(messages: list[dict], user_context: str = "") -> str:
-    """Call OpenAI API for a chat completion with real user context."""
-    try:
-        import openai
-
-        client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
-
-        system_prompt = (
-            "You are CampusAI Assistant, a helpful AI for university student onboarding. "
-            "You help students with document uploads, fee payments, hostel applications, "
-            "LMS activation, and general campus queries. "
-            "Be concise, friendly, and helpful. "
-            "IMPORTANT: You have access to the student's real onboarding data below. "
-            "Use this data to give specific, personalized answers instead of generic advice.\n\n"
-            f"=== STUDENT DATA ===\n{user_context}\n=== END DATA ==="
-        )
+async def _get_user_context(db: AsyncSession, user_id: uuid.UUID) -> str:
+    """
+    Rendered user context, cached per student.
+    Keyed by the student's state token, so any document, payment, hostel,
+    LMS or profile change produces a fresh context on the next message.
+    """
+    cache = get_cache("chat_context", ttl=settings.CHAT_CONTEXT_CACHE_TTL_SECONDS)
+    key = f"{user_id}:{await state_token(student_scope(user_id))}"
+    user_context = await cache.get(key)
+    if user_context is None:
+        user_context = await _build_user_context(db, user_id)
+        await cache.set(key, user_context)
+    return user_context
+
+
+SYSTEM_PROMPT = (
+    "You are CampusAI Assistant, a helpful AI for university student onboarding. "
+    "You help students with document uploads, fee payments, hostel applications, "
+    "LMS activation, and general campus queries. "
+    "Be concise, friendly, and helpful. "
+    "IMPORTANT: You have access to the student's real onboarding data below. "
+    "Use this data to give specific, personalized answers instead of generic advice.\n\n"
+    "=== STUDENT DATA ===\n{user_context}\n=== END DATA ==="
+)
 
-        api_messages = [{"role": "system", "content": system_prompt}]
-        api_messages.extend(messages[-10:])  # Keep last 10 messages for context
+def _api_messages(messages: list[dict], user_context: str) -> list[dict]:
+    api_messages = [{"role": "system", "content": SYSTEM_PROMPT.format(user_context=user_context)}]
+    api_messages.extend(messages[-settings.CHAT_CONTEXT_MESSAGES:])
+    return api_messages
+
+
+def _word_chunks(text: str) -> list[str]:
+    """Split text into word-sized chunks (whitespace kept) to stream canned replies."""
+    return re.findall(r"\S+\s*|\s+", text)
+
+
+# ── Response cache ───────────────────────────────────────
+# Status questions make up most traffic. An LLM reply is reused for the same
+# tenant, question (normalized to its words) and student-data snapshot, so it
+# is served again only until the student's data (and thus the rendered
+# context) changes.
+INTENT_KEYWORDS = (
+    ("documents", ("document", "upload", "file", "pdf", "marksheet", "aadhar")),
+    ("status", ("status", "progress", "onboarding", "checklist")),
+    ("payments", ("payment", "fee", "pay", "tuition")),
+    ("hostel", ("hostel", "room", "accommodation")),
+    ("lms", ("lms", "learning", "course", "moodle")),
+    ("greeting", ("hello", "hi", "hey", "greet")),
+)
 
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=api_messages,
-            max_tokens=1024,
-            temperature=0.7,
-        )
-        return response.choices[0].message.content or "I'm sorry, I couldn't generate a response."
 
-    except ImportError:
-        return _fallback_response(messages[-1]["content"] if messages else "", user_context)
-    except Exception as e:
-        return _fallback_response(messages[-1]["content"] if messages else "", user_context)
+def _words(message: str) -> list[str]:
+    return re.findall(r"[a-z0-9]+", message.lower())
+
+
+def _classify_intent(message: str) -> str | None:
+    """Normalized intent of a message, or None for free-form questions."""
+    words = set(_words(message))
+    for intent, keywords in INTENT_KEYWORDS:
+        # Whole words only (plurals allowed): "this" is not "hi", "profile" not "file"
+        if any(w in words or f"{w}s" in words or f"{w}es" in words for w in keywords):
+            return intent
+    return None
+
+
+def _response_cache_key(message: str, user_context: str, tenant: str) -> str | None:
+    """Cache key for short intent questions; None when the reply must not be shared."""
+    words = _words(message)
+    if len(words) > settings.CHAT_RESPONSE_CACHE_MAX_WORDS:
+        return None
+    intent = _classify_intent(message)
+    if intent is None:
+        return None
+    question = hashlib.sha256(" ".join(words).encode()).hexdigest()[:16]
+    snapshot = hashlib.sha256(user_context.encode()).hexdigest()[:16]
+    return f"{tenant}:{intent}:{question}:{snapshot}"
+
+
+def _response_cache():
+    return get_cache(
+        "chat_responses",
+        ttl=settings.CHAT_RESPONSE_CACHE_TTL_SECONDS,
+        max_entries=settings.CHAT_RESPONSE_CACHE_MAX_ENTRIES,
+    )
+
+
+async def _get_ai_response(messages: list[dict], user_context: str = "", tenant: str = "") -> str:
+    """Chat completion with real user context; rule-based fallback when the LLM is unavailable."""
+    question = messages[-1]["content"] if messages else ""
+    llm = get_llm()
+    if llm is not None:
+        cache_key = _response_cache_key(question, user_context, tenant)
+        if cache_key is not None:
+            cached = await _response_cache().get(cache_key, label=tenant)
+            if cached is not None:
+                return cached
+        try:
+            reply = await llm.complete(tenant, _api_messages(messages, user_context))
+        except LLMUnavailable as exc:
+            logger.warning("AI reply fell back to rules: %s", exc)
+        else:
+            if not reply:
+                return "I'm sorry, I couldn't generate a response."
+            if cache_key is not None:
+                await _response_cache().set(cache_key, reply)
+            return reply
+    return _fallback_response(question, user_context)
+
+
+async def _stream_ai_response(
+    messages: list[dict], user_context: str = "", tenant: str = ""
+) -> AsyncIterator[str]:
+    """
+    Stream a completion as text deltas.
+    Cached replies and the rule-based fallback (used when the LLM is
+    unavailable or fails before producing any output) are chunked by word.
+    """
+    question = messages[-1]["content"] if messages else ""
+    llm = get_llm()
+    if llm is not None:
+        cache_key = _response_cache_key(question, user_context, tenant)
+        cached = None
+        if cache_key is not None:
+            cached = await _response_cache().get(cache_key, label=tenant)
+        if cached is not None:
+            for chunk in _word_chunks(cached):
+                yield chunk
+            return
+        parts: list[str] = []
+        try:
+            async for delta in llm.stream(tenant, _api_messages(messages, user_context)):
+                parts.append(delta)
+                yield delta
+            if parts:
+                if cache_key is not None:
+                    await _response_cache().set(cache_key, "".join(parts))
+                return
+        except LLMUnavailable as exc:
+            logger.warning("AI stream fell back to rules: %s", exc)
+            if parts:
+                return
+    for chunk in _word_chunks(_fallback_response(question, user_context)):
+        yield chunk
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
 
 
 def _fallback_response(user_message: str, user_context: str = "") -> str:
     """Context-aware rule-based fallback when OpenAI is unavailable."""
-    msg = user_message.lower()
+    intent = _classify_intent(user_message)
 
     # Parse context for personalized responses
     has_docs = "Documents:" in user_context and "None uploaded" not in user_context
@@ -124,7 +277,7 @@ def _fallback_response(user_message: str, user_context: str = "") -> str:
     has_hostel = "Hostel:" in user_context and "Not applied" not in user_context
     has_lms = "LMS: Activated" in user_context
 
-    if any(w in msg for w in ["document", "upload", "file", "pdf", "marksheet", "aadhar"]):
+    if intent == "documents":
         if has_docs:
             # Extract document statuses from context
             doc_section = user_context.split("Documents:\n")[1].split("\n\n")[0] if "Documents:\n" in user_context else ""
@@ -140,14 +293,14 @@ def _fallback_response(user_message: str, user_context: str = "") -> str:
             "3. Upload a PDF, JPG, or PNG (max 5MB)\n"
             "An admin will review your documents once uploaded."
         )
-    elif any(w in msg for w in ["status", "progress", "onboarding", "checklist"]):
+    elif intent == "status":
         status_parts = ["Here's your onboarding status:"]
         status_parts.append(f"📄 Documents: {'Uploaded' if has_docs else 'Not uploaded yet'}")
         status_parts.append(f"💳 Payments: {'Completed' if has_payments else 'Pending'}")
         status_parts.append(f"🏠 Hostel: {'Applied' if has_hostel else 'Not applied'}")
         status_parts.append(f"📚 LMS: {'Activated' if has_lms else 'Not activated'}")
         return "\n".join(status_parts)
-    elif any(w in msg for w in ["payment", "fee", "pay", "tuition"]):
+    elif intent == "payments":
         if has_payments:
             pay_line = [l for l in user_context.split("\n") if l.startswith("Payments:")]
             return f"{pay_line[0] if pay_line else 'Payment info available.'}\n\nVisit Dashboard → Payments to view details or make new payments."
@@ -157,7 +310,7 @@ def _fallback_response(user_message: str, user_context: str = "") -> str:
             "2. Initiate payment\n"
             "3. Download receipts after completion"
         )
-    elif any(w in msg for w in ["hostel", "room", "accommodation"]):
+    elif intent == "hostel":
         if has_hostel:
             hostel_line = [l for l in user_context.split("\n") if l.startswith("Hostel:")]
             return f"{hostel_line[0] if hostel_line else 'Hostel application found.'}\n\nVisit Dashboard → Hostel for full details."
@@ -167,7 +320,7 @@ def _fallback_response(user_message: str, user_context: str = "") -> str:
             "2. Submit your application\n"
             "An admin will review and assign your room."
         )
-    elif any(w in msg for w in ["lms", "learning", "course", "moodle"]):
+    elif intent == "lms":
         if has_lms:
             lms_line = [l for l in user_context.split("\n") if l.startswith("LMS:")]
             return f"Your LMS is already activated! {lms_line[0] if lms_line else ''}\n\nYou can access your courses through the LMS portal."
@@ -175,7 +328,7 @@ def _fallback_response(user_message: str, user_context: str = "") -> str:
             "Your LMS is not activated yet. Go to Dashboard → LMS and click 'Activate'. "
             "You'll receive your LMS credentials immediately."
         )
-    elif any(w in msg for w in ["hello", "hi", "hey", "greet"]):
+    elif intent == "greeting":
         name = user_context.split("(")[0].replace("Student: ", "").strip() if "Student:" in user_context else "there"
         return (
             f"Hello {name}! 👋 I'm your CampusAI Assistant.\n\n"
@@ -202,12 +355,16 @@ class ChatService:
     """AI chat business logic."""
 
     @staticmethod
-    async def send_message(
-        db: AsyncSession, user: User, data: ChatMessageRequest
-    ) -> ChatSessionResponse:
-        """Process user message and get AI response."""
-        # Get or create session
+    async def _start_turn(
+        db: AsyncSession, user: AuthPrincipal, data: ChatMessageRequest
+    ) -> ChatTurn:
+        """
+        Get or create the session, stage the user message and gather the
+        model's context: only the last CHAT_CONTEXT_MESSAGES messages are read.
+        """
+        now = utc_now()
         session = None
+        history: list[dict] = []
         if data.session_id:
             result = await db.execute(
                 select(ChatSession).where(
@@ -217,7 +374,15 @@ class ChatService:
             )
             session = result.scalar_one_or_none()
 
-        if not session:
+        if session:
+            result = await db.execute(
+                select(ChatMessage.role, ChatMessage.content)
+                .where(ChatMessage.session_id == session.id)
+                .order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc())
+                .limit(settings.CHAT_CONTEXT_MESSAGES - 1)
+            )
+            history = [{"role": role, "content": content} for role, content in reversed(result.all())]
+        else:
             # Create new session
             title = data.message[:50] + ("..." if len(data.message) > 50 else "")
             session = ChatSession(
@@ -225,107 +390,206 @@ class ChatService:
                 user_id=user.id,
                 university_id=user.university_id,
                 title=title,
+                created_at=now,
+                updated_at=now,
             )
             db.add(session)
-            await db.flush()
 
-        # Store user message
+        # Stage user message (flushed together with the reply)
         user_msg = ChatMessage(
             id=uuid.uuid4(),
             session_id=session.id,
             role="user",
             content=data.message,
+            created_at=now,
         )
         db.add(user_msg)
-        await db.flush()
 
-        # Build context from session history
-        result = await db.execute(
-            select(ChatMessage)
-            .where(ChatMessage.session_id == session.id)
-            .order_by(ChatMessage.created_at)
+        return ChatTurn(
+            session=session,
+            user_message=user_msg,
+            context=history + [{"role": "user", "content": data.message}],
+            user_context=await _get_user_context(db, user.id),
         )
-        history = result.scalars().all()
-        context = [{"role": m.role, "content": m.content} for m in history]
-
-        # Fetch real user data for AI context
-        user_context = await _build_user_context(db, user)
 
-        # Get AI response with real data
-        ai_response = await _get_ai_response(context, user_context)
-
-        # Store assistant message
+    @staticmethod
+    async def _finish_turn(db: AsyncSession, turn: ChatTurn, content: str) -> ChatMessage:
+        """Store the assistant reply and bump the session's activity timestamp."""
+        now = utc_now()
         assistant_msg = ChatMessage(
             id=uuid.uuid4(),
-            session_id=session.id,
+            session_id=turn.session.id,
             role="assistant",
-            content=ai_response,
+            content=content,
+            created_at=now,
         )
         db.add(assistant_msg)
+        # Moves the session to the top of the history list
+        turn.session.updated_at = now
         await db.flush()
+        return assistant_msg
 
-        # Reload session with all messages
-        result = await db.execute(
-            select(ChatSession).where(ChatSession.id == session.id)
-        )
-        session = result.scalar_one()
+    @staticmethod
+    async def send_message(
+        db: AsyncSession, user: AuthPrincipal, data: ChatMessageRequest
+    ) -> ChatSessionResponse:
+        """
+        Process a user message and get the AI response.
+        Returns the session with only the new user/assistant message pair;
+        use get_session() for the transcript.
+        """
+        turn = await ChatService._start_turn(db, user, data)
 
-        # Build response
-        result = await db.execute(
-            select(ChatMessage)
-            .where(ChatMessage.session_id == session.id)
-            .order_by(ChatMessage.created_at)
-        )
-        messages = result.scalars().all()
+        # Get AI response with real data
+        ai_response = await _get_ai_response(turn.context, turn.user_context, str(user.university_id))
+        assistant_msg = await ChatService._finish_turn(db, turn, ai_response)
 
         return ChatSessionResponse(
-            id=session.id,
-            title=session.title,
-            messages=[ChatMessageResponse.model_validate(m) for m in messages],
-            created_at=session.created_at,
-            updated_at=session.updated_at,
+            id=turn.session.id,
+            title=turn.session.title,
+            messages=[
+                ChatMessageResponse.model_validate(turn.user_message),
+                ChatMessageResponse.model_validate(assistant_msg),
+            ],
+            created_at=turn.session.created_at,
+            updated_at=turn.session.updated_at,
+        )
+
+    @staticmethod
+    async def stream_message(
+        unit_of_work, user: AuthPrincipal, data: ChatMessageRequest
+    ) -> StreamingResponse:
+        """
+        Process a user message and stream the AI reply as Server-Sent Events.
+
+        Events: `session` (session id and the user message), `token` (text
+        delta), then `done` with the persisted assistant message, or `error`
+        if the reply could not be stored.
+
+        The user turn commits in its own short transaction before streaming
+        starts (so it survives a client disconnect) and the reply in another
+        once the stream ends: no connection is held while tokens arrive.
+        """
+        async with unit_of_work() as db:
+            turn = await ChatService._start_turn(db, user, data)
+
+        async def events() -> AsyncIterator[str]:
+            yield _sse("session", {
+                "session_id": turn.session.id,
+                "title": turn.session.title,
+                "message": ChatMessageResponse.model_validate(turn.user_message).model_dump(mode="json"),
+            })
+            parts: list[str] = []
+            async for delta in _stream_ai_response(turn.context, turn.user_context, str(user.university_id)):
+                parts.append(delta)
+                yield _sse("token", {"delta": delta})
+            try:
+                reply = "".join(parts) or "I'm sorry, I couldn't generate a response."
+                async with unit_of_work() as db:
+                    db.add(turn.session)  # re-attach the committed session row
+                    assistant_msg = await ChatService._finish_turn(db, turn, reply)
+            except Exception:
+                yield _sse("error", {"detail": "Could not save the assistant reply."})
+                raise
+            yield _sse("done", {
+                "message": ChatMessageResponse.model_validate(assistant_msg).model_dump(mode="json"),
+            })
+
+        return StreamingResponse(
+            events(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
         )
 
     @staticmethod
     async def get_history(
-        db: AsyncSession, user: User
+        db: AsyncSession, user: AuthPrincipal, limit: int = 20, cursor: str | None = None
     ) -> ChatSessionListResponse:
-        """List all chat sessions for a user."""
-        result = await db.execute(
-            select(ChatSession)
-            .where(ChatSession.user_id == user.id)
-            .order_by(ChatSession.updated_at.desc())
+        """
+        List the user's chat sessions, most recently active first.
+        One statement returns the page together with each session's message
+        count and last-message preview; transcripts come from get_session().
+        """
+        query = select(
+            ChatSession.id, ChatSession.title, ChatSession.created_at, ChatSession.updated_at,
+        ).where(ChatSession.user_id == user.id)
+        if cursor:
+            updated_at, session_id = _decode_cursor(cursor, datetime, uuid.UUID)
+            query = query.where(
+                or_(
+                    ChatSession.updated_at < updated_at,
+                    and_(ChatSession.updated_at == updated_at, ChatSession.id < session_id),
+                )
+            )
+        page = (
+            query.order_by(ChatSession.updated_at.desc(), ChatSession.id.desc())
+            .limit(limit + 1)
+            .subquery("page")
         )
-        sessions = result.scalars().all()
-
-        session_responses = []
-        for s in sessions:
-            msg_result = await db.execute(
-                select(ChatMessage)
-                .where(ChatMessage.session_id == s.id)
-                .order_by(ChatMessage.created_at)
+
+        ranked = (
+            select(
+                ChatMessage.session_id,
+                ChatMessage.role,
+                func.substr(ChatMessage.content, 1, PREVIEW_LENGTH).label("preview"),
+                ChatMessage.created_at,
+                func.row_number().over(
+                    partition_by=ChatMessage.session_id,
+                    order_by=(ChatMessage.created_at.desc(), ChatMessage.id.desc()),
+                ).label("position"),
+                func.count().over(partition_by=ChatMessage.session_id).label("message_count"),
             )
-            messages = msg_result.scalars().all()
-            session_responses.append(
-                ChatSessionResponse(
-                    id=s.id,
-                    title=s.title,
-                    messages=[ChatMessageResponse.model_validate(m) for m in messages],
-                    created_at=s.created_at,
-                    updated_at=s.updated_at,
-                )
+            .where(ChatMessage.session_id.in_(select(page.c.id)))
+            .subquery("ranked")
+        )
+
+        result = await db.execute(
+            select(
+                page,
+                func.coalesce(ranked.c.message_count, 0).label("message_count"),
+                ranked.c.preview,
+                ranked.c.role,
+                ranked.c.created_at.label("last_message_at"),
             )
+            .outerjoin(ranked, and_(ranked.c.session_id == page.c.id, ranked.c.position == 1))
+            .order_by(page.c.updated_at.desc(), page.c.id.desc())
+        )
+        rows = result.mappings().all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["updated_at"], rows[-1]["id"])
 
         return ChatSessionListResponse(
-            sessions=session_responses,
-            total=len(session_responses),
+            sessions=[
+                ChatSessionSummary(
+                    id=row["id"],
+                    title=row["title"],
+                    message_count=row["message_count"],
+                    last_message_preview=row["preview"],
+                    last_message_role=row["role"],
+                    last_message_at=row["last_message_at"],
+                    created_at=row["created_at"],
+                    updated_at=row["updated_at"],
+                )
+                for row in rows
+            ],
+            next_cursor=next_cursor,
         )
 
     @staticmethod
     async def get_session(
-        db: AsyncSession, user: User, session_id: uuid.UUID
+        db: AsyncSession,
+        user: AuthPrincipal,
+        session_id: uuid.UUID,
+        limit: int = 50,
+        cursor: str | None = None,
     ) -> ChatSessionResponse:
-        """Get a specific chat session with messages."""
+        """
+        Get a chat session with its most recent messages (oldest first).
+        Pass next_cursor back to page towards the start of the conversation.
+        """
         result = await db.execute(
             select(ChatSession).where(
                 ChatSession.id == session_id,
@@ -339,12 +603,25 @@ class ChatService:
                 detail="Chat session not found.",
             )
 
+        query = select(ChatMessage).where(ChatMessage.session_id == session.id)
+        if cursor:
+            created_at, message_id = _decode_cursor(cursor, datetime, uuid.UUID)
+            query = query.where(
+                or_(
+                    ChatMessage.created_at < created_at,
+                    and_(ChatMessage.created_at == created_at, ChatMessage.id < message_id),
+                )
+            )
         msg_result = await db.execute(
-            select(ChatMessage)
-            .where(ChatMessage.session_id == session.id)
-            .order_by(ChatMessage.created_at)
+            query.order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc()).limit(limit + 1)
         )
-        messages = msg_result.scalars().all()
+        messages = list(msg_result.scalars().all())
+
+        next_cursor = None
+        if len(messages) > limit:
+            messages = messages[:limit]
+            next_cursor = encode_cursor(messages[-1].created_at, messages[-1].id)
+        messages.reverse()
 
         return ChatSessionResponse(
             id=session.id,
@@ -352,4 +629,5 @@ class ChatService:
             messages=[ChatMessageResponse.model_validate(m) for m in messages],
             created_at=session.created_at,
             updated_at=session.updated_at,
+            next_cursor=next_cursor,
         )
@@ -6,8 +6,9 @@ from datetime import datetime, timezone
 from fastapi import HTTPException
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.auth.principal import AuthPrincipal
+from app.core.cache import invalidate_student, invalidate_university
 from app.models.compliance import ComplianceItem, StudentCompliance
-from app.models.user import User
 from app.schemas.compliance import (
     ComplianceItemCreate, ComplianceItemUpdate, ComplianceItemResponse, ComplianceItemListResponse,
     StudentComplianceSubmit, StudentComplianceResponse, StudentComplianceListResponse,
@@ -15,15 +16,16 @@ from app.schemas.compliance import (
 
 class ComplianceService:
     @staticmethod
-    async def create_item(db: AsyncSession, admin: User, data: ComplianceItemCreate) -> ComplianceItemResponse:
+    async def create_item(db: AsyncSession, admin: AuthPrincipal, data: ComplianceItemCreate) -> ComplianceItemResponse:
         item = ComplianceItem(id=uuid.uuid4(), university_id=admin.university_id, title=data.title, description=data.description, compliance_type=data.compliance_type, content_url=data.content_url, order=data.order, is_required=data.is_required)
         db.add(item)
         await db.flush()
         await db.refresh(item)
+        await invalidate_university(db, admin.university_id)
         return ComplianceItemResponse.model_validate(item)
 
     @staticmethod
-    async def update_item(db: AsyncSession, admin: User, item_id: uuid.UUID, data: ComplianceItemUpdate) -> ComplianceItemResponse:
+    async def update_item(db: AsyncSession, admin: AuthPrincipal, item_id: uuid.UUID, data: ComplianceItemUpdate) -> ComplianceItemResponse:
         result = await db.execute(select(ComplianceItem).where(ComplianceItem.id == item_id, ComplianceItem.university_id == admin.university_id))
         item = result.scalar_one_or_none()
         if not item:
@@ -32,6 +34,7 @@ class ComplianceService:
             setattr(item, field, value)
         await db.flush()
         await db.refresh(item)
+        await invalidate_university(db, admin.university_id)
         return ComplianceItemResponse.model_validate(item)
 
     @staticmethod
@@ -41,7 +44,7 @@ class ComplianceService:
         return ComplianceItemListResponse(items=[ComplianceItemResponse.model_validate(i) for i in items], total=len(items))
 
     @staticmethod
-    async def submit_compliance(db: AsyncSession, user: User, data: StudentComplianceSubmit) -> StudentComplianceResponse:
+    async def submit_compliance(db: AsyncSession, user: AuthPrincipal, data: StudentComplianceSubmit) -> StudentComplianceResponse:
         # Verify item exists
         item_result = await db.execute(select(ComplianceItem).where(ComplianceItem.id == data.compliance_item_id, ComplianceItem.university_id == user.university_id))
         item = item_result.scalar_one_or_none()
@@ -60,6 +63,7 @@ class ComplianceService:
             db.add(record)
         await db.flush()
         await db.refresh(record)
+        await invalidate_student(db, user.id)
         resp = StudentComplianceResponse.model_validate(record)
         resp.item_title = item.title
         resp.item_type = item.compliance_type.value if hasattr(item.compliance_type, 'value') else item.compliance_type
@@ -69,7 +73,7 @@ class ComplianceService:
         return resp
 
     @staticmethod
-    async def get_student_compliance(db: AsyncSession, user: User) -> StudentComplianceListResponse:
+    async def get_student_compliance(db: AsyncSession, user: AuthPrincipal) -> StudentComplianceListResponse:
         # Get all items for university
         items_result = await db.execute(select(ComplianceItem).where(ComplianceItem.university_id == user.university_id, ComplianceItem.is_active == True).order_by(ComplianceItem.order))
         all_items = items_result.scalars().all()
@@ -4,28 +4,98 @@ Course Registration Service
 Handles courses, subjects, and student enrollments.
 """
 
+import asyncio
+import csv
+import io
+import re
 import uuid
 from datetime import datetime, timezone
 
-from fastapi import HTTPException, status
-from sqlalchemy import select, func
+from fastapi import HTTPException, UploadFile, status
+from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.auth.principal import AuthPrincipal
+from app.core.cache import invalidate_student, invalidate_timetable
+from app.database import dialect_insert
 from app.models.course import Course, Subject, Enrollment, EnrollmentStatus
-from app.models.user import User
+from app.models.loaders import LoadProfile, load_options
+from app.models.user import User, UserRole
 from app.schemas.course import (
     CourseCreate, CourseUpdate, CourseResponse, CourseListResponse,
     SubjectCreate, SubjectUpdate, SubjectResponse, SubjectListResponse,
     EnrollmentCreate, EnrollmentResponse, EnrollmentListResponse, EnrollmentDropRequest,
+    EnrollmentImportError, EnrollmentImportResponse,
 )
 
 
+async def upsert_enrollments(db: AsyncSession, rows: list[dict]) -> int:
+    """
+    Enroll (user_id, course_id, subject_id, university_id) rows in one multi-row
+    INSERT. A previously dropped enrollment for the same subject is reactivated;
+    active enrollments are left untouched. Returns how many rows were written.
+    Rows must be unique per (user_id, subject_id).
+    """
+    now = datetime.now(timezone.utc)
+    stmt = dialect_insert(db, Enrollment).values([
+        {**row, "id": uuid.uuid4(), "status": EnrollmentStatus.ACTIVE, "enrolled_at": now}
+        for row in rows
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Enrollment.user_id, Enrollment.subject_id],
+        set_={
+            "course_id": stmt.excluded.course_id,
+            "status": stmt.excluded.status,
+            "enrolled_at": stmt.excluded.enrolled_at,
+            "dropped_at": None,
+            "updated_at": func.now(),
+        },
+        where=Enrollment.status != EnrollmentStatus.ACTIVE,
+    )
+    result = await db.execute(stmt.returning(Enrollment.id))
+    return len(result.all())
+
+
+IMPORT_COLUMNS = ("email", "course_code", "subject_codes")
+IMPORT_CHUNK_SIZE = 1000  # enrollment rows per INSERT
+MAX_IMPORT_ERRORS = 500  # per-row errors reported back
+MAX_IMPORT_SIZE = 10 * 1024 * 1024  # 10 MB, far above a large cohort file
+
+
+def _split_codes(value: str) -> list[str]:
+    """Subject codes separated by ';', '|' or whitespace."""
+    return [c for c in re.split(r"[;|\s]+", value.strip()) if c]
+
+
+def _parse_import_csv(data: bytes) -> list[tuple[int, dict]]:
+    """
+    Decode and parse an enrollment CSV into (line number, row) pairs with
+    lower-cased column names. Raises ValueError naming the offending line.
+    """
+    try:
+        text = data.decode("utf-8-sig")
+    except UnicodeDecodeError as exc:
+        line = data.count(b"\n", 0, exc.start) + 1
+        raise ValueError(f"Line {line} is not valid UTF-8. Save the file as 'CSV UTF-8' and retry.") from exc
+
+    reader = csv.DictReader(io.StringIO(text, newline=""))
+    try:
+        header = [h.strip().lower() for h in reader.fieldnames or []]
+        missing = [c for c in IMPORT_COLUMNS if c not in header]
+        if missing:
+            raise ValueError(f"CSV is missing columns: {', '.join(missing)}")
+        reader.fieldnames = header
+        return [(reader.line_num, row) for row in reader]
+    except csv.Error as exc:
+        raise ValueError(f"Line {reader.line_num + 1} is not valid CSV: {exc}") from exc
+
+
 class CourseService:
     """Course & enrollment business logic."""
 
     # ── Courses ──────────────────────────────
     @staticmethod
-    async def create_course(db: AsyncSession, admin: User, data: CourseCreate) -> CourseResponse:
+    async def create_course(db: AsyncSession, admin: AuthPrincipal, data: CourseCreate) -> CourseResponse:
         course = Course(
             id=uuid.uuid4(),
             university_id=admin.university_id,
@@ -41,7 +111,7 @@ class CourseService:
         return CourseResponse.model_validate(course)
 
     @staticmethod
-    async def update_course(db: AsyncSession, admin: User, course_id: uuid.UUID, data: CourseUpdate) -> CourseResponse:
+    async def update_course(db: AsyncSession, admin: AuthPrincipal, course_id: uuid.UUID, data: CourseUpdate) -> CourseResponse:
         result = await db.execute(
             select(Course).where(Course.id == course_id, Course.university_id == admin.university_id)
         )
@@ -75,7 +145,7 @@ class CourseService:
 
     # ── Subjects ─────────────────────────────
     @staticmethod
-    async def create_subject(db: AsyncSession, admin: User, data: SubjectCreate) -> SubjectResponse:
+    async def create_subject(db: AsyncSession, admin: AuthPrincipal, data: SubjectCreate) -> SubjectResponse:
         # Verify course belongs to admin's university
         result = await db.execute(
             select(Course).where(Course.id == data.course_id, Course.university_id == admin.university_id)
@@ -99,7 +169,7 @@ class CourseService:
         return SubjectResponse.model_validate(subject)
 
     @staticmethod
-    async def update_subject(db: AsyncSession, admin: User, subject_id: uuid.UUID, data: SubjectUpdate) -> SubjectResponse:
+    async def update_subject(db: AsyncSession, admin: AuthPrincipal, subject_id: uuid.UUID, data: SubjectUpdate) -> SubjectResponse:
         result = await db.execute(
             select(Subject).where(Subject.id == subject_id, Subject.university_id == admin.university_id)
         )
@@ -110,6 +180,7 @@ class CourseService:
             setattr(subject, field, value)
         await db.flush()
         await db.refresh(subject)
+        await invalidate_timetable(db, admin.university_id)  # rendered timetables show subject names
         return SubjectResponse.model_validate(subject)
 
     @staticmethod
@@ -127,58 +198,160 @@ class CourseService:
 
     # ── Enrollments ──────────────────────────
     @staticmethod
-    async def enroll(db: AsyncSession, user: User, data: EnrollmentCreate) -> EnrollmentListResponse:
-        # Verify course exists
+    async def enroll(db: AsyncSession, user: AuthPrincipal, data: EnrollmentCreate) -> EnrollmentListResponse:
+        subject_ids = list(dict.fromkeys(data.subject_ids))
+
+        # Course and every requested subject in one query
         result = await db.execute(
-            select(Course).where(Course.id == data.course_id, Course.university_id == user.university_id)
+            select(Course.id, Subject.id)
+            .outerjoin(Subject, and_(Subject.course_id == Course.id, Subject.id.in_(subject_ids)))
+            .where(Course.id == data.course_id, Course.university_id == user.university_id)
         )
-        course = result.scalar_one_or_none()
-        if not course:
+        rows = result.all()
+        if not rows:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+        valid = {subject_id for _, subject_id in rows if subject_id is not None}
+        missing = [str(s) for s in subject_ids if s not in valid]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Subjects not found in course: {', '.join(missing)}",
+            )
 
-        enrollments = []
-        for subject_id in data.subject_ids:
-            # Verify subject belongs to course
-            sub_result = await db.execute(
-                select(Subject).where(Subject.id == subject_id, Subject.course_id == data.course_id)
+        # Skip subjects already actively enrolled
+        result = await db.execute(
+            select(Enrollment.subject_id).where(
+                Enrollment.user_id == user.id,
+                Enrollment.subject_id.in_(subject_ids),
+                Enrollment.status == EnrollmentStatus.ACTIVE,
             )
-            subject = sub_result.scalar_one_or_none()
-            if not subject:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Subject {subject_id} not found in course",
-                )
-
-            # Check if already enrolled
-            existing = await db.execute(
-                select(Enrollment).where(
-                    Enrollment.user_id == user.id,
-                    Enrollment.subject_id == subject_id,
-                    Enrollment.status == EnrollmentStatus.ACTIVE,
-                )
+        )
+        active = set(result.scalars().all())
+        to_enroll = [s for s in subject_ids if s not in active]
+
+        if to_enroll:
+            await upsert_enrollments(db, [
+                {
+                    "user_id": user.id,
+                    "course_id": data.course_id,
+                    "subject_id": subject_id,
+                    "university_id": user.university_id,
+                }
+                for subject_id in to_enroll
+            ])
+            await invalidate_student(db, user.id)
+
+        return await CourseService.get_enrollments(db, user)
+
+    @staticmethod
+    async def import_enrollments(
+        db: AsyncSession, admin: AuthPrincipal, file: UploadFile
+    ) -> EnrollmentImportResponse:
+        """
+        Bulk-enroll students from a CSV with columns email, course_code, subject_codes.
+
+        The upload is read without blocking the event loop and decoded and
+        parsed in a worker thread, so an undecodable or malformed file is
+        rejected (400, naming the line) before anything is written. Students,
+        courses and subjects of the university are preloaded into lookup maps,
+        and rows are written in IMPORT_CHUNK_SIZE multi-row upserts. Invalid
+        rows are reported and skipped without aborting the import.
+        """
+        uni_id = admin.university_id
+        data = await file.read(MAX_IMPORT_SIZE + 1)
+        if len(data) > MAX_IMPORT_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"CSV exceeds maximum of {MAX_IMPORT_SIZE // (1024 * 1024)}MB.",
             )
-            if existing.scalar_one_or_none():
-                continue  # Skip already enrolled
-
-            enrollment = Enrollment(
-                id=uuid.uuid4(),
-                user_id=user.id,
-                course_id=data.course_id,
-                subject_id=subject_id,
-                university_id=user.university_id,
-                status=EnrollmentStatus.ACTIVE,
+        try:
+            rows = await asyncio.to_thread(_parse_import_csv, data)
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+        # ── Lookup maps ──
+        result = await db.execute(
+            select(func.lower(User.email), User.id).where(
+                User.university_id == uni_id, User.role == UserRole.STUDENT,
             )
-            db.add(enrollment)
-            enrollments.append(enrollment)
+        )
+        students = dict(result.all())
+        result = await db.execute(select(Course.code, Course.id).where(Course.university_id == uni_id))
+        courses = dict(result.all())
+        result = await db.execute(
+            select(Subject.code, Subject.id, Subject.course_id).where(Subject.university_id == uni_id)
+        )
+        subjects = {code: (subject_id, course_id) for code, subject_id, course_id in result.all()}
 
-        await db.flush()
-        for e in enrollments:
-            await db.refresh(e)
+        errors: list[EnrollmentImportError] = []
+        rows_total = rows_failed = written = 0
+        pending: list[dict] = []
+        seen: set[tuple[uuid.UUID, uuid.UUID]] = set()
 
-        return await CourseService.get_enrollments(db, user)
+        async def flush_pending() -> None:
+            nonlocal written
+            if not pending:
+                return
+            written += await upsert_enrollments(db, pending)
+            for user_id in {row["user_id"] for row in pending}:
+                await invalidate_student(db, user_id)
+            pending.clear()
+
+        def fail(line: int, email: str | None, error: str) -> None:
+            nonlocal rows_failed
+            rows_failed += 1
+            if len(errors) < MAX_IMPORT_ERRORS:
+                errors.append(EnrollmentImportError(row=line, email=email, error=error))
+
+        for line, row in rows:
+            rows_total += 1
+            email = (row.get("email") or "").strip().lower()
+            course_code = (row.get("course_code") or "").strip()
+            codes = _split_codes(row.get("subject_codes") or "")
+
+            user_id = students.get(email)
+            if user_id is None:
+                fail(line, email or None, "Unknown student email")
+                continue
+            course_id = courses.get(course_code)
+            if course_id is None:
+                fail(line, email, f"Unknown course code '{course_code}'")
+                continue
+            if not codes:
+                fail(line, email, "No subject codes")
+                continue
+            bad = [c for c in codes if subjects.get(c, (None, None))[1] != course_id]
+            if bad:
+                fail(line, email, f"Subjects not in course {course_code}: {', '.join(bad)}")
+                continue
+
+            for code in codes:
+                subject_id = subjects[code][0]
+                if (user_id, subject_id) in seen:
+                    continue
+                seen.add((user_id, subject_id))
+                pending.append({
+                    "user_id": user_id,
+                    "course_id": course_id,
+                    "subject_id": subject_id,
+                    "university_id": uni_id,
+                })
+            if len(pending) >= IMPORT_CHUNK_SIZE:
+                await flush_pending()
+
+        await flush_pending()
+
+        return EnrollmentImportResponse(
+            rows_total=rows_total,
+            rows_imported=rows_total - rows_failed,
+            rows_failed=rows_failed,
+            enrollments_written=written,
+            errors=errors,
+            errors_truncated=rows_failed > len(errors),
+        )
 
     @staticmethod
-    async def drop_subject(db: AsyncSession, user: User, data: EnrollmentDropRequest) -> EnrollmentListResponse:
+    async def drop_subject(db: AsyncSession, user: AuthPrincipal, data: EnrollmentDropRequest) -> EnrollmentListResponse:
         result = await db.execute(
             select(Enrollment).where(
                 Enrollment.user_id == user.id,
@@ -193,16 +366,20 @@ class CourseService:
         enrollment.status = EnrollmentStatus.DROPPED
         enrollment.dropped_at = datetime.now(timezone.utc)
         await db.flush()
+        await invalidate_student(db, user.id)
 
         return await CourseService.get_enrollments(db, user)
 
     @staticmethod
-    async def get_enrollments(db: AsyncSession, user: User) -> EnrollmentListResponse:
+    async def get_enrollments(db: AsyncSession, user: AuthPrincipal) -> EnrollmentListResponse:
         result = await db.execute(
-            select(Enrollment).where(
+            select(Enrollment)
+            .options(*load_options(Enrollment, LoadProfile.DASHBOARD))
+            .where(
                 Enrollment.user_id == user.id,
                 Enrollment.status == EnrollmentStatus.ACTIVE,
             ).order_by(Enrollment.enrolled_at)
+            .execution_options(populate_existing=True)
         )
         enrollments = result.scalars().all()
         items = []
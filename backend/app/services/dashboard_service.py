@@ -0,0 +1,317 @@
+"""
+Dashboard Service
+
+Builds the student dashboard summary.
+All per-student state (profile, documents, payments, hostel, LMS,
+enrollments, compliance) is aggregated in a single SQL statement, and the
+onboarding checklist is derived from that one row.
+
+Summaries are cached per student, keyed by the student's and university's
+state tokens; write paths that change any of the inputs invalidate them.
+"""
+
+import uuid
+from collections.abc import Mapping
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, distinct, func, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.principal import AuthPrincipal
+from app.config import get_settings
+from app.core.cache import get_cache, state_token, student_scope, university_scope
+from app.models.compliance import ComplianceItem, StudentCompliance
+from app.models.course import Enrollment, EnrollmentStatus
+from app.models.document import Document, DocumentStatus
+from app.models.hostel import HostelApplication
+from app.models.lms import LMSActivation
+from app.models.payment import Payment, PaymentStatus
+from app.models.user import User
+
+settings = get_settings()
+
+REQUIRED_DOC_TYPES = ("10th_marksheet", "12th_marksheet", "aadhar_card", "photo")
+
+
+def _summary_statement(user_id: uuid.UUID, university_id: uuid.UUID | None):
+    """One SELECT returning every number the dashboard renders for a student."""
+    required_doc = Document.document_type.in_(REQUIRED_DOC_TYPES)
+    docs = (
+        select(
+            func.count().label("doc_total"),
+            func.count().filter(Document.status == DocumentStatus.APPROVED).label("doc_approved"),
+            func.count().filter(Document.status == DocumentStatus.PENDING).label("doc_pending"),
+            func.count().filter(Document.status == DocumentStatus.REJECTED).label("doc_rejected"),
+            func.count().filter(Document.status == DocumentStatus.UNDER_REVIEW).label("doc_under_review"),
+            func.count(distinct(Document.document_type)).filter(required_doc).label("required_uploaded"),
+            func.count(distinct(Document.document_type))
+            .filter(and_(required_doc, Document.status == DocumentStatus.APPROVED))
+            .label("required_approved"),
+        )
+        .where(Document.user_id == user_id)
+        .subquery("docs")
+    )
+
+    payments = (
+        select(
+            func.count().label("payment_count"),
+            func.count().filter(Payment.status == PaymentStatus.COMPLETED).label("payment_completed"),
+            func.coalesce(
+                func.sum(Payment.amount).filter(Payment.status == PaymentStatus.COMPLETED), 0
+            ).label("total_paid"),
+            func.coalesce(
+                func.sum(Payment.amount).filter(Payment.status == PaymentStatus.PENDING), 0
+            ).label("total_pending"),
+        )
+        .where(Payment.user_id == user_id)
+        .subquery("payments")
+    )
+
+    enrollments = (
+        select(func.count().label("enrollment_count"))
+        .where(
+            Enrollment.user_id == user_id,
+            Enrollment.status == EnrollmentStatus.ACTIVE,
+        )
+        .subquery("enrollments")
+    )
+
+    compliance = (
+        select(
+            func.count(distinct(ComplianceItem.id)).label("compliance_total"),
+            func.count(distinct(ComplianceItem.id))
+            .filter(StudentCompliance.is_completed == True)
+            .label("compliance_done"),
+        )
+        .select_from(ComplianceItem)
+        .outerjoin(
+            StudentCompliance,
+            and_(
+                StudentCompliance.compliance_item_id == ComplianceItem.id,
+                StudentCompliance.user_id == user_id,
+            ),
+        )
+        .where(
+            ComplianceItem.university_id == university_id,
+            ComplianceItem.is_active == True,
+            ComplianceItem.is_required == True,
+        )
+        .subquery("compliance")
+    )
+
+    return (
+        select(
+            User.first_name,
+            User.last_name,
+            User.email,
+            User.phone,
+            User.role,
+            HostelApplication.id.label("hostel_id"),
+            HostelApplication.status.label("hostel_status"),
+            HostelApplication.room_type_preference.label("hostel_room_type"),
+            HostelApplication.allocated_room_number.label("hostel_room_number"),
+            LMSActivation.id.label("lms_row_id"),
+            LMSActivation.is_activated.label("lms_activated"),
+            LMSActivation.activation_key.label("lms_key"),
+            LMSActivation.platform.label("lms_platform"),
+            docs,
+            payments,
+            enrollments,
+            compliance,
+        )
+        .select_from(User)
+        .outerjoin(HostelApplication, HostelApplication.user_id == User.id)
+        .outerjoin(LMSActivation, LMSActivation.user_id == User.id)
+        .join(docs, true())
+        .join(payments, true())
+        .join(enrollments, true())
+        .join(compliance, true())
+        .where(User.id == user_id)
+    )
+
+
+def _build_dynamic_checklist(stats: Mapping) -> dict:
+    """Build a dynamic onboarding checklist from the aggregated dashboard row."""
+    items = []
+
+    # 1. Profile completion
+    profile_done = bool(stats["first_name"] and stats["last_name"] and stats["phone"])
+    items.append({
+        "id": "profile",
+        "title": "Complete your profile",
+        "description": "Add your name, phone number, and personal details",
+        "category": "profile",
+        "order": 1,
+        "is_completed": profile_done,
+        "is_required": True,
+    })
+
+    # 2. Document uploads
+    required_total = len(REQUIRED_DOC_TYPES)
+    required_uploaded = stats["required_uploaded"]
+    required_approved = stats["required_approved"]
+    items.append({
+        "id": "documents_upload",
+        "title": "Upload required documents",
+        "description": f"{required_uploaded}/{required_total} required documents uploaded",
+        "category": "documents",
+        "order": 2,
+        "is_completed": required_uploaded >= required_total,
+        "is_required": True,
+    })
+
+    items.append({
+        "id": "documents_approved",
+        "title": "Documents verified by admin",
+        "description": f"{required_approved}/{required_total} documents approved",
+        "category": "documents",
+        "order": 3,
+        "is_completed": required_approved >= required_total,
+        "is_required": True,
+    })
+
+    # 3. Fee payment
+    has_payment = stats["payment_completed"] > 0
+    items.append({
+        "id": "payment",
+        "title": "Pay admission fees",
+        "description": f"₹{stats['total_paid']:,.0f} paid" if has_payment else "No payments made yet",
+        "category": "payments",
+        "order": 4,
+        "is_completed": has_payment,
+        "is_required": True,
+    })
+
+    # 4. Hostel application
+    hostel_applied = stats["hostel_id"] is not None
+    items.append({
+        "id": "hostel",
+        "title": "Apply for hostel",
+        "description": f"Status: {stats['hostel_status'].value}" if hostel_applied else "Not applied yet",
+        "category": "hostel",
+        "order": 5,
+        "is_completed": hostel_applied,
+        "is_required": False,
+    })
+
+    # 5. LMS activation
+    lms_active = bool(stats["lms_activated"])
+    items.append({
+        "id": "lms",
+        "title": "Activate LMS access",
+        "description": f"LMS ID: {stats['lms_key']}" if lms_active else "Not activated yet",
+        "category": "lms",
+        "order": 6,
+        "is_completed": lms_active,
+        "is_required": True,
+    })
+
+    # 6. Course enrollment
+    enrollment_count = stats["enrollment_count"]
+    items.append({
+        "id": "course_enrollment",
+        "title": "Enroll in courses",
+        "description": f"{enrollment_count} subjects enrolled" if enrollment_count > 0 else "Select your course and subjects",
+        "category": "courses",
+        "order": 7,
+        "is_completed": enrollment_count > 0,
+        "is_required": True,
+    })
+
+    # 7. Compliance training
+    compliance_done = stats["compliance_done"]
+    compliance_total = stats["compliance_total"]
+    compliance_completed = compliance_done >= compliance_total and compliance_total > 0
+    items.append({
+        "id": "compliance",
+        "title": "Complete compliance training",
+        "description": f"{compliance_done}/{compliance_total} items completed" if compliance_total > 0 else "No compliance items configured",
+        "category": "compliance",
+        "order": 8,
+        "is_completed": compliance_completed,
+        "is_required": compliance_total > 0,
+    })
+
+    # Calculate percentage
+    required_items = [i for i in items if i["is_required"]]
+    completed_required = [i for i in required_items if i["is_completed"]]
+    percentage = round(len(completed_required) / len(required_items) * 100) if required_items else 0
+
+    return {
+        "items": items,
+        "percentage": percentage,
+        "total": len(items),
+        "completed": len([i for i in items if i["is_completed"]]),
+    }
+
+
+class DashboardService:
+    """Student dashboard aggregation."""
+
+    @staticmethod
+    async def get_summary(db: AsyncSession, user: AuthPrincipal) -> dict:
+        """Cached dashboard summary; rebuilt only after the student's state changed."""
+        cache = get_cache("dashboard", ttl=settings.DASHBOARD_CACHE_TTL_SECONDS)
+        key = ":".join([
+            str(user.id),
+            await state_token(student_scope(user.id)),
+            await state_token(university_scope(user.university_id)),
+        ])
+        summary = await cache.get(key)
+        if summary is None:
+            summary = await DashboardService.build_summary(db, user)
+            await cache.set(key, summary)
+        return summary
+
+    @staticmethod
+    async def build_summary(db: AsyncSession, user: AuthPrincipal) -> dict:
+        result = await db.execute(_summary_statement(user.id, user.university_id))
+        stats = result.mappings().one_or_none()
+        if stats is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+        checklist = _build_dynamic_checklist(stats)
+
+        payment_count = stats["payment_count"]
+        if payment_count and stats["payment_completed"] == payment_count:
+            payment_status = "completed"
+        elif payment_count:
+            payment_status = "pending"
+        else:
+            payment_status = "none"
+
+        hostel_applied = stats["hostel_id"] is not None
+        lms_exists = stats["lms_row_id"] is not None
+
+        return {
+            "documents": {
+                "total": stats["doc_total"],
+                "approved": stats["doc_approved"],
+                "pending": stats["doc_pending"],
+                "rejected": stats["doc_rejected"],
+                "under_review": stats["doc_under_review"],
+            },
+            "payments": {
+                "status": payment_status,
+                "total_paid": stats["total_paid"],
+                "total_pending": stats["total_pending"],
+                "count": payment_count,
+            },
+            "hostel": {
+                "status": stats["hostel_status"].value if hostel_applied else "not_applied",
+                "room_type": stats["hostel_room_type"].value if hostel_applied else None,
+                "room_number": stats["hostel_room_number"] if hostel_applied else None,
+            },
+            "lms": {
+                "status": "activated" if stats["lms_activated"] else "inactive",
+                "lms_id": stats["lms_key"] if lms_exists else None,
+                "platform": stats["lms_platform"] if lms_exists else "Moodle",
+            },
+            "onboarding_percentage": checklist["percentage"],
+            "checklist": checklist,
+            "user": {
+                "name": f"{stats['first_name']} {stats['last_name']}",
+                "email": stats["email"],
+                "role": stats["role"].value,
+            },
+        }
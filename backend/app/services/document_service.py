@@ -1,37 +1,84 @@
 """
 Document Service
 
-Handles document upload, listing, and admin review.
+Handles document upload, listing, file serving, and admin review.
 Supports status workflow: pending → under_review → approved / rejected.
+
+Files are served through an authenticated endpoint. Locally stored files go
+out as FileResponse, which handles Range / If-Range and uses the server's
+zero-copy path (ASGI pathsend) when available. Remotely stored files get a
+redirect to a cached signed URL. Files are content-addressed, so the SHA-256
+is a strong ETag and If-None-Match is answered with 304.
 """
 
+import asyncio
+import os
 import uuid
 from datetime import datetime, timezone
 
 from fastapi import HTTPException, UploadFile, status
-from sqlalchemy import select, func as sa_func
+from fastapi.responses import FileResponse, RedirectResponse, Response
+from sqlalchemy import and_, inspect, select, func as sa_func
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from starlette.datastructures import Headers
 
-from app.models.document import Document, DocumentStatus
-from app.models.user import User
+from app.auth.principal import AuthPrincipal
+from app.config import get_settings
+from app.core.cache import Cache, get_cache, invalidate_student
+from app.database import after_commit
+from app.models.document import Document, DocumentStatus, StoredBlob
+from app.models.loaders import LoadProfile, load_options
+from app.models.user import User, UserRole
 from app.schemas.document import (
     DocumentListResponse,
     DocumentResponse,
     DocumentReviewRequest,
     DocumentUploadResponse,
 )
+from app.services.analytics_service import AnalyticsService
+from app.services.storage_backends import get_fallback_storage
 from app.services.storage_service import StorageService
 
+settings = get_settings()
+
+LOCAL_URL_PREFIX = "/uploads/"
+
+
+def _file_url(doc: Document) -> str:
+    """Local files are only reachable through the authenticated file endpoint."""
+    if doc.file_url.startswith(LOCAL_URL_PREFIX):
+        return f"{settings.API_V1_PREFIX}/documents/{doc.id}/file"
+    return doc.file_url
+
+
+def _access_cache() -> Cache:
+    return get_cache("document_access", ttl=settings.DOCUMENT_ACCESS_CACHE_TTL_SECONDS)
+
 
-def _doc_to_response(doc: Document, user: User | None = None) -> DocumentResponse:
+def _can_read(user: AuthPrincipal, facts: dict) -> bool:
+    if user.role == UserRole.SUPERADMIN:
+        return True
+    if user.role == UserRole.ADMIN:
+        return str(user.university_id) == facts["university_id"]
+    return str(user.id) == facts["user_id"]
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison, as If-None-Match requires."""
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+def _doc_to_response(
+    doc: Document, user: User | None = None, signed_url: str | None = None
+) -> DocumentResponse:
     """Convert a Document ORM object to DocumentResponse with optional student info."""
     data = {
         "id": doc.id,
         "user_id": doc.user_id,
         "document_type": doc.document_type,
         "file_name": doc.file_name,
-        "file_url": doc.file_url,
+        "file_url": _file_url(doc),
         "file_size": doc.file_size,
         "mime_type": doc.mime_type,
         "status": doc.status,
@@ -39,11 +86,12 @@ def _doc_to_response(doc: Document, user: User | None = None) -> DocumentRespons
         "reviewed_by": doc.reviewed_by,
         "reviewed_at": doc.reviewed_at,
         "created_at": doc.created_at,
+        "signed_url": signed_url,
     }
     if user:
         data["student_name"] = user.full_name
         data["student_email"] = user.email
-    elif hasattr(doc, "user") and doc.user:
+    elif "user" not in inspect(doc).unloaded and doc.user:
         data["student_name"] = doc.user.full_name
         data["student_email"] = doc.user.email
     return DocumentResponse(**data)
@@ -54,12 +102,11 @@ class DocumentService:
 
     @staticmethod
     async def upload(
-        db: AsyncSession, user: User, document_type: str, file: UploadFile
+        db: AsyncSession, user: AuthPrincipal, document_type: str, file: UploadFile
     ) -> DocumentUploadResponse:
         """Upload document to Supabase Storage and create DB record."""
-        # Upload to storage
-        path = f"{user.university_id}/{user.id}/documents"
-        file_url, file_size = await StorageService.upload_file(file, path)
+        # Upload to storage (identical content already held is reused)
+        stored = await StorageService.store_blob(db, file, user.university_id)
 
         # Create DB record
         doc = Document(
@@ -68,25 +115,28 @@ class DocumentService:
             university_id=user.university_id,
             document_type=document_type,
             file_name=file.filename or "unknown",
-            file_url=file_url,
-            file_size=file_size,
+            file_url=stored.url,
+            file_size=stored.size,
             mime_type=file.content_type or "application/octet-stream",
+            content_hash=stored.sha256,
             status=DocumentStatus.PENDING,
         )
         db.add(doc)
         await db.flush()
+        await AnalyticsService.document_status_changed(db, doc.university_id, None, doc.status)
+        await invalidate_student(db, user.id)
 
         return DocumentUploadResponse(
             id=doc.id,
             document_type=doc.document_type,
             file_name=doc.file_name,
-            file_url=doc.file_url,
+            file_url=_file_url(doc),
             status=doc.status,
             created_at=doc.created_at,
         )
 
     @staticmethod
-    async def list_by_user(db: AsyncSession, user: User) -> DocumentListResponse:
+    async def list_by_user(db: AsyncSession, user: AuthPrincipal) -> DocumentListResponse:
         """List all documents belonging to a user."""
         result = await db.execute(
             select(Document)
@@ -101,7 +151,7 @@ class DocumentService:
 
     @staticmethod
     async def get_by_id(
-        db: AsyncSession, user: User, document_id: uuid.UUID
+        db: AsyncSession, user: AuthPrincipal, document_id: uuid.UUID
     ) -> DocumentResponse:
         """Get a single document by ID."""
         result = await db.execute(
@@ -121,16 +171,131 @@ class DocumentService:
             )
         return _doc_to_response(doc)
 
+    @staticmethod
+    async def delete(db: AsyncSession, user: AuthPrincipal, document_id: uuid.UUID) -> dict:
+        """Student: withdraw one of their own documents that is not yet approved."""
+        result = await db.execute(
+            select(Document).where(Document.id == document_id, Document.user_id == user.id)
+        )
+        doc = result.scalar_one_or_none()
+        if not doc:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Document not found.",
+            )
+        if doc.status == DocumentStatus.APPROVED:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Approved documents cannot be deleted.",
+            )
+
+        if doc.content_hash:
+            await StorageService.delete_file(db, doc.university_id, doc.content_hash)
+        await db.delete(doc)
+
+        async def forget_access() -> None:
+            await _access_cache().delete(str(document_id))
+
+        after_commit(db, forget_access)
+        await db.flush()
+        await AnalyticsService.document_status_changed(db, doc.university_id, doc.status, None)
+        await invalidate_student(db, user.id)
+        return {"detail": "Document deleted"}
+
+    @staticmethod
+    async def _access_facts(db: AsyncSession, document_id: uuid.UUID) -> dict | None:
+        """Owner, tenant and storage location of a document, cached (they never change)."""
+        cache = _access_cache()
+        facts = await cache.get(str(document_id))
+        if facts is not None:
+            return facts
+        result = await db.execute(
+            select(
+                Document.user_id, Document.university_id, Document.file_url, Document.file_name,
+                Document.mime_type, Document.content_hash, StoredBlob.storage_path,
+            )
+            .outerjoin(StoredBlob, and_(
+                StoredBlob.university_id == Document.university_id,
+                StoredBlob.content_hash == Document.content_hash,
+            ))
+            .where(Document.id == document_id)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        facts = {
+            "user_id": str(row.user_id),
+            "university_id": str(row.university_id),
+            "file_url": row.file_url,
+            "file_name": row.file_name,
+            "mime_type": row.mime_type,
+            "content_hash": row.content_hash,
+            "storage_path": row.storage_path,
+        }
+        await cache.set(str(document_id), facts)
+        return facts
+
+    @staticmethod
+    async def serve_file(
+        db: AsyncSession, user: AuthPrincipal, document_id: uuid.UUID, request_headers: Headers
+    ) -> Response:
+        """Send a document's file to its owner or the university's admins."""
+        facts = await DocumentService._access_facts(db, document_id)
+        if facts is None or not _can_read(user, facts):
+            # Someone else's document is indistinguishable from a missing one
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Document not found.",
+            )
+
+        file_url = facts["file_url"]
+        if not file_url.startswith(LOCAL_URL_PREFIX):
+            url = file_url
+            if facts["storage_path"]:
+                url = await StorageService.get_signed_url(facts["storage_path"]) or file_url
+            return RedirectResponse(url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+
+        path = get_fallback_storage().local_path(file_url.removeprefix(LOCAL_URL_PREFIX))
+        try:
+            stat_result = await asyncio.to_thread(os.stat, path)
+        except FileNotFoundError:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Document file not found.",
+            )
+        if facts["content_hash"]:
+            etag = f'"{facts["content_hash"]}"'
+        else:
+            etag = f'"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"'
+        headers = {
+            "ETag": etag,
+            "Cache-Control": f"private, max-age={settings.DOCUMENT_FILE_MAX_AGE_SECONDS}",
+        }
+
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return FileResponse(
+            path,
+            headers=headers,
+            media_type=facts["mime_type"],
+            filename=facts["file_name"],
+            stat_result=stat_result,
+            content_disposition_type="inline",
+        )
+
     @staticmethod
     async def review(
         db: AsyncSession,
-        admin: User,
+        admin: AuthPrincipal,
         document_id: uuid.UUID,
         data: DocumentReviewRequest,
     ) -> DocumentResponse:
         """Admin: change document status (under_review / approve / reject)."""
         result = await db.execute(
-            select(Document).options(selectinload(Document.user)).where(Document.id == document_id)
+            select(Document)
+            .options(*load_options(Document, LoadProfile.DETAIL))
+            .where(Document.id == document_id)
         )
         doc = result.scalar_one_or_none()
         if not doc:
@@ -153,6 +318,7 @@ class DocumentService:
                 detail=f"Cannot transition from '{doc.status.value}' to '{data.status.value}'.",
             )
 
+        previous_status = doc.status
         doc.status = data.status
         doc.reviewed_by = admin.id
         doc.reviewed_at = datetime.now(timezone.utc)
@@ -163,4 +329,6 @@ class DocumentService:
             doc.rejection_reason = None  # clear on approve/under_review
 
         await db.flush()
+        await AnalyticsService.document_status_changed(db, doc.university_id, previous_status, doc.status)
+        await invalidate_student(db, doc.user_id)
         return _doc_to_response(doc)
@@ -1,31 +1,118 @@
 """
 Hostel Service
 
-Handles hostel applications and admin allocation.
+Handles hostel applications, room inventory and admin allocation.
+
+Batch allocation assigns every pending application in one transaction:
+applicants needing an accessible room go first, then everyone else in the
+order they applied. Rooms are filled one at a time (partly occupied rooms
+first) so roommates are packed together, and all assignments are written
+with one bulk UPDATE.
 """
 
 import uuid
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime, timezone
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.hostel import ApplicationStatus, HostelApplication
-from app.models.user import User
+from app.auth.principal import AuthPrincipal
+from app.core.cache import invalidate_student
+from app.database import dialect_insert
+from app.models.hostel import ROOM_TYPE_CAPACITY, ApplicationStatus, HostelApplication, HostelRoom, RoomType
 from app.schemas.hostel import (
     HostelAllocationRequest,
     HostelApplicationRequest,
     HostelApplicationResponse,
+    HostelBatchAllocation,
+    HostelBatchAllocationRequest,
+    HostelBatchAllocationResponse,
+    HostelInventoryBucket,
+    HostelInventoryResponse,
+    HostelRoomBulkCreate,
+    HostelRoomBulkCreateResponse,
+)
+from app.services.analytics_service import AnalyticsService
+
+ROOM_INSERT_CHUNK_SIZE = 1000  # rooms per INSERT
+
+# Special requirements that call for an accessible (or ground-floor) room
+ACCESSIBILITY_KEYWORDS = (
+    "wheelchair", "accessib", "disab", "mobility", "ground floor", "crutch", "lift", "elevator",
 )
 
+# Room types to fall back to, nearest first, when the preferred type is full
+ROOM_TYPE_FALLBACK = {
+    RoomType.SINGLE: (RoomType.SINGLE, RoomType.DOUBLE, RoomType.TRIPLE),
+    RoomType.DOUBLE: (RoomType.DOUBLE, RoomType.SINGLE, RoomType.TRIPLE),
+    RoomType.TRIPLE: (RoomType.TRIPLE, RoomType.DOUBLE, RoomType.SINGLE),
+}
+
+# Room tiers each kind of applicant draws from, best first
+_ACCESSIBLE, _GROUND, _UPPER = "accessible", "ground", "upper"
+_TIERS_NEEDING_ACCESS = (_ACCESSIBLE, _GROUND)
+_TIERS_DEFAULT = (_UPPER, _GROUND, _ACCESSIBLE)
+
+
+def needs_accessible_room(special_requirements: str | None) -> bool:
+    text = (special_requirements or "").lower()
+    return any(keyword in text for keyword in ACCESSIBILITY_KEYWORDS)
+
+
+@dataclass
+class _Room:
+    id: uuid.UUID
+    block: str
+    floor: int
+    room_number: str
+    room_type: RoomType
+    occupied: int
+    capacity: int
+    is_accessible: bool
+    taken: int = 0  # beds assigned in this batch
+
+    @property
+    def free(self) -> int:
+        return self.capacity - self.occupied - self.taken
+
+    @property
+    def tier(self) -> str:
+        if self.is_accessible:
+            return _ACCESSIBLE
+        return _GROUND if self.floor == 0 else _UPPER
+
+
+class _RoomPool:
+    """Free rooms by (room type, tier), each a queue drained one room at a time."""
+
+    def __init__(self, rooms: list[_Room]):
+        self._queues: dict[tuple[RoomType, str], deque[_Room]] = {}
+        # Partly occupied rooms first, then in block / floor / number order
+        for room in sorted(rooms, key=lambda r: (r.occupied == 0, r.block, r.floor, r.room_number)):
+            self._queues.setdefault((room.room_type, room.tier), deque()).append(room)
+
+    def take(self, room_types: tuple[RoomType, ...], tiers: tuple[str, ...]) -> _Room | None:
+        for room_type in room_types:
+            for tier in tiers:
+                queue = self._queues.get((room_type, tier))
+                while queue and queue[0].free <= 0:
+                    queue.popleft()
+                if queue:
+                    room = queue[0]
+                    room.taken += 1
+                    return room
+        return None
+
 
 class HostelService:
     """Hostel application business logic."""
 
     @staticmethod
     async def apply(
-        db: AsyncSession, user: User, data: HostelApplicationRequest
+        db: AsyncSession, user: AuthPrincipal, data: HostelApplicationRequest
     ) -> HostelApplicationResponse:
         """Submit a new hostel application."""
         # Check if already applied
@@ -49,12 +136,14 @@ class HostelService:
         )
         db.add(application)
         await db.flush()
+        await AnalyticsService.hostel_status_changed(db, application.university_id, None, application.status)
+        await invalidate_student(db, user.id)
 
         return HostelApplicationResponse.model_validate(application)
 
     @staticmethod
     async def get_status(
-        db: AsyncSession, user: User
+        db: AsyncSession, user: AuthPrincipal
     ) -> HostelApplicationResponse:
         """Get current application status."""
         result = await db.execute(
@@ -71,13 +160,16 @@ class HostelService:
     @staticmethod
     async def allocate(
         db: AsyncSession,
-        admin: User,
+        admin: AuthPrincipal,
         application_id: uuid.UUID,
         data: HostelAllocationRequest,
     ) -> HostelApplicationResponse:
         """Admin: allocate a room to a student."""
         result = await db.execute(
-            select(HostelApplication).where(HostelApplication.id == application_id)
+            select(HostelApplication).where(
+                HostelApplication.id == application_id,
+                HostelApplication.university_id == admin.university_id,
+            )
         )
         application = result.scalar_one_or_none()
         if not application:
@@ -86,13 +178,212 @@ class HostelService:
                 detail="Application not found.",
             )
 
+        # Keep the inventory in step when the allocation names a known room
+        room = None
+        if data.status == ApplicationStatus.ALLOCATED and data.allocated_block and data.allocated_room_number:
+            result = await db.execute(
+                select(HostelRoom)
+                .where(
+                    HostelRoom.university_id == admin.university_id,
+                    HostelRoom.block == data.allocated_block,
+                    HostelRoom.room_number == data.allocated_room_number,
+                )
+                .with_for_update()
+            )
+            room = result.scalar_one_or_none()
+        if application.room_id is not None and (room is None or room.id != application.room_id):
+            await db.execute(
+                update(HostelRoom)
+                .where(HostelRoom.id == application.room_id, HostelRoom.occupied > 0)
+                .values(occupied=HostelRoom.occupied - 1)
+            )
+            application.room_id = None
+        if room is not None and application.room_id != room.id:
+            if room.occupied >= room.capacity:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Room {room.block}-{room.room_number} is full.",
+                )
+            room.occupied += 1
+            application.room_id = room.id
+
+        previous_status = application.status
         application.status = data.status
         application.allocated_room_number = data.allocated_room_number
         application.allocated_block = data.allocated_block
-        application.floor = data.floor
+        application.floor = room.floor if room is not None and data.floor is None else data.floor
         application.admin_notes = data.admin_notes
         application.processed_by = admin.id
         application.processed_at = datetime.now(timezone.utc)
         await db.flush()
+        await AnalyticsService.hostel_status_changed(
+            db, application.university_id, previous_status, application.status,
+        )
+        await invalidate_student(db, application.user_id)
 
         return HostelApplicationResponse.model_validate(application)
+
+    # ── Admin: room inventory ────────────────
+    @staticmethod
+    async def create_rooms(
+        db: AsyncSession, admin: AuthPrincipal, data: HostelRoomBulkCreate
+    ) -> HostelRoomBulkCreateResponse:
+        """Add rooms to the inventory; rooms already listed (same block and number) are skipped."""
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "university_id": admin.university_id,
+                "block": room.block,
+                "floor": room.floor,
+                "room_number": room.room_number,
+                "room_type": room.room_type,
+                "capacity": room.capacity or ROOM_TYPE_CAPACITY[room.room_type],
+                "occupied": 0,
+                "is_accessible": room.is_accessible,
+                "is_active": True,
+            }
+            for room in data.rooms
+        ]
+        created = 0
+        for start in range(0, len(rows), ROOM_INSERT_CHUNK_SIZE):
+            stmt = dialect_insert(db, HostelRoom).values(rows[start:start + ROOM_INSERT_CHUNK_SIZE])
+            stmt = stmt.on_conflict_do_nothing(
+                index_elements=[HostelRoom.university_id, HostelRoom.block, HostelRoom.room_number],
+            )
+            result = await db.execute(stmt.returning(HostelRoom.id))
+            created += len(result.all())
+        return HostelRoomBulkCreateResponse(created=created, skipped=len(rows) - created)
+
+    @staticmethod
+    async def get_inventory(db: AsyncSession, admin: AuthPrincipal) -> HostelInventoryResponse:
+        """Beds and occupancy per block and room type."""
+        result = await db.execute(
+            select(
+                HostelRoom.block,
+                HostelRoom.room_type,
+                func.count().label("rooms"),
+                func.sum(HostelRoom.capacity).label("beds"),
+                func.sum(HostelRoom.occupied).label("occupied"),
+            )
+            .where(HostelRoom.university_id == admin.university_id, HostelRoom.is_active.is_(True))
+            .group_by(HostelRoom.block, HostelRoom.room_type)
+            .order_by(HostelRoom.block, HostelRoom.room_type)
+        )
+        buckets = [
+            HostelInventoryBucket(
+                block=row.block,
+                room_type=row.room_type,
+                rooms=row.rooms,
+                beds=row.beds,
+                occupied=row.occupied,
+                free=row.beds - row.occupied,
+            )
+            for row in result.all()
+        ]
+        total = sum(b.beds for b in buckets)
+        occupied = sum(b.occupied for b in buckets)
+        return HostelInventoryResponse(
+            buckets=buckets, total_beds=total, occupied_beds=occupied, free_beds=total - occupied,
+        )
+
+    # ── Admin: batch allocation ──────────────
+    @staticmethod
+    async def allocate_batch(
+        db: AsyncSession, admin: AuthPrincipal, data: HostelBatchAllocationRequest
+    ) -> HostelBatchAllocationResponse:
+        """Allocate every pending application against the free inventory in one pass."""
+        uni_id = admin.university_id
+        result = await db.execute(
+            select(
+                HostelApplication.id,
+                HostelApplication.user_id,
+                HostelApplication.room_type_preference,
+                HostelApplication.special_requirements,
+            )
+            .where(
+                HostelApplication.university_id == uni_id,
+                HostelApplication.status == ApplicationStatus.PENDING,
+            )
+            .order_by(HostelApplication.created_at, HostelApplication.id)
+            .with_for_update()
+        )
+        applications = result.all()
+
+        result = await db.execute(
+            select(
+                HostelRoom.id, HostelRoom.block, HostelRoom.floor, HostelRoom.room_number,
+                HostelRoom.room_type, HostelRoom.occupied, HostelRoom.capacity, HostelRoom.is_accessible,
+            )
+            .where(
+                HostelRoom.university_id == uni_id,
+                HostelRoom.is_active.is_(True),
+                HostelRoom.occupied < HostelRoom.capacity,
+            )
+            .with_for_update()
+        )
+        pool = _RoomPool([_Room(*row) for row in result.all()])
+
+        # Accessibility needs first; each group stays first-come, first-served
+        queue = sorted(applications, key=lambda a: not needs_accessible_room(a.special_requirements))
+        allocations, unallocated = [], []
+        for app in queue:
+            preferred = app.room_type_preference
+            room = pool.take(
+                ROOM_TYPE_FALLBACK[preferred] if data.allow_other_room_types else (preferred,),
+                _TIERS_NEEDING_ACCESS if needs_accessible_room(app.special_requirements) else _TIERS_DEFAULT,
+            )
+            if room is None:
+                unallocated.append(app.id)
+                continue
+            allocations.append((app, room))
+
+        if allocations and not data.dry_run:
+            now = datetime.now(timezone.utc)
+            await db.execute(
+                update(HostelApplication)
+                .where(HostelApplication.status == ApplicationStatus.PENDING)
+                .execution_options(synchronize_session=False),
+                [
+                    {
+                        "id": app.id,
+                        "status": ApplicationStatus.ALLOCATED,
+                        "room_id": room.id,
+                        "allocated_block": room.block,
+                        "allocated_room_number": room.room_number,
+                        "floor": room.floor,
+                        "admin_notes": data.admin_notes,
+                        "processed_by": admin.id,
+                        "processed_at": now,
+                    }
+                    for app, room in allocations
+                ],
+            )
+            rooms = {room.id: room for _, room in allocations}
+            await db.execute(
+                update(HostelRoom),
+                [{"id": room.id, "occupied": room.occupied + room.taken} for room in rooms.values()],
+            )
+            await AnalyticsService.apply(
+                db, uni_id, hostel_pending=-len(allocations), hostel_allocated=len(allocations),
+            )
+            for app, _ in allocations:
+                await invalidate_student(db, app.user_id)
+
+        return HostelBatchAllocationResponse(
+            allocated=len(allocations),
+            unallocated=len(unallocated),
+            allocations=[
+                HostelBatchAllocation(
+                    application_id=app.id,
+                    user_id=app.user_id,
+                    room_id=room.id,
+                    block=room.block,
+                    floor=room.floor,
+                    room_number=room.room_number,
+                    room_type=room.room_type,
+                )
+                for app, room in allocations
+            ],
+            unallocated_application_ids=unallocated,
+            dry_run=data.dry_run,
+        )
@@ -0,0 +1,368 @@
+"""
+LLM Provider
+
+Pluggable completion backends for the AI assistant:
+- OpenAIProvider: one long-lived AsyncOpenAI client over a pooled HTTP client
+- FakeLLMProvider: deterministic in-process replies for tests and load runs
+
+LLMGateway wraps the configured provider with a per-tenant concurrency
+limit, request timeouts and a circuit breaker. Whenever a call cannot be
+served it raises LLMUnavailable, and the caller answers with the rule-based
+fallback instead of waiting on a struggling upstream.
+"""
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import AsyncIterator
+from typing import NamedTuple
+
+from app.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class LLMUnavailable(Exception):
+    """The gateway could not serve this call (breaker open, tenant saturated, timeout, upstream error)."""
+
+
+class LLMProvider(ABC):
+    """Chat completion backend."""
+
+    name = "abstract"
+
+    @abstractmethod
+    async def complete(self, messages: list[dict], max_tokens: int, temperature: float) -> str: ...
+
+    @abstractmethod
+    def stream(self, messages: list[dict], max_tokens: int, temperature: float) -> AsyncIterator[str]: ...
+
+    async def aclose(self) -> None:
+        return None
+
+
+class OpenAIProvider(LLMProvider):
+    """OpenAI chat completions over a single pooled AsyncOpenAI client (requires the `openai` package)."""
+
+    name = "openai"
+
+    def __init__(self, api_key: str, model: str, timeout: float, max_connections: int):
+        import httpx
+        import openai
+
+        self.model = model
+        self._client = openai.AsyncOpenAI(
+            api_key=api_key,
+            timeout=timeout,
+            max_retries=0,  # the gateway fails over instead of retrying
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                ),
+                timeout=timeout,
+            ),
+        )
+
+    async def complete(self, messages: list[dict], max_tokens: int, temperature: float) -> str:
+        response = await self._client.chat.completions.create(
+            model=self.model, messages=messages, max_tokens=max_tokens, temperature=temperature,
+        )
+        return response.choices[0].message.content or ""
+
+    async def stream(self, messages: list[dict], max_tokens: int, temperature: float) -> AsyncIterator[str]:
+        stream = await self._client.chat.completions.create(
+            model=self.model, messages=messages, max_tokens=max_tokens, temperature=temperature,
+            stream=True,
+        )
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                yield delta
+
+    async def aclose(self) -> None:
+        await self._client.close()
+
+
+class FakeLLMProvider(LLMProvider):
+    """Deterministic stand-in: echoes the last user message after an optional simulated latency."""
+
+    name = "fake"
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def _reply(self, messages: list[dict]) -> str:
+        question = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+        return f"You asked: {question}"
+
+    async def complete(self, messages: list[dict], max_tokens: int, temperature: float) -> str:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._reply(messages)
+
+    async def stream(self, messages: list[dict], max_tokens: int, temperature: float) -> AsyncIterator[str]:
+        self.calls += 1
+        words = self._reply(messages).split(" ")
+        for i, word in enumerate(words):
+            if self.latency:
+                await asyncio.sleep(self.latency / len(words))
+            yield word if i == len(words) - 1 else word + " "
+
+
+class Permit(NamedTuple):
+    """Admission from CircuitBreaker.allow(); hand it back with the call's outcome."""
+
+    generation: int
+    trial: bool = False
+
+
+class CircuitBreaker:
+    """
+    Failure-rate breaker over a sliding window of recent calls.
+
+    Opens once at least `min_calls` outcomes are recorded and the failure
+    rate reaches `failure_rate`. After `cooldown` seconds a single trial
+    call is let through (half-open); its outcome closes or re-opens it.
+
+    Each admitted call carries a Permit. Opening starts a new generation, so
+    a call admitted before the breaker opened that finishes late cannot
+    close it or disturb the trial: its outcome is dropped.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_rate: float, min_calls: int, window: int, cooldown: float):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+        self._generation = 0
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.cooldown:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self) -> Permit | None:
+        """A permit for one call, or None while the breaker rejects calls."""
+        state = self.state
+        if state == self.CLOSED:
+            return Permit(self._generation)
+        if state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return Permit(self._generation, trial=True)
+        return None
+
+    def _is_trial(self, permit: Permit) -> bool:
+        return permit.trial and permit.generation == self._generation and self._trial_in_flight
+
+    def _counts(self, permit: Permit) -> bool:
+        """A regular call admitted since the breaker last closed."""
+        return not permit.trial and permit.generation == self._generation and self._opened_at is None
+
+    def record_success(self, permit: Permit) -> None:
+        if self._is_trial(permit):
+            self._reset()
+        elif self._counts(permit):
+            self._outcomes.append(True)
+
+    def record_failure(self, permit: Permit) -> None:
+        if self._is_trial(permit):
+            # Trial call failed: stay open for another cooldown
+            self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+            return
+        if not self._counts(permit):
+            return
+        self._outcomes.append(False)
+        failures = self._outcomes.count(False)
+        if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.failure_rate:
+            self._opened_at = time.monotonic()
+            self._generation += 1
+            logger.warning("LLM circuit breaker opened (%d/%d recent calls failed)", failures, len(self._outcomes))
+
+    def release_trial(self, permit: Permit) -> None:
+        """Give back a half-open trial slot that was never used for an upstream call."""
+        if self._is_trial(permit):
+            self._trial_in_flight = False
+
+    def _reset(self) -> None:
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._outcomes.clear()
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "recent_calls": len(self._outcomes),
+            "recent_failures": self._outcomes.count(False),
+        }
+
+
+class LLMGateway:
+    """Configured provider behind a per-tenant semaphore, timeouts and a circuit breaker."""
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        tenant_concurrency: int,
+        queue_timeout: float,
+        timeout: float,
+        breaker: CircuitBreaker,
+    ):
+        self.provider = provider
+        self.tenant_concurrency = tenant_concurrency
+        self.queue_timeout = queue_timeout
+        self.timeout = timeout
+        self.breaker = breaker
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._in_flight: dict[str, int] = {}
+        self.rejected = 0
+
+    def _semaphore(self, tenant: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(tenant)
+        if semaphore is None:
+            semaphore = self._semaphores[tenant] = asyncio.Semaphore(self.tenant_concurrency)
+        return semaphore
+
+    async def _acquire(self, tenant: str) -> tuple[Permit, asyncio.Semaphore]:
+        permit = self.breaker.allow()
+        if permit is None:
+            self.rejected += 1
+            raise LLMUnavailable("circuit open")
+        semaphore = self._semaphore(tenant)
+        try:
+            await asyncio.wait_for(semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            self.breaker.release_trial(permit)
+            raise LLMUnavailable(f"tenant {tenant} at concurrency limit")
+        self._in_flight[tenant] = self._in_flight.get(tenant, 0) + 1
+        return permit, semaphore
+
+    def _release(self, tenant: str, semaphore: asyncio.Semaphore) -> None:
+        self._in_flight[tenant] -= 1
+        semaphore.release()
+
+    async def complete(
+        self, tenant: str, messages: list[dict], max_tokens: int = 1024, temperature: float = 0.7
+    ) -> str:
+        permit, semaphore = await self._acquire(tenant)
+        recorded = False
+        try:
+            reply = await asyncio.wait_for(
+                self.provider.complete(messages, max_tokens, temperature), self.timeout
+            )
+            recorded = True
+            self.breaker.record_success(permit)
+            return reply
+        except Exception as exc:
+            recorded = True
+            self.breaker.record_failure(permit)
+            raise LLMUnavailable(f"{self.provider.name} completion failed: {exc!r}") from exc
+        finally:
+            if not recorded:
+                # Caller was cancelled mid-call: no verdict on the upstream
+                self.breaker.release_trial(permit)
+            self._release(tenant, semaphore)
+
+    async def stream(
+        self, tenant: str, messages: list[dict], max_tokens: int = 1024, temperature: float = 0.7
+    ) -> AsyncIterator[str]:
+        """Yield text deltas; `timeout` bounds the wait for each chunk, including the first."""
+        permit, semaphore = await self._acquire(tenant)
+        chunks = self.provider.stream(messages, max_tokens, temperature)
+        recorded = False
+        try:
+            while True:
+                try:
+                    delta = await asyncio.wait_for(anext(chunks), self.timeout)
+                except StopAsyncIteration:
+                    break
+                except Exception as exc:
+                    recorded = True
+                    self.breaker.record_failure(permit)
+                    raise LLMUnavailable(f"{self.provider.name} stream failed: {exc!r}") from exc
+                yield delta
+            recorded = True
+            self.breaker.record_success(permit)
+        finally:
+            if not recorded:
+                # Consumer went away mid-stream: no verdict on the upstream
+                self.breaker.release_trial(permit)
+            self._release(tenant, semaphore)
+            await chunks.aclose()
+
+    def stats(self) -> dict:
+        return {
+            "provider": self.provider.name,
+            "breaker": self.breaker.stats(),
+            "rejected": self.rejected,
+            "tenant_concurrency": self.tenant_concurrency,
+            "tenants_in_flight": {tenant: n for tenant, n in self._in_flight.items() if n},
+        }
+
+
+_gateway: LLMGateway | None = None
+
+
+def _make_provider() -> LLMProvider | None:
+    if settings.LLM_PROVIDER == "fake":
+        return FakeLLMProvider(latency=settings.LLM_FAKE_LATENCY_SECONDS)
+    if settings.LLM_PROVIDER == "openai" and settings.OPENAI_API_KEY:
+        try:
+            return OpenAIProvider(
+                api_key=settings.OPENAI_API_KEY,
+                model=settings.OPENAI_MODEL,
+                timeout=settings.LLM_TIMEOUT_SECONDS,
+                max_connections=settings.LLM_MAX_CONNECTIONS,
+            )
+        except ImportError:
+            logger.warning("LLM_PROVIDER=openai but the 'openai' package is not installed")
+    return None
+
+
+def get_llm() -> LLMGateway | None:
+    """The process-wide gateway, or None when no provider is configured (rule-based replies only)."""
+    global _gateway
+    if _gateway is None:
+        provider = _make_provider()
+        if provider is None:
+            return None
+        _gateway = LLMGateway(
+            provider,
+            tenant_concurrency=settings.LLM_TENANT_CONCURRENCY,
+            queue_timeout=settings.LLM_QUEUE_TIMEOUT_SECONDS,
+            timeout=settings.LLM_TIMEOUT_SECONDS,
+            breaker=CircuitBreaker(
+                failure_rate=settings.LLM_BREAKER_FAILURE_RATE,
+                min_calls=settings.LLM_BREAKER_MIN_CALLS,
+                window=settings.LLM_BREAKER_WINDOW,
+                cooldown=settings.LLM_BREAKER_COOLDOWN_SECONDS,
+            ),
+        )
+    return _gateway
+
+
+def set_llm(gateway: LLMGateway | None) -> None:
+    """Replace the process-wide gateway (tests, load runs)."""
+    global _gateway
+    _gateway = gateway
+
+
+async def close_llm() -> None:
+    global _gateway
+    if _gateway is not None:
+        await _gateway.provider.aclose()
+        _gateway = None
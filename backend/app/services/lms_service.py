@@ -13,6 +13,8 @@ from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.auth.principal import AuthPrincipal
+from app.core.cache import invalidate_student
 from app.models.lms import LMSActivation
 from app.models.user import User
 
@@ -63,6 +65,7 @@ class LMSService:
             )
             db.add(activation)
             await db.flush()
+        await invalidate_student(db, user.id)
 
         return {
             "id": str(activation.id),
@@ -75,7 +78,7 @@ class LMSService:
         }
 
     @staticmethod
-    async def get_status(db: AsyncSession, user: User) -> dict:
+    async def get_status(db: AsyncSession, user: AuthPrincipal) -> dict:
         """Check LMS activation status."""
         result = await db.execute(
             select(LMSActivation).where(LMSActivation.user_id == user.id)
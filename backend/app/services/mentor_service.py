@@ -4,49 +4,178 @@ Mentor Service
 Handles mentor assignments, meetings, and messages.
 """
 
+import asyncio
+import heapq
+import itertools
+import json
+import logging
 import uuid
+from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime, timezone
 
-from fastapi import HTTPException, status
-from sqlalchemy import select, func, and_, or_
+from fastapi import HTTPException, WebSocket, WebSocketDisconnect, status
+from pydantic import ValidationError
+from sqlalchemy import select, func, and_, or_, exists, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.auth.jwt_handler import decode_access_token
+from app.auth.principal import AuthPrincipal, load_principal
+from app.config import get_settings
+from app.core.pubsub import SlowConsumer, get_hub
+from app.database import after_commit, dialect_insert
+from app.models.course import Enrollment, EnrollmentStatus
+from app.models.loaders import LoadProfile, load_options
 from app.models.mentor import MentorAssignment, MentorMeeting, MentorMessage, MeetingStatus
 from app.models.user import User, UserRole
+from app.utils.helpers import decode_cursor, encode_cursor
 from app.schemas.mentor import (
     MentorAssignmentCreate, MentorAssignmentResponse, MentorAssignmentListResponse,
+    MentorBatchAssignRequest, MentorBatchAssignResponse, MentorLoad,
     MeetingCreate, MeetingUpdateStatus, MeetingResponse, MeetingListResponse,
     MessageCreate, MessageResponse, MessageListResponse,
     MentorProfileResponse,
 )
 
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+def _decode_cursor(cursor: str, *types: type) -> tuple:
+    try:
+        return decode_cursor(cursor, *types)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor.")
+
+
+ASSIGNMENT_INSERT_CHUNK_SIZE = 1000  # assignment rows per INSERT
+MENTOR_ROLES = (UserRole.MENTOR, UserRole.ADMIN)  # roles that may take mentees
+
+
+# ── Real-time events ─────────────────────────
+def mentor_channel(assignment_id: uuid.UUID) -> str:
+    return f"mentor:{assignment_id}"
+
+
+def _publish_after_commit(db: AsyncSession, assignment_id: uuid.UUID, event: dict) -> None:
+    """
+    Push `event` to the thread's WebSocket subscribers once the write is
+    committed. Best effort: the write stands even if the broker is down, and
+    clients catch up over REST.
+    """
+
+    async def publish() -> None:
+        try:
+            await get_hub().publish(mentor_channel(assignment_id), event)
+        except Exception:
+            logger.warning("Publishing %s event for assignment %s failed", event["type"], assignment_id, exc_info=True)
+
+    after_commit(db, publish)
+
+
+async def _mark_read(
+    db: AsyncSession, reader_id: uuid.UUID, assignment_id: uuid.UUID, up_to: datetime | None = None
+) -> int:
+    """Mark the other side's unread messages (up to `up_to`) as read in one UPDATE."""
+    query = update(MentorMessage).where(
+        MentorMessage.assignment_id == assignment_id,
+        MentorMessage.is_read == False,
+        MentorMessage.sender_id != reader_id,
+    )
+    if up_to is not None:
+        query = query.where(MentorMessage.created_at <= up_to)
+    result = await db.execute(query.values(is_read=True).execution_options(synchronize_session=False))
+    if result.rowcount:
+        _publish_after_commit(db, assignment_id, {
+            "type": "read",
+            "reader_id": str(reader_id),
+            "up_to": (up_to or datetime.now(timezone.utc)).isoformat(),
+        })
+    return result.rowcount
+
+
+@dataclass
+class MentorSlot:
+    """A mentor's capacity and load during batch matching."""
+
+    id: uuid.UUID
+    name: str
+    capacity: int
+    load: int  # active students, including those matched so far
+    courses: frozenset[uuid.UUID] = frozenset()  # empty: covers any course
+    assigned: int = 0
+
+
+def match_mentors(
+    students: list[tuple[uuid.UUID, uuid.UUID | None]], mentors: list[MentorSlot]
+) -> dict[uuid.UUID, uuid.UUID]:
+    """
+    Greedy heap balancing of (student_id, course_id) pairs over mentors.
+
+    Each student goes to the eligible mentor with the lowest load relative to
+    capacity, preferring mentors who cover the student's course over those
+    who take any course. One min-heap per course; entries whose load has
+    changed since they were pushed (the mentor took students from another
+    course) are refreshed lazily. Returns student_id -> mentor_id.
+    """
+    by_course: dict[uuid.UUID | None, list[uuid.UUID]] = defaultdict(list)
+    for student_id, course_id in students:
+        by_course[course_id].append(student_id)
+
+    order = itertools.count()
+    matches = {}
+    # Largest courses first: they have the most to spread
+    for course_id, student_ids in sorted(by_course.items(), key=lambda item: -len(item[1])):
+        heap = [
+            (0 if course_id in m.courses else 1, m.load / m.capacity, m.load, next(order), i)
+            for i, m in enumerate(mentors)
+            if course_id in m.courses or not m.courses
+        ]
+        heapq.heapify(heap)
+        for student_id in student_ids:
+            while heap:
+                tier, _, load, _, i = heap[0]
+                mentor = mentors[i]
+                if mentor.load >= mentor.capacity:
+                    heapq.heappop(heap)
+                elif load != mentor.load:
+                    heapq.heapreplace(heap, (tier, mentor.load / mentor.capacity, mentor.load, next(order), i))
+                else:
+                    break
+            if not heap:
+                break  # nobody left for this course
+            mentor.load += 1
+            mentor.assigned += 1
+            matches[student_id] = mentor.id
+            heapq.heapreplace(heap, (tier, mentor.load / mentor.capacity, mentor.load, next(order), i))
+    return matches
+
 
 class MentorService:
     """Mentoring system business logic."""
 
     # ── Admin: assign mentor ─────────────────
     @staticmethod
-    async def assign_mentor(db: AsyncSession, admin: User, data: MentorAssignmentCreate) -> MentorAssignmentResponse:
-        # Verify student exists
-        student = await db.execute(select(User).where(User.id == data.student_id, User.university_id == admin.university_id))
-        student = student.scalar_one_or_none()
-        if not student:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found")
-
-        # Verify mentor exists
-        mentor = await db.execute(select(User).where(User.id == data.mentor_id, User.university_id == admin.university_id))
-        mentor = mentor.scalar_one_or_none()
-        if not mentor:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mentor not found")
-
-        # Check existing active assignment
-        existing = await db.execute(
-            select(MentorAssignment).where(
-                MentorAssignment.student_id == data.student_id,
-                MentorAssignment.is_active == True,
+    async def assign_mentor(db: AsyncSession, admin: AuthPrincipal, data: MentorAssignmentCreate) -> MentorAssignmentResponse:
+        # Student, mentor and the student's active-assignment flag in one query
+        has_mentor = exists().where(
+            MentorAssignment.student_id == User.id,
+            MentorAssignment.is_active == True,
+        )
+        result = await db.execute(
+            select(User, has_mentor.label("has_mentor")).where(
+                User.id.in_([data.student_id, data.mentor_id]),
+                User.university_id == admin.university_id,
             )
         )
-        if existing.scalar_one_or_none():
+        users = {user.id: (user, flag) for user, flag in result.all()}
+        if data.student_id not in users:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found")
+        if data.mentor_id not in users:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mentor not found")
+        student, student_has_mentor = users[data.student_id]
+        mentor, _ = users[data.mentor_id]
+        if student_has_mentor:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Student already has an active mentor")
 
         assignment = MentorAssignment(
@@ -66,10 +195,109 @@ class MentorService:
         resp.student_email = student.email
         return resp
 
+    @staticmethod
+    async def assign_batch(
+        db: AsyncSession, admin: AuthPrincipal, data: MentorBatchAssignRequest
+    ) -> MentorBatchAssignResponse:
+        """Spread every student without an active mentor across mentors, written in one bulk insert."""
+        uni_id = admin.university_id
+        default_capacity = data.default_capacity or settings.MENTOR_DEFAULT_CAPACITY
+
+        # Explicit mentors must pass the same role rule as the default pool
+        specs = {m.mentor_id: m for m in data.mentors} if data.mentors is not None else {}
+        mentor_filter = User.role.in_(MENTOR_ROLES)
+        if data.mentors is not None:
+            mentor_filter = and_(mentor_filter, User.id.in_(specs))
+        active_load = (
+            select(func.count())
+            .where(MentorAssignment.mentor_id == User.id, MentorAssignment.is_active == True)
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            select(User.id, User.first_name, User.last_name, active_load.label("load"))
+            .where(mentor_filter, User.university_id == uni_id, User.is_active == True)
+            .order_by(User.id)
+        )
+        mentors = []
+        for row in result.all():
+            spec = specs.get(row.id)
+            mentors.append(MentorSlot(
+                id=row.id,
+                name=f"{row.first_name} {row.last_name}",
+                capacity=(spec.capacity if spec and spec.capacity else default_capacity),
+                load=row.load,
+                courses=frozenset(spec.course_ids) if spec else frozenset(),
+            ))
+        if data.mentors is not None and len(mentors) != len(specs):
+            ineligible = sorted(str(i) for i in set(specs) - {m.id for m in mentors})
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Not active mentors in this university: {', '.join(ineligible)}",
+            )
+        if not mentors:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No mentors to assign students to")
+
+        # Unassigned students with their (earliest) course, oldest accounts first
+        course = (
+            select(Enrollment.course_id)
+            .where(Enrollment.user_id == User.id, Enrollment.status == EnrollmentStatus.ACTIVE)
+            .order_by(Enrollment.enrolled_at)
+            .limit(1)
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            select(User.id, course.label("course_id"))
+            .where(
+                User.university_id == uni_id,
+                User.role == UserRole.STUDENT,
+                User.is_active == True,
+                ~exists().where(MentorAssignment.student_id == User.id, MentorAssignment.is_active == True),
+            )
+            .order_by(User.created_at, User.id)
+        )
+        students = [(row.id, row.course_id) for row in result.all()]
+        matches = match_mentors(students, mentors)
+
+        if matches and not data.dry_run:
+            now = datetime.now(timezone.utc)
+            rows = [
+                {
+                    "id": uuid.uuid4(),
+                    "student_id": student_id,
+                    "mentor_id": mentor_id,
+                    "university_id": uni_id,
+                    "is_active": True,
+                    "assigned_at": now,
+                }
+                for student_id, mentor_id in matches.items()
+            ]
+            for start in range(0, len(rows), ASSIGNMENT_INSERT_CHUNK_SIZE):
+                stmt = dialect_insert(db, MentorAssignment).values(rows[start:start + ASSIGNMENT_INSERT_CHUNK_SIZE])
+                # A student returning to a former mentor reactivates the old row
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[MentorAssignment.student_id, MentorAssignment.mentor_id],
+                    set_={"is_active": True, "assigned_at": stmt.excluded.assigned_at, "updated_at": func.now()},
+                )
+                await db.execute(stmt)
+
+        return MentorBatchAssignResponse(
+            assigned=len(matches),
+            unassigned_student_ids=[student_id for student_id, _ in students if student_id not in matches],
+            mentors=[
+                MentorLoad(
+                    mentor_id=m.id, mentor_name=m.name, capacity=m.capacity, students=m.load, assigned=m.assigned,
+                )
+                for m in mentors
+            ],
+            dry_run=data.dry_run,
+        )
+
     @staticmethod
     async def list_assignments(db: AsyncSession, university_id: uuid.UUID) -> MentorAssignmentListResponse:
         result = await db.execute(
-            select(MentorAssignment).where(
+            select(MentorAssignment)
+            .options(*load_options(MentorAssignment, LoadProfile.ADMIN_LIST))
+            .where(
                 MentorAssignment.university_id == university_id,
                 MentorAssignment.is_active == True,
             ).order_by(MentorAssignment.assigned_at.desc())
@@ -88,7 +316,7 @@ class MentorService:
         return MentorAssignmentListResponse(assignments=items, total=len(items))
 
     @staticmethod
-    async def deactivate_assignment(db: AsyncSession, admin: User, assignment_id: uuid.UUID) -> dict:
+    async def deactivate_assignment(db: AsyncSession, admin: AuthPrincipal, assignment_id: uuid.UUID) -> dict:
         result = await db.execute(
             select(MentorAssignment).where(
                 MentorAssignment.id == assignment_id,
@@ -104,9 +332,11 @@ class MentorService:
 
     # ── Student: get my mentor ───────────────
     @staticmethod
-    async def get_my_mentor(db: AsyncSession, user: User) -> MentorProfileResponse:
+    async def get_my_mentor(db: AsyncSession, user: AuthPrincipal) -> MentorProfileResponse:
         result = await db.execute(
-            select(MentorAssignment).where(
+            select(MentorAssignment)
+            .options(*load_options(MentorAssignment, LoadProfile.DETAIL))
+            .where(
                 MentorAssignment.student_id == user.id,
                 MentorAssignment.is_active == True,
             )
@@ -127,7 +357,9 @@ class MentorService:
 
         # Upcoming meetings
         upcoming_result = await db.execute(
-            select(MentorMeeting).where(
+            select(MentorMeeting)
+            .options(*load_options(MentorMeeting, LoadProfile.DASHBOARD))
+            .where(
                 MentorMeeting.assignment_id == assignment.id,
                 MentorMeeting.status.in_([MeetingStatus.REQUESTED, MeetingStatus.APPROVED]),
             ).order_by(MentorMeeting.meeting_date)
@@ -156,14 +388,31 @@ class MentorService:
 
     # ── Mentor: get assigned students ────────
     @staticmethod
-    async def get_my_students(db: AsyncSession, user: User) -> MentorAssignmentListResponse:
+    async def get_my_students(db: AsyncSession, user: AuthPrincipal) -> MentorAssignmentListResponse:
         result = await db.execute(
-            select(MentorAssignment).where(
+            select(MentorAssignment)
+            .options(*load_options(MentorAssignment, LoadProfile.ADMIN_LIST))
+            .where(
                 MentorAssignment.mentor_id == user.id,
                 MentorAssignment.is_active == True,
             ).order_by(MentorAssignment.assigned_at.desc())
         )
         assignments = result.scalars().all()
+
+        # Unread counts for every thread in one grouped query over ix_mentor_messages_unread
+        unread: dict[uuid.UUID, int] = {}
+        if assignments:
+            counts = await db.execute(
+                select(MentorMessage.assignment_id, func.count())
+                .where(
+                    MentorMessage.assignment_id.in_([a.id for a in assignments]),
+                    MentorMessage.is_read == False,
+                    MentorMessage.sender_id != user.id,
+                )
+                .group_by(MentorMessage.assignment_id)
+            )
+            unread = dict(counts.all())
+
         items = []
         for a in assignments:
             resp = MentorAssignmentResponse.model_validate(a)
@@ -173,12 +422,13 @@ class MentorService:
             if a.mentor:
                 resp.mentor_name = f"{a.mentor.first_name} {a.mentor.last_name}"
                 resp.mentor_email = a.mentor.email
+            resp.unread_messages = unread.get(a.id, 0)
             items.append(resp)
         return MentorAssignmentListResponse(assignments=items, total=len(items))
 
     # ── Meetings ─────────────────────────────
     @staticmethod
-    async def book_meeting(db: AsyncSession, user: User, data: MeetingCreate) -> MeetingResponse:
+    async def book_meeting(db: AsyncSession, user: AuthPrincipal, data: MeetingCreate) -> MeetingResponse:
         # Get assignment
         result = await db.execute(
             select(MentorAssignment).where(
@@ -211,9 +461,11 @@ class MentorService:
         return resp
 
     @staticmethod
-    async def update_meeting_status(db: AsyncSession, user: User, meeting_id: uuid.UUID, data: MeetingUpdateStatus) -> MeetingResponse:
+    async def update_meeting_status(db: AsyncSession, user: AuthPrincipal, meeting_id: uuid.UUID, data: MeetingUpdateStatus) -> MeetingResponse:
         result = await db.execute(
-            select(MentorMeeting).where(
+            select(MentorMeeting)
+            .options(*load_options(MentorMeeting, LoadProfile.DETAIL))
+            .where(
                 MentorMeeting.id == meeting_id,
                 or_(MentorMeeting.mentor_id == user.id, MentorMeeting.student_id == user.id),
             )
@@ -228,7 +480,7 @@ class MentorService:
         if data.meeting_link:
             meeting.meeting_link = data.meeting_link
         await db.flush()
-        await db.refresh(meeting)
+        await db.refresh(meeting, ["status", "notes", "meeting_link", "updated_at"])
         resp = MeetingResponse.model_validate(meeting)
         if meeting.mentor:
             resp.mentor_name = f"{meeting.mentor.first_name} {meeting.mentor.last_name}"
@@ -237,9 +489,11 @@ class MentorService:
         return resp
 
     @staticmethod
-    async def list_meetings(db: AsyncSession, user: User) -> MeetingListResponse:
+    async def list_meetings(db: AsyncSession, user: AuthPrincipal) -> MeetingListResponse:
         result = await db.execute(
-            select(MentorMeeting).where(
+            select(MentorMeeting)
+            .options(*load_options(MentorMeeting, LoadProfile.ADMIN_LIST))
+            .where(
                 or_(MentorMeeting.mentor_id == user.id, MentorMeeting.student_id == user.id)
             ).order_by(MentorMeeting.meeting_date.desc())
         )
@@ -259,58 +513,177 @@ class MentorService:
     async def send_message(db: AsyncSession, user: User, assignment_id: uuid.UUID, data: MessageCreate) -> MessageResponse:
         # Verify user is part of assignment
         result = await db.execute(
-            select(MentorAssignment).where(
+            select(MentorAssignment.id).where(
                 MentorAssignment.id == assignment_id,
                 or_(MentorAssignment.student_id == user.id, MentorAssignment.mentor_id == user.id),
             )
         )
-        assignment = result.scalar_one_or_none()
-        if not assignment:
+        if result.scalar_one_or_none() is None:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not part of this assignment")
 
+        # Timestamp assigned here so messages in the same second keep their order
         message = MentorMessage(
             id=uuid.uuid4(),
             assignment_id=assignment_id,
             sender_id=user.id,
             content=data.content,
+            is_read=False,
+            created_at=datetime.now(timezone.utc),
         )
         db.add(message)
         await db.flush()
-        await db.refresh(message)
         resp = MessageResponse.model_validate(message)
         resp.sender_name = f"{user.first_name} {user.last_name}"
+        _publish_after_commit(db, assignment_id, {"type": "message", "message": resp.model_dump(mode="json")})
         return resp
 
     @staticmethod
-    async def get_messages(db: AsyncSession, user: User, assignment_id: uuid.UUID) -> MessageListResponse:
-        # Verify user is part of assignment
+    async def get_messages(
+        db: AsyncSession,
+        user: AuthPrincipal,
+        assignment_id: uuid.UUID,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> MessageListResponse:
+        """
+        Most recent messages of a thread (oldest first); pass next_cursor back
+        to page towards the start. Loading the latest page marks the other
+        side's messages up to it as read.
+        """
         result = await db.execute(
-            select(MentorAssignment).where(
+            select(MentorAssignment.id).where(
                 MentorAssignment.id == assignment_id,
                 or_(MentorAssignment.student_id == user.id, MentorAssignment.mentor_id == user.id),
             )
         )
-        if not result.scalar_one_or_none():
+        if result.scalar_one_or_none() is None:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not part of this assignment")
 
-        # Mark messages as read
-        msg_result = await db.execute(
-            select(MentorMessage).where(
-                MentorMessage.assignment_id == assignment_id,
-            ).order_by(MentorMessage.created_at)
+        query = (
+            select(
+                MentorMessage.id,
+                MentorMessage.assignment_id,
+                MentorMessage.sender_id,
+                MentorMessage.content,
+                MentorMessage.is_read,
+                MentorMessage.created_at,
+                User.first_name,
+                User.last_name,
+            )
+            .join(User, User.id == MentorMessage.sender_id)
+            .where(MentorMessage.assignment_id == assignment_id)
         )
-        messages = msg_result.scalars().all()
+        if cursor:
+            created_at, message_id = _decode_cursor(cursor, datetime, uuid.UUID)
+            query = query.where(
+                or_(
+                    MentorMessage.created_at < created_at,
+                    and_(MentorMessage.created_at == created_at, MentorMessage.id < message_id),
+                )
+            )
+        result = await db.execute(
+            query.order_by(MentorMessage.created_at.desc(), MentorMessage.id.desc()).limit(limit + 1)
+        )
+        rows = result.all()
 
-        # Mark others' messages as read
-        for m in messages:
-            if m.sender_id != user.id and not m.is_read:
-                m.is_read = True
-        await db.flush()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
 
-        items = []
-        for m in messages:
-            resp = MessageResponse.model_validate(m)
-            if m.sender:
-                resp.sender_name = f"{m.sender.first_name} {m.sender.last_name}"
-            items.append(resp)
-        return MessageListResponse(messages=items, total=len(items))
+        # Read receipts: one UPDATE for everything up to the newest message shown
+        marked = False
+        if rows and cursor is None:
+            marked = await _mark_read(db, user.id, assignment_id, up_to=rows[0].created_at) > 0
+
+        items = [
+            MessageResponse(
+                id=row.id,
+                assignment_id=row.assignment_id,
+                sender_id=row.sender_id,
+                content=row.content,
+                is_read=row.is_read or (marked and row.sender_id != user.id),
+                sender_name=f"{row.first_name} {row.last_name}",
+                created_at=row.created_at,
+            )
+            for row in reversed(rows)
+        ]
+        return MessageListResponse(messages=items, total=len(items), next_cursor=next_cursor)
+
+    # ── Real-time thread ─────────────────────
+    @staticmethod
+    async def serve_socket(
+        websocket: WebSocket, unit_of_work, assignment_id: uuid.UUID, token: str
+    ) -> None:
+        """
+        Live thread over a WebSocket. Pushes {"type": "message"} and {"type": "read"}
+        events; accepts {"type": "message", "content": ...} and {"type": "read"}.
+        Each inbound action runs in its own short transaction and is fanned out
+        through the hub after commit, so REST and socket writers share one path.
+        """
+        payload = decode_access_token(token)
+        try:
+            user_id = uuid.UUID(payload["sub"]) if payload else None
+        except (KeyError, TypeError, ValueError):
+            user_id = None
+        async with unit_of_work() as db:
+            principal = await load_principal(db, user_id) if user_id else None
+            member = None
+            if principal is not None and principal.is_active:
+                result = await db.execute(
+                    select(MentorAssignment.id).where(
+                        MentorAssignment.id == assignment_id,
+                        or_(MentorAssignment.student_id == principal.id, MentorAssignment.mentor_id == principal.id),
+                    )
+                )
+                member = result.scalar_one_or_none()
+        if member is None:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+
+        await websocket.accept()
+        async with get_hub().subscribe(mentor_channel(assignment_id)) as subscription:
+
+            async def push() -> None:
+                try:
+                    async for event in subscription:
+                        await websocket.send_json(event)
+                except SlowConsumer:
+                    # Too far behind: the client reconnects and reloads the thread over REST
+                    await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+
+            async def receive() -> None:
+                while True:
+                    try:
+                        event = json.loads(await websocket.receive_text())
+                        kind = event.get("type")
+                        if kind == "message":
+                            data = MessageCreate.model_validate(event)
+                            async with unit_of_work() as db:
+                                user = await db.get(User, principal.id)
+                                if user is None or not user.is_active:
+                                    # Removed or deactivated since the socket opened
+                                    await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+                                    return
+                                await MentorService.send_message(db, user, assignment_id, data)
+                        elif kind == "read":
+                            async with unit_of_work() as db:
+                                await _mark_read(db, principal.id, assignment_id)
+                        else:
+                            await websocket.send_json({"type": "error", "detail": "Unknown event type"})
+                    except HTTPException as exc:
+                        await websocket.send_json({"type": "error", "detail": exc.detail})
+                    except (ValueError, AttributeError, ValidationError):
+                        await websocket.send_json({"type": "error", "detail": "Invalid event"})
+
+            tasks = [asyncio.create_task(push()), asyncio.create_task(receive())]
+            try:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    exc = task.exception()
+                    if exc is not None and not isinstance(exc, WebSocketDisconnect):
+                        raise exc
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
@@ -11,9 +11,10 @@ from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.auth.principal import AuthPrincipal
 from app.models.onboarding import ChecklistItem, OnboardingChecklist
-from app.models.user import User
 from app.schemas.onboarding import ChecklistItemUpdate, OnboardingProgressResponse
+from app.services.analytics_service import AnalyticsService
 
 DEFAULT_CHECKLIST_ITEMS = [
     {"title": "Complete Profile", "description": "Fill in your personal information", "category": "profile", "order": 1, "is_required": True},
@@ -32,7 +33,7 @@ class OnboardingService:
 
     @staticmethod
     async def get_progress(
-        db: AsyncSession, user: User
+        db: AsyncSession, user: AuthPrincipal
     ) -> OnboardingProgressResponse:
         """Get onboarding checklist and progress for a student."""
         result = await db.execute(
@@ -63,7 +64,7 @@ class OnboardingService:
 
     @staticmethod
     async def update_item(
-        db: AsyncSession, user: User, item_id: uuid.UUID, data: ChecklistItemUpdate
+        db: AsyncSession, user: AuthPrincipal, item_id: uuid.UUID, data: ChecklistItemUpdate
     ) -> OnboardingProgressResponse:
         """Update a single checklist item and recalculate progress."""
         # Get checklist
@@ -104,10 +105,15 @@ class OnboardingService:
         completed = sum(1 for i in all_items if i.is_completed)
         progress = int((completed / total) * 100) if total > 0 else 0
 
+        was_completed = checklist.is_completed
         checklist.overall_progress = progress
         checklist.is_completed = progress == 100
         checklist.completed_at = datetime.now(timezone.utc) if progress == 100 else None
         await db.flush()
+        await AnalyticsService.apply(
+            db, checklist.university_id,
+            onboarding_completed=int(checklist.is_completed) - int(bool(was_completed)),
+        )
 
         # Reload items
         items_result = await db.execute(
@@ -128,7 +134,7 @@ class OnboardingService:
 
     @staticmethod
     async def create_default_checklist(
-        db: AsyncSession, user: User
+        db: AsyncSession, user: AuthPrincipal
     ) -> OnboardingChecklist:
         """Create default onboarding checklist for a new student."""
         checklist = OnboardingChecklist(
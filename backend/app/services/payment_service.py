@@ -13,9 +13,12 @@ from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.auth.principal import AuthPrincipal
+from app.core.cache import invalidate_student
 from app.models.payment import Payment, PaymentStatus
 from app.models.user import User
 from app.schemas.payment import PaymentInitiateRequest, PaymentListResponse, PaymentResponse
+from app.services.analytics_service import AnalyticsService
 
 
 class PaymentService:
@@ -23,7 +26,7 @@ class PaymentService:
 
     @staticmethod
     async def initiate(
-        db: AsyncSession, user: User, data: PaymentInitiateRequest
+        db: AsyncSession, user: AuthPrincipal, data: PaymentInitiateRequest
     ) -> PaymentResponse:
         """Create payment record and simulate payment processing."""
         payment = Payment(
@@ -39,11 +42,13 @@ class PaymentService:
         )
         db.add(payment)
         await db.flush()
+        await AnalyticsService.apply(db, payment.university_id, payments_pending=1)
+        await invalidate_student(db, user.id)
         return PaymentResponse.model_validate(payment)
 
     @staticmethod
     async def verify(
-        db: AsyncSession, user: User, payment_id: uuid.UUID
+        db: AsyncSession, user: AuthPrincipal, payment_id: uuid.UUID
     ) -> PaymentResponse:
         """Simulate payment verification — marks payment as completed."""
         result = await db.execute(
@@ -70,11 +75,15 @@ class PaymentService:
         payment.transaction_id = f"TXN-{uuid.uuid4().hex[:12].upper()}"
         payment.paid_at = datetime.now(timezone.utc)
         await db.flush()
+        await AnalyticsService.apply(
+            db, payment.university_id, payments_pending=-1, payments_revenue=payment.amount,
+        )
+        await invalidate_student(db, user.id)
 
         return PaymentResponse.model_validate(payment)
 
     @staticmethod
-    async def list_by_user(db: AsyncSession, user: User) -> PaymentListResponse:
+    async def list_by_user(db: AsyncSession, user: AuthPrincipal) -> PaymentListResponse:
         """List all payments for a user."""
         result = await db.execute(
             select(Payment)
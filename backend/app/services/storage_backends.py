@@ -0,0 +1,266 @@
+"""
+Storage Backends
+
+Object storage behind one async interface:
+- SupabaseStorage: the Storage REST API over one long-lived pooled httpx client
+- SupabaseSDKStorage: the synchronous Supabase SDK, run in a dedicated thread
+  pool so its blocking calls never stall the event loop
+- LocalStorage: files under a directory, served only through the
+  authenticated document file endpoint
+
+STORAGE_BACKEND picks one ("auto": Supabase REST when credentials are set,
+local otherwise). The instance is process-wide and closed on shutdown.
+"""
+
+import asyncio
+import logging
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import aiofiles
+import aiofiles.os
+import httpx
+
+from app.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Local uploads directory
+LOCAL_UPLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "uploads")
+
+
+class StorageBackend(ABC):
+    """Put, delete and sign objects addressed by (bucket, path)."""
+
+    name = "abstract"
+
+    @abstractmethod
+    async def put(self, bucket: str, path: str, chunks: AsyncIterator[bytes], content_type: str) -> str:
+        """Store the streamed body at `path`; returns the object's URL."""
+
+    @abstractmethod
+    async def delete(self, bucket: str, path: str) -> bool:
+        """Remove an object; returns False if there was nothing to remove."""
+
+    @abstractmethod
+    async def sign(self, bucket: str, path: str, expires_in: int) -> str:
+        """A time-limited URL for a private object."""
+
+    async def sign_many(self, bucket: str, paths: list[str], expires_in: int) -> dict[str, str]:
+        """Signed URLs for several objects; backends with a batch call override this."""
+        urls = await asyncio.gather(*(self.sign(bucket, path, expires_in) for path in paths))
+        return dict(zip(paths, urls))
+
+    async def aclose(self) -> None:
+        return None
+
+
+class SupabaseStorage(StorageBackend):
+    """Supabase Storage REST API over a single pooled AsyncClient."""
+
+    name = "supabase"
+
+    def __init__(
+        self,
+        url: str,
+        service_key: str,
+        timeout: float,
+        max_connections: int,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.url = url.rstrip("/")
+        self._client = httpx.AsyncClient(
+            base_url=f"{self.url}/storage/v1",
+            headers={"Authorization": f"Bearer {service_key}", "apikey": service_key},
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=timeout,
+            transport=transport,
+        )
+
+    async def put(self, bucket: str, path: str, chunks: AsyncIterator[bytes], content_type: str) -> str:
+        # Chunked transfer: the body is sent as it is read, never buffered whole
+        response = await self._client.post(
+            f"/object/{bucket}/{path}",
+            content=chunks,
+            headers={"Content-Type": content_type, "x-upsert": "false"},
+        )
+        response.raise_for_status()
+        return f"{self.url}/storage/v1/object/public/{bucket}/{path}"
+
+    async def delete(self, bucket: str, path: str) -> bool:
+        response = await self._client.request("DELETE", f"/object/{bucket}", json={"prefixes": [path]})
+        response.raise_for_status()
+        return bool(response.json())
+
+    async def sign(self, bucket: str, path: str, expires_in: int) -> str:
+        response = await self._client.post(f"/object/sign/{bucket}/{path}", json={"expiresIn": expires_in})
+        response.raise_for_status()
+        return f"{self.url}/storage/v1{response.json()['signedURL']}"
+
+    async def sign_many(self, bucket: str, paths: list[str], expires_in: int) -> dict[str, str]:
+        response = await self._client.post(f"/object/sign/{bucket}", json={"expiresIn": expires_in, "paths": paths})
+        response.raise_for_status()
+        return {
+            item["path"]: f"{self.url}/storage/v1{item['signedURL']}"
+            for item in response.json()
+            if item.get("signedURL")
+        }
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+class SupabaseSDKStorage(StorageBackend):
+    """
+    The synchronous Supabase SDK (one client for the process), with every call
+    offloaded to a bounded thread pool. Uploads are spooled to a temp file
+    chunk by chunk, since the SDK only takes a whole file.
+    """
+
+    name = "supabase-sdk"
+
+    def __init__(self, client, threads: int):
+        self._client = client
+        self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="storage-sdk")
+
+    async def _run(self, fn, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, partial(fn, *args, **kwargs))
+
+    async def put(self, bucket: str, path: str, chunks: AsyncIterator[bytes], content_type: str) -> str:
+        fd, spool = tempfile.mkstemp(prefix="upload-")
+        os.close(fd)
+        try:
+            async with aiofiles.open(spool, "wb") as f:
+                async for chunk in chunks:
+                    await f.write(chunk)
+            bucket_api = self._client.storage.from_(bucket)
+            await self._run(bucket_api.upload, path=path, file=spool, file_options={"content-type": content_type})
+            return await self._run(bucket_api.get_public_url, path)
+        finally:
+            os.remove(spool)
+
+    async def delete(self, bucket: str, path: str) -> bool:
+        removed = await self._run(self._client.storage.from_(bucket).remove, [path])
+        return bool(removed)
+
+    async def sign(self, bucket: str, path: str, expires_in: int) -> str:
+        result = await self._run(self._client.storage.from_(bucket).create_signed_url, path, expires_in)
+        return result.get("signedURL") or result.get("signedUrl", "")
+
+    async def sign_many(self, bucket: str, paths: list[str], expires_in: int) -> dict[str, str]:
+        results = await self._run(self._client.storage.from_(bucket).create_signed_urls, paths, expires_in)
+        return {item["path"]: item["signedURL"] for item in results if item.get("signedURL")}
+
+    async def aclose(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+class LocalStorage(StorageBackend):
+    """Files under `root`, one directory tree shared by all buckets."""
+
+    name = "local"
+
+    def __init__(self, root: str = LOCAL_UPLOAD_DIR):
+        self.root = root
+
+    def local_path(self, path: str) -> str:
+        return os.path.join(self.root, path.replace("/", os.sep))
+
+    async def put(self, bucket: str, path: str, chunks: AsyncIterator[bytes], content_type: str) -> str:
+        """Write chunk by chunk to a temp file, moved into place only once complete."""
+        local_path = self.local_path(path)
+        await aiofiles.os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        partial_path = f"{local_path}.part"
+        try:
+            async with aiofiles.open(partial_path, "wb") as f:
+                async for chunk in chunks:
+                    await f.write(chunk)
+            await aiofiles.os.replace(partial_path, local_path)
+        except BaseException:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+        # Marks the object as local; clients reach it via the document endpoint
+        return f"/uploads/{path}"
+
+    async def delete(self, bucket: str, path: str) -> bool:
+        try:
+            await aiofiles.os.remove(self.local_path(path))
+        except FileNotFoundError:
+            return False
+        return True
+
+    async def sign(self, bucket: str, path: str, expires_in: int) -> str:
+        return ""  # no public URLs: local files are served by the document endpoint
+
+    async def sign_many(self, bucket: str, paths: list[str], expires_in: int) -> dict[str, str]:
+        return {}
+
+
+# ── Process-wide backend ─────────────────────────────────
+_backend: StorageBackend | None = None
+_fallback: LocalStorage | None = None
+
+
+def _supabase_configured() -> bool:
+    return bool(
+        settings.SUPABASE_URL
+        and settings.SUPABASE_URL.startswith("https://")
+        and settings.SUPABASE_SERVICE_ROLE_KEY
+    )
+
+
+def _make_backend() -> StorageBackend:
+    choice = settings.STORAGE_BACKEND
+    if choice == "auto":
+        choice = "supabase" if _supabase_configured() else "local"
+    if choice == "supabase":
+        return SupabaseStorage(
+            settings.SUPABASE_URL,
+            settings.SUPABASE_SERVICE_ROLE_KEY,
+            timeout=settings.UPLOAD_TIMEOUT_SECONDS,
+            max_connections=settings.STORAGE_MAX_CONNECTIONS,
+        )
+    if choice == "supabase-sdk":
+        try:
+            from supabase import create_client
+        except ImportError:
+            logger.warning("STORAGE_BACKEND=supabase-sdk but the 'supabase' package is not installed")
+        else:
+            client = create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_ROLE_KEY)
+            return SupabaseSDKStorage(client, threads=settings.STORAGE_SDK_THREADS)
+    return get_fallback_storage()
+
+
+def get_storage() -> StorageBackend:
+    """The process-wide storage backend."""
+    global _backend
+    if _backend is None:
+        _backend = _make_backend()
+    return _backend
+
+
+def get_fallback_storage() -> LocalStorage:
+    """Local storage, used when the remote backend fails."""
+    global _fallback
+    if _fallback is None:
+        _fallback = LocalStorage()
+    return _fallback
+
+
+def set_storage(backend: StorageBackend | None, fallback: LocalStorage | None = None) -> None:
+    """Replace the process-wide backends (tests, load runs)."""
+    global _backend, _fallback
+    _backend, _fallback = backend, fallback
+
+
+async def close_storage() -> None:
+    global _backend
+    if _backend is not None:
+        await _backend.aclose()
+        _backend = None
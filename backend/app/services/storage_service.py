@@ -1,19 +1,43 @@
 """
 Storage Service
 
-Handles file upload/download operations.
-Uses Supabase Storage when configured, falls back to local file storage.
+Handles file upload/download operations on the configured storage backend
+(see storage_backends), falling back to local file storage on failure.
+
+Uploads are streamed: the file is read UPLOAD_CHUNK_SIZE bytes at a time,
+hashed (SHA-256) and size-checked as it goes, and each chunk is written
+straight to the destination, so an upload never sits in memory whole and an
+oversized one is rejected at the first chunk past MAX_FILE_SIZE.
+
+Documents are stored content-addressed (StoredBlob): a re-upload of content
+the university already holds only bumps the blob's reference count, and
+the file is removed once its last reference is deleted. A new file whose
+transaction rolls back is removed too, so no object outlives a failed upload.
+
+Signed URLs are cached per (bucket, path) and reused until shortly before
+they expire; a page of documents is signed with one batch call for whatever
+the cache does not already hold.
 """
 
-import os
+import hashlib
+import logging
+import time
 import uuid
+from collections.abc import AsyncIterator
+from typing import NamedTuple
 
-import aiofiles
 from fastapi import HTTPException, UploadFile, status
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
+from app.core.cache import Cache, get_cache
+from app.database import after_commit, after_rollback, dialect_insert
+from app.models.document import StoredBlob
+from app.services.storage_backends import get_fallback_storage, get_storage
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 ALLOWED_MIME_TYPES = {
     "application/pdf",
@@ -23,23 +47,102 @@ ALLOWED_MIME_TYPES = {
 }
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5 MB
 
-# Local uploads directory (fallback)
-LOCAL_UPLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "uploads")
 
+class StoredFile(NamedTuple):
+    """Result of an upload."""
+
+    url: str
+    path: str  # object path within the bucket / upload dir
+    size: int
+    sha256: str
 
-def _supabase_available() -> bool:
-    """Check if Supabase credentials are properly configured."""
-    return bool(
-        settings.SUPABASE_URL
-        and settings.SUPABASE_URL.startswith("https://")
-        and settings.SUPABASE_SERVICE_ROLE_KEY
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"File size exceeds maximum of {MAX_FILE_SIZE // (1024 * 1024)}MB.",
     )
 
 
-def _get_supabase_client():
-    """Create a Supabase client with service role key for privileged ops."""
-    from supabase import create_client
-    return create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_ROLE_KEY)
+class _UploadStream:
+    """Reads an UploadFile in chunks, tracking its size and SHA-256 on the way."""
+
+    def __init__(self, file: UploadFile):
+        self.file = file
+        self.size = 0
+        self._digest = hashlib.sha256()
+
+    @property
+    def sha256(self) -> str:
+        return self._digest.hexdigest()
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        """Yield the file from the start; raises once MAX_FILE_SIZE is passed."""
+        await self.file.seek(0)
+        self.size, self._digest = 0, hashlib.sha256()
+        while chunk := await self.file.read(settings.UPLOAD_CHUNK_SIZE):
+            self.size += len(chunk)
+            if self.size > MAX_FILE_SIZE:
+                raise _too_large()
+            self._digest.update(chunk)
+            yield chunk
+
+    async def measure(self) -> None:
+        """Read through once for size and hash, storing nothing."""
+        async for _ in self.chunks():
+            pass
+
+
+def _validate(file: UploadFile) -> None:
+    if file.content_type not in ALLOWED_MIME_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File type '{file.content_type}' not allowed. Accepted: PDF, JPG, PNG.",
+        )
+    # Reject up front when the multipart parser already knows the size
+    if file.size is not None and file.size > MAX_FILE_SIZE:
+        raise _too_large()
+
+
+def _extension(file: UploadFile) -> str:
+    return file.filename.rsplit(".", 1)[-1] if file.filename and "." in file.filename else "bin"
+
+
+async def _write(stream: _UploadStream, bucket: str, path: str, content_type: str) -> str:
+    """Stream to the storage backend, falling back to local storage; returns the URL."""
+    backend, fallback = get_storage(), get_fallback_storage()
+    if backend is not fallback:
+        try:
+            return await backend.put(bucket, path, stream.chunks(), content_type)
+        except HTTPException:
+            raise
+        except Exception:
+            pass  # Fall through to local storage
+
+    try:
+        return await fallback.put(bucket, path, stream.chunks(), content_type)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to upload file: {str(e)}",
+        )
+
+
+async def _remove_object(path: str, bucket: str) -> bool:
+    backend, fallback = get_storage(), get_fallback_storage()
+    if backend is not fallback:
+        try:
+            if await backend.delete(bucket, path):
+                return True
+        except Exception:
+            pass
+    return await fallback.delete(bucket, path)
+
+
+def _signed_url_cache() -> Cache:
+    return get_cache("signed_urls", max_entries=settings.SIGNED_URL_CACHE_MAX_ENTRIES)
 
 
 class StorageService:
@@ -48,95 +151,166 @@ class StorageService:
     @staticmethod
     async def upload_file(
         file: UploadFile, path: str, bucket: str | None = None
-    ) -> tuple[str, int]:
+    ) -> StoredFile:
         """
-        Upload a file. Returns (public_url, file_size).
+        Stream a file to a fresh name under `path`.
         Tries Supabase first; falls back to local storage on failure.
         """
         bucket = bucket or settings.SUPABASE_STORAGE_BUCKET
+        _validate(file)
+        object_path = f"{path}/{uuid.uuid4().hex}.{_extension(file)}"
+        stream = _UploadStream(file)
+        url = await _write(stream, bucket, object_path, file.content_type)
+        return StoredFile(url, object_path, stream.size, stream.sha256)
 
-        # Validate file type
-        if file.content_type not in ALLOWED_MIME_TYPES:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"File type '{file.content_type}' not allowed. Accepted: PDF, JPG, PNG.",
-            )
+    @staticmethod
+    async def store_blob(
+        db: AsyncSession, file: UploadFile, university_id: uuid.UUID, bucket: str | None = None
+    ) -> StoredFile:
+        """
+        Store a file content-addressed within the university and take a
+        reference to it. Content already held is not uploaded again.
+        """
+        bucket = bucket or settings.SUPABASE_STORAGE_BUCKET
+        _validate(file)
+        stream = _UploadStream(file)
+        await stream.measure()
+        content_hash = stream.sha256
 
-        # Read and validate size
-        contents = await file.read()
-        file_size = len(contents)
-        if file_size > MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"File size exceeds maximum of {MAX_FILE_SIZE // (1024 * 1024)}MB.",
-            )
+        # Known content: just take another reference
+        result = await db.execute(
+            update(StoredBlob)
+            .where(StoredBlob.university_id == university_id, StoredBlob.content_hash == content_hash)
+            .values(ref_count=StoredBlob.ref_count + 1)
+            .returning(StoredBlob.file_url, StoredBlob.storage_path)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.one_or_none()
+        if row is not None:
+            return StoredFile(row.file_url, row.storage_path, stream.size, content_hash)
 
-        # Generate unique filename
-        ext = file.filename.rsplit(".", 1)[-1] if file.filename and "." in file.filename else "bin"
-        unique_name = f"{uuid.uuid4().hex}.{ext}"
-        unique_path = f"{path}/{unique_name}"
-
-        # Try Supabase first
-        if _supabase_available():
-            try:
-                client = _get_supabase_client()
-                client.storage.from_(bucket).upload(
-                    path=unique_path,
-                    file=contents,
-                    file_options={"content-type": file.content_type},
-                )
-                public_url = client.storage.from_(bucket).get_public_url(unique_path)
-                return public_url, file_size
-            except Exception:
-                pass  # Fall through to local storage
+        # New content. The random suffix keeps a re-upload from ever landing on
+        # a path whose removal (after its last reference went) is still pending.
+        object_path = f"{university_id}/blobs/{content_hash[:2]}/{content_hash}-{uuid.uuid4().hex[:8]}.{_extension(file)}"
+        url = await _write(stream, bucket, object_path, file.content_type)
 
-        # Local file storage fallback
-        try:
-            local_dir = os.path.join(LOCAL_UPLOAD_DIR, path.replace("/", os.sep))
-            os.makedirs(local_dir, exist_ok=True)
-            local_path = os.path.join(local_dir, unique_name)
-
-            async with aiofiles.open(local_path, "wb") as f:
-                await f.write(contents)
-
-            # Return a URL that the backend can serve
-            public_url = f"/uploads/{unique_path}"
-            return public_url, file_size
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to upload file: {str(e)}",
-            )
+        async def discard() -> None:
+            await _remove_object(object_path, bucket)
+
+        # The object exists before its row does: drop it if the row never commits
+        after_rollback(db, discard)
+        stmt = dialect_insert(db, StoredBlob).values(
+            id=uuid.uuid4(),
+            university_id=university_id,
+            content_hash=content_hash,
+            storage_path=object_path,
+            file_url=url,
+            file_size=stream.size,
+            mime_type=file.content_type,
+            ref_count=1,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[StoredBlob.university_id, StoredBlob.content_hash],
+            set_={"ref_count": StoredBlob.ref_count + 1},
+        ).returning(StoredBlob.file_url, StoredBlob.storage_path)
+        row = (await db.execute(stmt)).one()
+        if row.storage_path != object_path:
+            # A concurrent upload of the same content got there first
+            await _remove_object(object_path, bucket)
+        return StoredFile(row.file_url, row.storage_path, stream.size, content_hash)
 
     @staticmethod
-    async def delete_file(path: str, bucket: str | None = None) -> bool:
-        """Delete a file from storage."""
+    async def delete_file(
+        db: AsyncSession, university_id: uuid.UUID, content_hash: str, bucket: str | None = None
+    ) -> bool:
+        """
+        Drop one reference to a blob. The row goes with the last reference and
+        the file is removed once that commits. Returns True if it was the last.
+        """
         bucket = bucket or settings.SUPABASE_STORAGE_BUCKET
+        result = await db.execute(
+            update(StoredBlob)
+            .where(StoredBlob.university_id == university_id, StoredBlob.content_hash == content_hash)
+            .values(ref_count=StoredBlob.ref_count - 1)
+            .returning(StoredBlob.id, StoredBlob.ref_count, StoredBlob.storage_path)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.one_or_none()
+        if row is None or row.ref_count > 0:
+            return False
 
-        # Try Supabase
-        if _supabase_available():
-            try:
-                client = _get_supabase_client()
-                client.storage.from_(bucket).remove([path])
-                return True
-            except Exception:
-                pass
+        await db.execute(
+            delete(StoredBlob)
+            .where(StoredBlob.id == row.id, StoredBlob.ref_count <= 0)
+            .execution_options(synchronize_session=False)
+        )
 
-        # Try local
-        local_path = os.path.join(LOCAL_UPLOAD_DIR, path.replace("/", os.sep))
-        if os.path.exists(local_path):
-            os.remove(local_path)
-            return True
-        return False
+        async def remove() -> None:
+            await _remove_object(row.storage_path, bucket)
 
+        after_commit(db, remove)
+        return True
+
+    # ── Signed URLs ──────────────────────────────────────
     @staticmethod
-    async def get_signed_url(path: str, expires_in: int = 3600) -> str:
+    async def get_signed_urls(
+        paths: list[str], expires_in: int | None = None, bucket: str | None = None
+    ) -> dict[str, str]:
+        """
+        Time-limited URLs for private files, keyed by path. Cached URLs are
+        reused while they have more than the refresh margin left; the rest are
+        signed in a single backend call.
+        """
+        bucket = bucket or settings.SUPABASE_STORAGE_BUCKET
+        expires_in = expires_in or settings.SIGNED_URL_EXPIRES_SECONDS
+        margin = min(settings.SIGNED_URL_REFRESH_MARGIN_SECONDS, expires_in // 2)
+        cache = _signed_url_cache()
+        now = time.time()
+
+        urls: dict[str, str] = {}
+        missing = []
+        for path in dict.fromkeys(paths):
+            entry = await cache.get(f"{bucket}/{path}")
+            if entry is not None and entry["expires_at"] - now >= margin:
+                urls[path] = entry["url"]
+            else:
+                missing.append(path)
+
+        if missing:
+            signed = await get_storage().sign_many(bucket, missing, expires_in)
+            for path, url in signed.items():
+                urls[path] = url
+                await cache.set(
+                    f"{bucket}/{path}", {"url": url, "expires_at": now + expires_in}, ttl=expires_in - margin,
+                )
+        return urls
+
+    @staticmethod
+    async def get_signed_url(path: str, expires_in: int | None = None, bucket: str | None = None) -> str:
         """Get a time-limited signed URL for a private file."""
-        if _supabase_available():
-            client = _get_supabase_client()
-            result = client.storage.from_(
-                settings.SUPABASE_STORAGE_BUCKET
-            ).create_signed_url(path, expires_in)
-            return result.get("signedURL", "")
-        # For local files, just return the path
-        return f"/uploads/{path}"
+        urls = await StorageService.get_signed_urls([path], expires_in, bucket)
+        return urls.get(path, "")
+
+    @staticmethod
+    async def sign_blobs(
+        db: AsyncSession, university_id: uuid.UUID, content_hashes: list[str]
+    ) -> dict[str, str]:
+        """
+        Signed URLs for a page of documents, keyed by content hash. Storage
+        errors leave the affected documents out rather than failing the page.
+        """
+        if not content_hashes:
+            return {}
+        result = await db.execute(
+            select(StoredBlob.content_hash, StoredBlob.storage_path).where(
+                StoredBlob.university_id == university_id,
+                StoredBlob.content_hash.in_(set(content_hashes)),
+            )
+        )
+        paths = dict(result.all())
+        try:
+            urls = await StorageService.get_signed_urls(list(paths.values()))
+        except Exception:
+            logger.warning("Signing document URLs failed", exc_info=True)
+            return {}
+        return {content_hash: urls[path] for content_hash, path in paths.items() if path in urls}
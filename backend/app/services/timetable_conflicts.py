@@ -0,0 +1,126 @@
+"""
+Timetable conflict detection.
+
+Sweep-line over slots sorted by start time, per (day, resource): a min-heap
+holds the end times of slots still in progress, so each slot is compared only
+with the slots it actually overlaps. Finding conflicts is O(n log n) plus the
+number of conflicts reported, instead of comparing every pair of schedules.
+"""
+
+import heapq
+import uuid
+from collections import defaultdict
+from collections.abc import Callable, Hashable, Iterable
+from dataclasses import dataclass
+from datetime import time
+
+
+@dataclass(frozen=True)
+class Slot:
+    """One weekly schedule entry, reduced to what conflict checks need."""
+
+    schedule_id: uuid.UUID
+    subject_id: uuid.UUID
+    subject_code: str
+    day: str
+    start: time
+    end: time
+    room: str | None = None
+    instructor: str | None = None
+
+
+@dataclass(frozen=True)
+class Conflict:
+    kind: str  # "room" | "instructor" | "student"
+    day: str
+    first: Slot
+    second: Slot
+    resource: str | None = None
+    students_affected: int | None = None
+
+    @property
+    def overlap(self) -> tuple[time, time]:
+        return max(self.first.start, self.second.start), min(self.first.end, self.second.end)
+
+
+def normalize_resource(value: str | None) -> str | None:
+    """Room / instructor names compare case- and whitespace-insensitively."""
+    if value is None:
+        return None
+    value = " ".join(value.split()).lower()
+    return value or None
+
+
+def overlaps(a_start: time, a_end: time, b_start: time, b_end: time) -> bool:
+    """Half-open intervals: a class ending at 10:00 does not clash with one starting at 10:00."""
+    return a_start < b_end and b_start < a_end
+
+
+def overlapping_pairs(slots: Iterable[Slot]) -> Iterable[tuple[Slot, Slot]]:
+    """Yield every overlapping pair among slots of a single day."""
+    active: list[tuple[time, int, Slot]] = []  # (end, tie-breaker, slot)
+    for i, slot in enumerate(sorted(slots, key=lambda s: (s.start, s.end))):
+        while active and active[0][0] <= slot.start:
+            heapq.heappop(active)
+        for _, _, other in active:
+            yield other, slot
+        heapq.heappush(active, (slot.end, i, slot))
+
+
+def _resource_conflicts(
+    slots: Iterable[Slot], kind: str, resource_of: Callable[[Slot], str | None]
+) -> list[Conflict]:
+    groups: dict[tuple[str, Hashable], list[Slot]] = defaultdict(list)
+    for slot in slots:
+        resource = normalize_resource(resource_of(slot))
+        if resource is not None:
+            groups[(slot.day, resource)].append(slot)
+    conflicts = []
+    for (day, _), group in groups.items():
+        if len(group) < 2:
+            continue
+        for first, second in overlapping_pairs(group):
+            conflicts.append(Conflict(kind, day, first, second, resource=resource_of(first)))
+    return conflicts
+
+
+def room_conflicts(slots: Iterable[Slot]) -> list[Conflict]:
+    """Two schedules booking the same room at overlapping times on the same day."""
+    return _resource_conflicts(slots, "room", lambda s: s.room)
+
+
+def instructor_conflicts(slots: Iterable[Slot]) -> list[Conflict]:
+    """One instructor teaching two overlapping schedules on the same day."""
+    return _resource_conflicts(slots, "instructor", lambda s: s.instructor)
+
+
+def subject_clashes(slots: Iterable[Slot]) -> list[Conflict]:
+    """Overlapping slots of different subjects (a clash for anyone taking both)."""
+    by_day: dict[str, list[Slot]] = defaultdict(list)
+    for slot in slots:
+        by_day[slot.day].append(slot)
+    clashes = []
+    for day, group in by_day.items():
+        for first, second in overlapping_pairs(group):
+            if first.subject_id != second.subject_id:
+                clashes.append(Conflict("student", day, first, second))
+    return clashes
+
+
+def student_clashes(
+    slots: Iterable[Slot], enrollments: dict[frozenset[uuid.UUID], int]
+) -> list[Conflict]:
+    """
+    Subject clashes that actually affect students.
+    `enrollments` maps each distinct enrolled subject set to how many students
+    hold it, so students sharing a subject set are checked once.
+    """
+    affected = []
+    for clash in subject_clashes(slots):
+        pair = (clash.first.subject_id, clash.second.subject_id)
+        students = sum(n for subjects, n in enrollments.items() if pair[0] in subjects and pair[1] in subjects)
+        if students:
+            affected.append(Conflict(
+                "student", clash.day, clash.first, clash.second, students_affected=students,
+            ))
+    return affected
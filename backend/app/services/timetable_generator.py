@@ -0,0 +1,333 @@
+"""
+Timetable generator.
+
+Places each subject's weekly sessions on a grid of (day, period) cells so no
+room, instructor or student is double-booked, and every session sits in the
+smallest free room that seats its enrolment (best-fit packing).
+
+Sessions are placed most-constrained first. Each one takes the first feasible
+cell, preferring days where the subject's students have the fewest classes.
+At a dead end the search backtracks chronologically, within a step budget.
+When the budget runs out, the rest is finished greedily and anything still
+unplaceable is reported. Occupancy is kept as bitmasks, so a feasibility
+check is a handful of integer ANDs:
+- rooms and instructors: one mask of busy periods per day
+- students: one mask of the subjects sitting in each cell, ANDed with the
+  subject's conflict mask (subjects sharing at least one student)
+
+Several randomised attempts can run in a process pool; the best wins.
+"""
+
+import random
+import time
+import uuid
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from datetime import time as dtime
+
+
+@dataclass(frozen=True)
+class Room:
+    name: str
+    capacity: int
+
+
+@dataclass(frozen=True)
+class SubjectDemand:
+    """One subject to schedule: `sessions` one-period classes on distinct days."""
+
+    subject_id: uuid.UUID
+    code: str
+    sessions: int
+    students: int = 0
+    instructor: str | None = None
+
+
+@dataclass(frozen=True)
+class FixedSlot:
+    """An existing schedule the generator must work around."""
+
+    subject_id: uuid.UUID
+    day: str
+    start: dtime
+    end: dtime
+    room: str | None = None
+    instructor: str | None = None
+
+
+@dataclass(frozen=True)
+class TimetableProblem:
+    subjects: list[SubjectDemand]
+    rooms: list[Room]
+    days: list[str]
+    day_start: dtime
+    day_end: dtime
+    period_minutes: int
+    # Subject sets that must not overlap (students' enrolments, cohorts)
+    conflict_groups: list[frozenset[uuid.UUID]] = field(default_factory=list)
+    fixed: list[FixedSlot] = field(default_factory=list)
+
+    @property
+    def periods(self) -> int:
+        minutes = (self.day_end.hour * 60 + self.day_end.minute) - (self.day_start.hour * 60 + self.day_start.minute)
+        return max(minutes // self.period_minutes, 0)
+
+    def period_bounds(self, period: int) -> tuple[dtime, dtime]:
+        start = datetime.combine(datetime.min, self.day_start) + timedelta(minutes=period * self.period_minutes)
+        return start.time(), (start + timedelta(minutes=self.period_minutes)).time()
+
+    def periods_covering(self, start: dtime, end: dtime) -> range:
+        """Grid periods that overlap [start, end)."""
+        origin = self.day_start.hour * 60 + self.day_start.minute
+        first = (start.hour * 60 + start.minute - origin) // self.period_minutes
+        last = -(-(end.hour * 60 + end.minute - origin) // self.period_minutes)
+        return range(max(first, 0), min(last, self.periods))
+
+
+@dataclass(frozen=True)
+class Placement:
+    subject_id: uuid.UUID
+    day: str
+    start: dtime
+    end: dtime
+    room: str
+    instructor: str | None
+
+
+@dataclass
+class GeneratedTimetable:
+    placements: list[Placement]
+    unplaced: dict[uuid.UUID, int]  # subject_id -> sessions that found no cell
+    sessions_requested: int
+    room_utilization: float  # seated students / seats offered, over placed sessions
+    attempts: int
+    elapsed_ms: int
+
+
+def _key(name: str) -> str:
+    return " ".join(name.split()).lower()
+
+
+class _Grid:
+    """Occupancy bitmasks for one search attempt."""
+
+    def __init__(self, problem: TimetableProblem, index: dict[uuid.UUID, int]):
+        days, periods = len(problem.days), problem.periods
+        self.rooms = sorted(problem.rooms, key=lambda r: (r.capacity, r.name))  # best-fit order
+        self.room_busy = {_key(r.name): [0] * days for r in self.rooms}
+        self.instructor_busy: dict[str, list[int]] = {}
+        self.cell_subjects = [[0] * periods for _ in range(days)]
+        self.subject_days: dict[int, int] = {}
+        self.day_load = [[0] * days for _ in range(len(index))]  # per subject: classes its students have that day
+
+    def instructor(self, name: str) -> list[int]:
+        busy = self.instructor_busy.get(name)
+        if busy is None:
+            busy = self.instructor_busy[name] = [0] * len(self.cell_subjects)
+        return busy
+
+    def occupy(self, subject: int, day: int, periods: range, room: str | None, instructor: str | None) -> None:
+        mask = 0
+        for p in periods:
+            mask |= 1 << p
+            self.cell_subjects[day][p] |= 1 << subject
+        if room is not None and room in self.room_busy:
+            self.room_busy[room][day] |= mask
+        if instructor is not None:
+            self.instructor(instructor)[day] |= mask
+        self.subject_days[subject] = self.subject_days.get(subject, 0) | (1 << day)
+
+    def release(self, subject: int, day: int, period: int, room: str, instructor: str | None) -> None:
+        bit = ~(1 << period)
+        self.cell_subjects[day][period] &= ~(1 << subject)
+        self.room_busy[room][day] &= bit
+        if instructor is not None:
+            self.instructor_busy[instructor][day] &= bit
+        self.subject_days[subject] &= ~(1 << day)
+
+
+class _Search:
+    def __init__(self, problem: TimetableProblem, seed: int):
+        self.problem = problem
+        self.rng = random.Random(seed)
+        self.index = {s.subject_id: i for i, s in enumerate(problem.subjects)}
+        for slot in problem.fixed:
+            self.index.setdefault(slot.subject_id, len(self.index))
+
+        # Conflict masks: subjects sharing a student (or a cohort) never overlap
+        self.neighbours = [0] * len(self.index)
+        for group in problem.conflict_groups:
+            members = [self.index[s] for s in group if s in self.index]
+            mask = 0
+            for i in members:
+                mask |= 1 << i
+            for i in members:
+                self.neighbours[i] |= mask
+        for i in range(len(self.neighbours)):
+            self.neighbours[i] &= ~(1 << i)
+
+        self.grid = _Grid(problem, self.index)
+        for slot in problem.fixed:
+            if slot.day not in problem.days:
+                continue
+            subject, day = self.index[slot.subject_id], problem.days.index(slot.day)
+            self.grid.occupy(
+                subject, day, problem.periods_covering(slot.start, slot.end),
+                _key(slot.room) if slot.room else None,
+                _key(slot.instructor) if slot.instructor else None,
+            )
+            self._load(subject, day, +1)
+
+    def _load(self, subject: int, day: int, delta: int) -> None:
+        mask = self.neighbours[subject] | (1 << subject)
+        while mask:
+            low = mask & -mask
+            self.grid.day_load[low.bit_length() - 1][day] += delta
+            mask ^= low
+
+    def _sessions(self) -> list[SubjectDemand]:
+        """One entry per session, most constrained first (random tie-break per attempt)."""
+        days = len(self.problem.days)
+        jitter = {s.subject_id: self.rng.random() for s in self.problem.subjects}
+        ordered = sorted(
+            self.problem.subjects,
+            key=lambda s: (
+                -self.neighbours[self.index[s.subject_id]].bit_count(),
+                -s.students,
+                -min(s.sessions, days),
+                jitter[s.subject_id],
+            ),
+        )
+        return [s for s in ordered for _ in range(min(s.sessions, days))]
+
+    def _candidates(self, demand: SubjectDemand) -> list[tuple[int, int, str]]:
+        """Feasible (day, period, room) cells, least-loaded days first."""
+        grid, subject = self.grid, self.index[demand.subject_id]
+        instructor = _key(demand.instructor) if demand.instructor else None
+        taken_days = grid.subject_days.get(subject, 0)
+        neighbours = self.neighbours[subject]
+        busy_teacher = grid.instructor_busy.get(instructor) if instructor else None
+
+        days = [d for d in range(len(self.problem.days)) if not taken_days >> d & 1]
+        self.rng.shuffle(days)
+        days.sort(key=lambda d: grid.day_load[subject][d])
+
+        rooms = [r for r in grid.rooms if r.capacity >= demand.students]
+        cells = []
+        for day in days:
+            teacher_mask = busy_teacher[day] if busy_teacher else 0
+            for period in range(self.problem.periods):
+                bit = 1 << period
+                if teacher_mask & bit or grid.cell_subjects[day][period] & neighbours:
+                    continue
+                for room in rooms:
+                    name = _key(room.name)
+                    if not grid.room_busy[name][day] & bit:
+                        cells.append((day, period, name))
+                        break
+        return cells
+
+    def run(self, budget: int) -> tuple[list[tuple[SubjectDemand, tuple[int, int, str]]], list[SubjectDemand]]:
+        order = self._sessions()
+        n = len(order)
+        options: list[list | None] = [None] * n
+        cursor = [0] * n
+        chosen: list[tuple[int, int, str] | None] = [None] * n
+        skipped = [False] * n
+        steps, i = 0, 0
+
+        while i < n:
+            demand = order[i]
+            subject = self.index[demand.subject_id]
+            instructor = _key(demand.instructor) if demand.instructor else None
+            if chosen[i] is not None:
+                # Back here after a dead end further on: undo and try the next cell
+                day, period, room = chosen[i]
+                self.grid.release(subject, day, period, room, instructor)
+                self._load(subject, day, -1)
+                chosen[i] = None
+            if options[i] is None:
+                options[i], cursor[i] = self._candidates(demand), 0
+
+            if cursor[i] < len(options[i]):
+                day, period, room = chosen[i] = options[i][cursor[i]]
+                cursor[i] += 1
+                self.grid.occupy(subject, day, range(period, period + 1), room, instructor)
+                self._load(subject, day, +1)
+                i += 1
+            elif steps < budget and i > 0 and not skipped[i - 1]:
+                options[i] = None
+                i -= 1
+            else:
+                skipped[i] = True
+                i += 1
+            steps += 1
+
+        placed = [(order[k], chosen[k]) for k in range(n) if chosen[k] is not None]
+        return placed, [order[k] for k in range(n) if skipped[k]]
+
+
+def _attempt(args: tuple[TimetableProblem, int, int]) -> tuple[list[Placement], dict[uuid.UUID, int], float]:
+    problem, seed, budget = args
+    placed, unplaced = _Search(problem, seed).run(budget)
+
+    capacity = {_key(r.name): r for r in problem.rooms}
+    placements, seated, seats = [], 0, 0
+    for demand, (day, period, room) in placed:
+        start, end = problem.period_bounds(period)
+        placements.append(Placement(
+            subject_id=demand.subject_id,
+            day=problem.days[day],
+            start=start,
+            end=end,
+            room=capacity[room].name,
+            instructor=demand.instructor,
+        ))
+        seated += demand.students
+        seats += capacity[room].capacity
+
+    missing: dict[uuid.UUID, int] = {}
+    for demand in unplaced:
+        missing[demand.subject_id] = missing.get(demand.subject_id, 0) + 1
+    return placements, missing, (seated / seats if seats else 0.0)
+
+
+def generate_timetable(
+    problem: TimetableProblem, attempts: int = 1, pool: Executor | None = None, budget: int = 20000
+) -> GeneratedTimetable:
+    """
+    Run `attempts` randomised searches (spread over `pool` when given) and
+    keep the one with the fewest unplaced sessions, then the best room fit.
+    """
+    started = time.perf_counter()
+    jobs = [(problem, seed, budget) for seed in range(max(attempts, 1))]
+    best = None
+    tried = 0
+
+    def better(result) -> bool:
+        return best is None or (sum(result[1].values()), -result[2]) < (sum(best[1].values()), -best[2])
+
+    if pool is not None and len(jobs) > 1:
+        for result in pool.map(_attempt, jobs):
+            tried += 1
+            if better(result):
+                best = result
+    else:
+        for job in jobs:
+            result = _attempt(job)
+            tried += 1
+            if better(result):
+                best = result
+            if not best[1]:
+                break  # complete timetable; further attempts only tweak room fit
+
+    placements, unplaced, utilization = best
+    return GeneratedTimetable(
+        placements=sorted(placements, key=lambda p: (problem.days.index(p.day), p.start, p.room)),
+        unplaced=unplaced,
+        sessions_requested=sum(min(s.sessions, len(problem.days)) for s in problem.subjects),
+        room_utilization=round(utilization, 3),
+        attempts=tried,
+        elapsed_ms=int((time.perf_counter() - started) * 1000),
+    )
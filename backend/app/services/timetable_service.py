@@ -2,30 +2,183 @@
 Timetable Service
 
 Manages subject schedules and generates weekly timetable views.
+
+Rendered weekly timetables are cached per university and set of enrolled
+subjects, so students with the same subjects share one entry. Keys carry
+the university's timetable token; any schedule or subject change bumps it.
 """
 
+import asyncio
+import hashlib
+import threading
 import uuid
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import delete, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.course import Enrollment, EnrollmentStatus
+from app.auth.principal import AuthPrincipal
+from app.config import get_settings
+from app.core.cache import get_cache, invalidate_timetable, state_token, timetable_scope
+from app.models.loaders import LoadProfile, load_options
+from app.models.course import Enrollment, EnrollmentStatus, Subject
 from app.models.timetable import SubjectSchedule, DayOfWeek
-from app.models.user import User
 from app.schemas.timetable import (
     ScheduleCreate, ScheduleUpdate, ScheduleResponse, ScheduleListResponse,
     TimetableEntry, TimetableDayResponse, WeeklyTimetableResponse,
+    ScheduleConflict, TimetableValidationResponse,
+    TimetableGenerateRequest, TimetableGenerateResponse, GeneratedSchedule, UnplacedSubject,
+)
+from app.services.timetable_conflicts import (
+    Conflict, Slot, instructor_conflicts, normalize_resource, room_conflicts,
+    student_clashes, subject_clashes,
+)
+from app.services.timetable_generator import (
+    FixedSlot, Room, SubjectDemand, TimetableProblem, generate_timetable,
 )
 
+settings = get_settings()
+
+DAYS_ORDER = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday"]
+
+# ── Generator process pool ───────────────────────────────
+_generator_pool: ProcessPoolExecutor | None = None
+_generator_pool_lock = threading.Lock()
+
+
+def _get_generator_pool() -> ProcessPoolExecutor:
+    """
+    One pool per process, created on first use. Workers are spawned, not
+    forked: the pool is started from a worker thread of a process that holds
+    an event loop, sockets and locks, none of which a fork can safely copy.
+    """
+    global _generator_pool
+    with _generator_pool_lock:
+        if _generator_pool is None:
+            _generator_pool = ProcessPoolExecutor(
+                max_workers=settings.TIMETABLE_GENERATOR_MAX_WORKERS, mp_context=get_context("spawn"),
+            )
+        return _generator_pool
+
+
+def close_generator_pool() -> None:
+    global _generator_pool
+    with _generator_pool_lock:
+        if _generator_pool is not None:
+            _generator_pool.shutdown(wait=False, cancel_futures=True)
+            _generator_pool = None
+
+
+def _slot_query():
+    """Schedule columns needed for conflict checks, with the subject code."""
+    return select(
+        SubjectSchedule.id,
+        SubjectSchedule.subject_id,
+        Subject.code,
+        SubjectSchedule.day_of_week,
+        SubjectSchedule.start_time,
+        SubjectSchedule.end_time,
+        SubjectSchedule.room,
+        SubjectSchedule.instructor,
+    ).join(Subject, Subject.id == SubjectSchedule.subject_id)
+
+
+def _slot(row) -> Slot:
+    return Slot(
+        schedule_id=row.id,
+        subject_id=row.subject_id,
+        subject_code=row.code,
+        day=row.day_of_week.value,
+        start=row.start_time,
+        end=row.end_time,
+        room=row.room,
+        instructor=row.instructor,
+    )
+
+
+def _conflict_response(conflict: Conflict) -> ScheduleConflict:
+    overlap_start, overlap_end = conflict.overlap
+    return ScheduleConflict(
+        kind=conflict.kind,
+        day=conflict.day,
+        resource=conflict.resource,
+        schedule_ids=[conflict.first.schedule_id, conflict.second.schedule_id],
+        subject_codes=[conflict.first.subject_code, conflict.second.subject_code],
+        overlap_start=overlap_start,
+        overlap_end=overlap_end,
+        students_affected=conflict.students_affected,
+    )
+
+
+def _subject_set_key(subject_ids: list[uuid.UUID]) -> str:
+    return hashlib.sha1(",".join(sorted(str(s) for s in subject_ids)).encode()).hexdigest()
+
 
 class TimetableService:
     """Subject schedule & timetable generation."""
 
+    @staticmethod
+    async def _get_schedule(db: AsyncSession, schedule_id: uuid.UUID) -> SubjectSchedule:
+        """Re-read a schedule after a write, with its subject label loaded."""
+        result = await db.execute(
+            select(SubjectSchedule)
+            .options(*load_options(SubjectSchedule, LoadProfile.DETAIL))
+            .where(SubjectSchedule.id == schedule_id)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one()
+
     # ── Admin: manage schedules ──────────────
     @staticmethod
-    async def create_schedule(db: AsyncSession, admin: User, data: ScheduleCreate) -> ScheduleResponse:
+    async def _check_conflicts(db: AsyncSession, university_id: uuid.UUID, candidate: Slot) -> None:
+        """Reject a slot that double-books a room or instructor (409 with the clashing schedules)."""
+        if candidate.end <= candidate.start:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="end_time must be after start_time")
+        room = normalize_resource(candidate.room)
+        instructor = normalize_resource(candidate.instructor)
+        if room is None and instructor is None:
+            return
+
+        # Only schedules overlapping the candidate's time window on that day
+        result = await db.execute(
+            _slot_query().where(
+                SubjectSchedule.university_id == university_id,
+                SubjectSchedule.day_of_week == DayOfWeek(candidate.day),
+                SubjectSchedule.start_time < candidate.end,
+                SubjectSchedule.end_time > candidate.start,
+                SubjectSchedule.id != candidate.schedule_id,
+            )
+        )
+        conflicts = []
+        for other in map(_slot, result.all()):
+            if room is not None and normalize_resource(other.room) == room:
+                conflicts.append(Conflict("room", candidate.day, candidate, other, resource=candidate.room))
+            if instructor is not None and normalize_resource(other.instructor) == instructor:
+                conflicts.append(Conflict("instructor", candidate.day, candidate, other, resource=candidate.instructor))
+        if conflicts:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={
+                    "message": "Schedule conflicts with existing bookings",
+                    "conflicts": [_conflict_response(c).model_dump(mode="json") for c in conflicts],
+                },
+            )
+
+    @staticmethod
+    async def create_schedule(db: AsyncSession, admin: AuthPrincipal, data: ScheduleCreate) -> ScheduleResponse:
+        result = await db.execute(
+            select(Subject.code).where(
+                Subject.id == data.subject_id,
+                Subject.university_id == admin.university_id,
+            )
+        )
+        subject_code = result.scalar_one_or_none()
+        if subject_code is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Subject not found")
+
         schedule = SubjectSchedule(
             id=uuid.uuid4(),
             subject_id=data.subject_id,
@@ -36,9 +189,20 @@ class TimetableService:
             room=data.room,
             instructor=data.instructor,
         )
+        await TimetableService._check_conflicts(db, admin.university_id, Slot(
+            schedule_id=schedule.id,
+            subject_id=schedule.subject_id,
+            subject_code=subject_code,
+            day=data.day_of_week,
+            start=data.start_time,
+            end=data.end_time,
+            room=data.room,
+            instructor=data.instructor,
+        ))
         db.add(schedule)
         await db.flush()
-        await db.refresh(schedule)
+        await invalidate_timetable(db, admin.university_id)
+        schedule = await TimetableService._get_schedule(db, schedule.id)
         resp = ScheduleResponse.model_validate(schedule)
         if schedule.subject:
             resp.subject_name = schedule.subject.name
@@ -46,23 +210,38 @@ class TimetableService:
         return resp
 
     @staticmethod
-    async def update_schedule(db: AsyncSession, admin: User, schedule_id: uuid.UUID, data: ScheduleUpdate) -> ScheduleResponse:
+    async def update_schedule(db: AsyncSession, admin: AuthPrincipal, schedule_id: uuid.UUID, data: ScheduleUpdate) -> ScheduleResponse:
         result = await db.execute(
-            select(SubjectSchedule).where(
+            _slot_query().where(
                 SubjectSchedule.id == schedule_id,
                 SubjectSchedule.university_id == admin.university_id,
             )
         )
-        schedule = result.scalar_one_or_none()
-        if not schedule:
+        row = result.one_or_none()
+        if not row:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Schedule not found")
 
-        for field, value in data.model_dump(exclude_unset=True).items():
+        changes = data.model_dump(exclude_unset=True)
+        current = _slot(row)
+        await TimetableService._check_conflicts(db, admin.university_id, Slot(
+            schedule_id=current.schedule_id,
+            subject_id=current.subject_id,
+            subject_code=current.subject_code,
+            day=changes.get("day_of_week") or current.day,
+            start=changes.get("start_time") or current.start,
+            end=changes.get("end_time") or current.end,
+            room=changes.get("room", current.room),
+            instructor=changes.get("instructor", current.instructor),
+        ))
+
+        schedule = await db.get(SubjectSchedule, schedule_id)
+        for field, value in changes.items():
             if field == "day_of_week" and value:
                 value = DayOfWeek(value)
             setattr(schedule, field, value)
         await db.flush()
-        await db.refresh(schedule)
+        await invalidate_timetable(db, admin.university_id)
+        schedule = await TimetableService._get_schedule(db, schedule.id)
         resp = ScheduleResponse.model_validate(schedule)
         if schedule.subject:
             resp.subject_name = schedule.subject.name
@@ -70,7 +249,7 @@ class TimetableService:
         return resp
 
     @staticmethod
-    async def delete_schedule(db: AsyncSession, admin: User, schedule_id: uuid.UUID) -> dict:
+    async def delete_schedule(db: AsyncSession, admin: AuthPrincipal, schedule_id: uuid.UUID) -> dict:
         result = await db.execute(
             select(SubjectSchedule).where(
                 SubjectSchedule.id == schedule_id,
@@ -82,11 +261,16 @@ class TimetableService:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Schedule not found")
         await db.delete(schedule)
         await db.flush()
+        await invalidate_timetable(db, admin.university_id)
         return {"detail": "Schedule deleted"}
 
     @staticmethod
     async def list_schedules(db: AsyncSession, university_id: uuid.UUID, subject_id: uuid.UUID | None = None) -> ScheduleListResponse:
-        query = select(SubjectSchedule).where(SubjectSchedule.university_id == university_id)
+        query = (
+            select(SubjectSchedule)
+            .options(*load_options(SubjectSchedule, LoadProfile.ADMIN_LIST))
+            .where(SubjectSchedule.university_id == university_id)
+        )
         if subject_id:
             query = query.where(SubjectSchedule.subject_id == subject_id)
         query = query.order_by(SubjectSchedule.day_of_week, SubjectSchedule.start_time)
@@ -103,7 +287,7 @@ class TimetableService:
 
     # ── Student: weekly timetable ────────────
     @staticmethod
-    async def get_weekly_timetable(db: AsyncSession, user: User) -> WeeklyTimetableResponse:
+    async def get_weekly_timetable(db: AsyncSession, user: AuthPrincipal) -> WeeklyTimetableResponse:
         # Get enrolled subject IDs
         enroll_result = await db.execute(
             select(Enrollment.subject_id).where(
@@ -114,56 +298,228 @@ class TimetableService:
         subject_ids = [row[0] for row in enroll_result.all()]
 
         if not subject_ids:
-            days_order = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday"]
             return WeeklyTimetableResponse(
-                days=[TimetableDayResponse(day=d, entries=[]) for d in days_order],
+                days=[TimetableDayResponse(day=d, entries=[]) for d in DAYS_ORDER],
                 total_subjects=0,
                 total_hours=0.0,
             )
 
-        # Get schedules for enrolled subjects
+        cache = get_cache("timetable", ttl=settings.TIMETABLE_CACHE_TTL_SECONDS)
+        key = ":".join([
+            str(user.university_id),
+            await state_token(timetable_scope(user.university_id)),
+            _subject_set_key(subject_ids),
+        ])
+        cached = await cache.get(key)
+        if cached is not None:
+            return WeeklyTimetableResponse.model_validate(cached)
+
+        timetable = await TimetableService.build_weekly_timetable(db, user.university_id, subject_ids)
+        await cache.set(key, timetable.model_dump(mode="json"))
+        return timetable
+
+    @staticmethod
+    async def build_weekly_timetable(
+        db: AsyncSession, university_id: uuid.UUID, subject_ids: list[uuid.UUID]
+    ) -> WeeklyTimetableResponse:
+        """Render the weekly grid for a set of subjects (rows arrive sorted by start time)."""
         result = await db.execute(
-            select(SubjectSchedule).where(
+            _slot_query()
+            .add_columns(Subject.name)
+            .where(
                 SubjectSchedule.subject_id.in_(subject_ids),
-                SubjectSchedule.university_id == user.university_id,
-            ).order_by(SubjectSchedule.start_time)
+                SubjectSchedule.university_id == university_id,
+            )
+            .order_by(SubjectSchedule.start_time)
         )
-        schedules = result.scalars().all()
+        rows = result.all()
 
         # Group by day
         day_map: dict[str, list[TimetableEntry]] = defaultdict(list)
-        total_hours = 0.0
+        total_minutes = 0
         unique_subjects = set()
 
-        for s in schedules:
-            day_key = s.day_of_week.value
-            subject_name = s.subject.name if s.subject else "Unknown"
-            subject_code = s.subject.code if s.subject else "N/A"
+        for s in rows:
             unique_subjects.add(s.subject_id)
-
-            # Calculate hours
-            start_minutes = s.start_time.hour * 60 + s.start_time.minute
-            end_minutes = s.end_time.hour * 60 + s.end_time.minute
-            total_hours += (end_minutes - start_minutes) / 60.0
-
-            day_map[day_key].append(TimetableEntry(
+            total_minutes += (
+                (s.end_time.hour * 60 + s.end_time.minute)
+                - (s.start_time.hour * 60 + s.start_time.minute)
+            )
+            day_map[s.day_of_week.value].append(TimetableEntry(
                 schedule_id=s.id,
-                subject_name=subject_name,
-                subject_code=subject_code,
+                subject_name=s.name,
+                subject_code=s.code,
                 start_time=s.start_time,
                 end_time=s.end_time,
                 room=s.room,
                 instructor=s.instructor,
             ))
 
-        days_order = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday"]
-        days = [
-            TimetableDayResponse(day=d, entries=sorted(day_map.get(d, []), key=lambda e: e.start_time))
-            for d in days_order
-        ]
-
         return WeeklyTimetableResponse(
-            days=days,
+            days=[TimetableDayResponse(day=d, entries=day_map.get(d, [])) for d in DAYS_ORDER],
             total_subjects=len(unique_subjects),
-            total_hours=round(total_hours, 1),
+            total_hours=round(total_minutes / 60.0, 1),
+            clashes=[_conflict_response(c) for c in subject_clashes(map(_slot, rows))],
+        )
+
+    # ── Admin: validation ────────────────────
+    @staticmethod
+    async def validate_timetable(db: AsyncSession, admin: AuthPrincipal) -> TimetableValidationResponse:
+        """Check the whole university timetable for room, instructor and student clashes."""
+        uni_id = admin.university_id
+        result = await db.execute(_slot_query().where(SubjectSchedule.university_id == uni_id))
+        slots = [_slot(row) for row in result.all()]
+
+        # Students holding the same subject set are checked together
+        result = await db.execute(
+            select(Enrollment.user_id, Enrollment.subject_id).where(
+                Enrollment.university_id == uni_id,
+                Enrollment.status == EnrollmentStatus.ACTIVE,
+            )
+        )
+        by_student: dict[uuid.UUID, set[uuid.UUID]] = defaultdict(set)
+        for user_id, subject_id in result.all():
+            by_student[user_id].add(subject_id)
+        subject_sets = Counter(frozenset(subjects) for subjects in by_student.values())
+
+        rooms = [_conflict_response(c) for c in room_conflicts(slots)]
+        instructors = [_conflict_response(c) for c in instructor_conflicts(slots)]
+        students = [_conflict_response(c) for c in student_clashes(slots, subject_sets)]
+        return TimetableValidationResponse(
+            total_schedules=len(slots),
+            room_conflicts=rooms,
+            instructor_conflicts=instructors,
+            student_clashes=students,
+            is_valid=not (rooms or instructors or students),
+        )
+
+    # ── Admin: generator ─────────────────────
+    @staticmethod
+    async def generate_timetable(
+        db: AsyncSession, admin: AuthPrincipal, data: TimetableGenerateRequest
+    ) -> TimetableGenerateResponse:
+        """Solve a clash-free timetable for the university's subjects; optionally replace their schedules."""
+        uni_id = admin.university_id
+        days = data.days or DAYS_ORDER
+        if any(d not in DAYS_ORDER for d in days) or len(set(days)) != len(days):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"days must be distinct values of {DAYS_ORDER}")
+        if data.day_end <= data.day_start:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="day_end must be after day_start")
+        if len({" ".join(r.name.split()).lower() for r in data.rooms}) != len(data.rooms):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Room names must be unique")
+
+        query = select(
+            Subject.id, Subject.code, Subject.credits, Subject.course_id, Subject.semester, Subject.is_elective,
+        ).where(Subject.university_id == uni_id, Subject.is_active.is_(True))
+        catalogue = (await db.execute(query)).all()
+        requested = {s.subject_id: s for s in data.subjects} if data.subjects is not None else None
+        subjects = [s for s in catalogue if requested is None or s.id in requested]
+        if requested is not None and len(subjects) != len(requested):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Subject not found")
+        codes = {s.id: s.code for s in subjects}
+
+        # Students' subject sets, plus each course semester's core subjects, must not overlap
+        result = await db.execute(
+            select(Enrollment.user_id, Enrollment.subject_id).where(
+                Enrollment.university_id == uni_id,
+                Enrollment.status == EnrollmentStatus.ACTIVE,
+            )
+        )
+        by_student: dict[uuid.UUID, set[uuid.UUID]] = defaultdict(set)
+        students: Counter[uuid.UUID] = Counter()
+        for user_id, subject_id in result.all():
+            by_student[user_id].add(subject_id)
+            students[subject_id] += 1
+        cohorts: dict[tuple, set[uuid.UUID]] = defaultdict(set)
+        for s in catalogue:
+            if not s.is_elective:
+                cohorts[(s.course_id, s.semester)].add(s.id)
+        groups = {frozenset(g) for g in by_student.values() if len(g) > 1}
+        groups.update(frozenset(g) for g in cohorts.values() if len(g) > 1)
+
+        # Other subjects' schedules stay put; generated subjects keep their current instructor
+        result = await db.execute(_slot_query().where(SubjectSchedule.university_id == uni_id))
+        fixed, instructors = [], {}
+        for slot in map(_slot, result.all()):
+            if slot.subject_id in codes:
+                instructors.setdefault(slot.subject_id, slot.instructor)
+            else:
+                fixed.append(FixedSlot(slot.subject_id, slot.day, slot.start, slot.end, slot.room, slot.instructor))
+
+        demands = []
+        for s in subjects:
+            spec = requested.get(s.id) if requested else None
+            demands.append(SubjectDemand(
+                subject_id=s.id,
+                code=s.code,
+                sessions=(spec.sessions_per_week if spec and spec.sessions_per_week else None) or max(s.credits or 1, 1),
+                students=students[s.id],
+                instructor=(spec.instructor if spec and spec.instructor else None) or instructors.get(s.id),
+            ))
+        problem = TimetableProblem(
+            subjects=demands,
+            rooms=[Room(r.name, r.capacity) for r in data.rooms],
+            days=list(days),
+            day_start=data.day_start,
+            day_end=data.day_end,
+            period_minutes=data.period_minutes,
+            conflict_groups=list(groups),
+            fixed=fixed,
+        )
+        # CPU-bound: keep the event loop free while the search runs
+        parallel = data.workers > 1 and settings.TIMETABLE_GENERATOR_MAX_WORKERS > 1
+        generated = await asyncio.to_thread(
+            generate_timetable,
+            problem,
+            data.attempts,
+            _get_generator_pool() if parallel else None,
+            settings.TIMETABLE_GENERATOR_BACKTRACK_BUDGET,
+        )
+
+        if data.apply:
+            await db.execute(
+                delete(SubjectSchedule).where(
+                    SubjectSchedule.university_id == uni_id,
+                    SubjectSchedule.subject_id.in_(codes),
+                )
+            )
+            if generated.placements:
+                await db.execute(insert(SubjectSchedule), [
+                    {
+                        "id": uuid.uuid4(),
+                        "subject_id": p.subject_id,
+                        "university_id": uni_id,
+                        "day_of_week": DayOfWeek(p.day),
+                        "start_time": p.start,
+                        "end_time": p.end,
+                        "room": p.room,
+                        "instructor": p.instructor,
+                    }
+                    for p in generated.placements
+                ])
+            await invalidate_timetable(db, uni_id)
+
+        return TimetableGenerateResponse(
+            schedules=[
+                GeneratedSchedule(
+                    subject_id=p.subject_id,
+                    subject_code=codes[p.subject_id],
+                    day_of_week=p.day,
+                    start_time=p.start,
+                    end_time=p.end,
+                    room=p.room,
+                    instructor=p.instructor,
+                )
+                for p in generated.placements
+            ],
+            unplaced=[
+                UnplacedSubject(subject_id=sid, subject_code=codes[sid], sessions_missing=n)
+                for sid, n in generated.unplaced.items()
+            ],
+            sessions_requested=generated.sessions_requested,
+            sessions_placed=len(generated.placements),
+            room_utilization=generated.room_utilization,
+            attempts=generated.attempts,
+            elapsed_ms=generated.elapsed_ms,
+            applied=data.apply,
         )
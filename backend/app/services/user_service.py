@@ -10,6 +10,7 @@ from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import invalidate_student
 from app.models.user import User
 from app.schemas.user import UserResponse, UserUpdate
 
@@ -26,6 +27,7 @@ class UserService:
         for field, value in update_data.items():
             setattr(user, field, value)
         await db.flush()
+        await invalidate_student(db, user.id)
         return UserResponse.model_validate(user)
 
     @staticmethod
@@ -2,6 +2,9 @@
 General utility helpers.
 """
 
+import base64
+import binascii
+import json
 import secrets
 import string
 import uuid
@@ -37,3 +40,29 @@ def slugify(text: str) -> str:
     text = re.sub(r"[\s_]+", "-", text)
     text = re.sub(r"-+", "-", text)
     return text.strip("-")
+
+
+def encode_cursor(*values) -> str:
+    """Encode keyset pagination values (datetimes, UUIDs, scalars) as an opaque cursor."""
+    parts = [v.isoformat() if isinstance(v, datetime) else str(v) if isinstance(v, uuid.UUID) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(parts).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type) -> tuple:
+    """
+    Decode a cursor produced by encode_cursor, converting each value to the given type.
+    Raises ValueError for malformed or tampered cursors.
+    """
+    try:
+        parts = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ValueError("Malformed cursor") from exc
+    if not isinstance(parts, list) or len(parts) != len(types):
+        raise ValueError("Malformed cursor")
+    try:
+        return tuple(
+            datetime.fromisoformat(v) if t is datetime else uuid.UUID(v) if t is uuid.UUID else t(v)
+            for t, v in zip(types, parts)
+        )
+    except (TypeError, ValueError, AttributeError) as exc:
+        raise ValueError("Malformed cursor") from exc
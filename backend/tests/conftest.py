@@ -3,6 +3,7 @@ Test fixtures and configuration.
 """
 
 import asyncio
+import uuid
 from typing import AsyncGenerator
 
 import pytest
@@ -10,8 +11,13 @@ import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from app.auth.jwt_handler import create_access_token
+from app import database
 from app.database import Base, get_db
 from app.main import app
+from app.models.course import Course, Subject
+from app.models.university import University
+from app.models.user import User, UserRole
 
 # Test database URL (use a separate test database)
 TEST_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
@@ -42,6 +48,12 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+@pytest.fixture
+def committing_units(monkeypatch):
+    """Point the app's unit_of_work at the test database: each unit really commits."""
+    monkeypatch.setattr(database, "async_session", test_session)
+
+
 @pytest_asyncio.fixture
 async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
     async def override_get_db():
@@ -54,3 +66,56 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
         yield ac
 
     app.dependency_overrides.clear()
+
+
+@pytest_asyncio.fixture
+async def make_user(db_session: AsyncSession):
+    """Factory creating a user (and a university if none is given) plus auth headers."""
+
+    async def factory(
+        role: UserRole = UserRole.STUDENT, university_id: uuid.UUID | None = None, **fields
+    ) -> tuple[User, dict]:
+        if university_id is None:
+            university = University(
+                id=uuid.uuid4(), name=f"University {uuid.uuid4().hex[:8]}", slug=f"uni-{uuid.uuid4().hex[:8]}",
+            )
+            db_session.add(university)
+            university_id = university.id
+        user = User(
+            id=uuid.uuid4(),
+            email=f"{uuid.uuid4().hex[:8]}@example.com",
+            hashed_password="x",
+            first_name=fields.pop("first_name", "Asha"),
+            last_name=fields.pop("last_name", "Rao"),
+            phone=fields.pop("phone", "9999999999"),
+            role=role,
+            university_id=university_id,
+            **fields,
+        )
+        db_session.add(user)
+        await db_session.flush()
+        token = create_access_token({"sub": str(user.id), "role": role.value})
+        return user, {"Authorization": f"Bearer {token}"}
+
+    return factory
+
+
+@pytest_asyncio.fixture
+async def make_course(db_session: AsyncSession):
+    """Factory creating a course with `subjects` subjects in a university."""
+
+    async def factory(university_id: uuid.UUID, subjects: int = 3, code: str = "BTECH") -> tuple[Course, list[Subject]]:
+        course = Course(id=uuid.uuid4(), university_id=university_id, name=f"{code} Programme", code=code)
+        db_session.add(course)
+        items = [
+            Subject(
+                id=uuid.uuid4(), course_id=course.id, university_id=university_id,
+                name=f"Subject {i}", code=f"{code}-{i:03d}",
+            )
+            for i in range(1, subjects + 1)
+        ]
+        db_session.add_all(items)
+        await db_session.flush()
+        return course, items
+
+    return factory
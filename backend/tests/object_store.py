@@ -0,0 +1,91 @@
+"""
+In-process stand-in for the Supabase Storage REST API.
+
+Mount it under SupabaseStorage with `transport=store.transport()` to exercise
+the real HTTP code path without a network: objects live in memory, and every
+request is recorded so tests can count round trips.
+"""
+
+import json
+import uuid
+
+import httpx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+PREFIX = "/storage/v1"
+
+
+class FakeObjectStore:
+    def __init__(self, service_key: str = "service-key"):
+        self.service_key = service_key
+        self.objects: dict[tuple[str, str], tuple[bytes, str]] = {}
+        self.requests: list[tuple[str, str]] = []
+        self.chunks_received: list[int] = []
+        self.app = Starlette(routes=[
+            Route(PREFIX + "/object/sign/{bucket}", self._sign_many, methods=["POST"]),
+            Route(PREFIX + "/object/sign/{bucket}/{path:path}", self._sign, methods=["POST"]),
+            Route(PREFIX + "/object/public/{bucket}/{path:path}", self._get, methods=["GET"]),
+            Route(PREFIX + "/object/{bucket}/{path:path}", self._put, methods=["POST"]),
+            Route(PREFIX + "/object/{bucket}", self._delete, methods=["DELETE"]),
+        ])
+
+    def transport(self) -> httpx.ASGITransport:
+        return httpx.ASGITransport(app=self.app)
+
+    def _authorized(self, request: Request) -> bool:
+        self.requests.append((request.method, request.url.path))
+        return request.headers.get("authorization") == f"Bearer {self.service_key}"
+
+    async def _put(self, request: Request) -> Response:
+        if not self._authorized(request):
+            return JSONResponse({"error": "Unauthorized"}, status_code=403)
+        key = (request.path_params["bucket"], request.path_params["path"])
+        if key in self.objects and request.headers.get("x-upsert") != "true":
+            return JSONResponse({"error": "Duplicate"}, status_code=409)
+        body = bytearray()
+        async for chunk in request.stream():
+            if chunk:
+                self.chunks_received.append(len(chunk))
+                body.extend(chunk)
+        self.objects[key] = (bytes(body), request.headers.get("content-type", ""))
+        return JSONResponse({"Key": "/".join(key)})
+
+    async def _delete(self, request: Request) -> Response:
+        if not self._authorized(request):
+            return JSONResponse({"error": "Unauthorized"}, status_code=403)
+        bucket = request.path_params["bucket"]
+        removed = []
+        for path in json.loads(await request.body())["prefixes"]:
+            if self.objects.pop((bucket, path), None) is not None:
+                removed.append({"name": path})
+        return JSONResponse(removed)
+
+    async def _sign(self, request: Request) -> Response:
+        if not self._authorized(request):
+            return JSONResponse({"error": "Unauthorized"}, status_code=403)
+        bucket, path = request.path_params["bucket"], request.path_params["path"]
+        if (bucket, path) not in self.objects:
+            return JSONResponse({"error": "Object not found"}, status_code=404)
+        expires_in = (await request.json())["expiresIn"]
+        return JSONResponse({"signedURL": f"/object/sign/{bucket}/{path}?token={uuid.uuid4().hex}&e={expires_in}"})
+
+    async def _sign_many(self, request: Request) -> Response:
+        if not self._authorized(request):
+            return JSONResponse({"error": "Unauthorized"}, status_code=403)
+        bucket, data = request.path_params["bucket"], await request.json()
+        return JSONResponse([
+            {"path": path, "signedURL": f"/object/sign/{bucket}/{path}?token={uuid.uuid4().hex}", "error": None}
+            if (bucket, path) in self.objects
+            else {"path": path, "signedURL": None, "error": "Object not found"}
+            for path in data["paths"]
+        ])
+
+    async def _get(self, request: Request) -> Response:
+        self.requests.append((request.method, request.url.path))
+        found = self.objects.get((request.path_params["bucket"], request.path_params["path"]))
+        if found is None:
+            return JSONResponse({"error": "Object not found"}, status_code=404)
+        return Response(found[0], media_type=found[1])
@@ -0,0 +1,52 @@
+"""
+University analytics rollup tests.
+"""
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import UserRole
+from app.services.analytics_service import AnalyticsService
+
+
+@pytest.mark.asyncio
+async def test_incremental_counters_match_reconciliation(
+    client: AsyncClient, db_session: AsyncSession, make_user
+):
+    admin, admin_headers = await make_user(UserRole.ADMIN)
+    _, student_headers = await make_user(university_id=admin.university_id)
+
+    response = await client.get("/api/v1/admin/analytics", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.json()["total_students"] == 1
+
+    payment = await client.post(
+        "/api/v1/payments/initiate",
+        headers=student_headers,
+        json={"payment_type": "tuition", "amount": 4000},
+    )
+    await client.post(f"/api/v1/payments/{payment.json()['id']}/verify", headers=student_headers)
+    await client.post(
+        "/api/v1/payments/initiate",
+        headers=student_headers,
+        json={"payment_type": "hostel", "amount": 1500},
+    )
+    application = await client.post(
+        "/api/v1/hostel/apply", headers=student_headers, json={"room_type_preference": "single"},
+    )
+    await client.put(
+        f"/api/v1/hostel/{application.json()['id']}/allocate",
+        headers=admin_headers,
+        json={"status": "allocated", "allocated_room_number": "A-101"},
+    )
+
+    rollup = await AnalyticsService.get(db_session, admin.university_id)
+    assert rollup == await AnalyticsService.compute(db_session, admin.university_id)
+    assert rollup["payments_revenue"] == 4000
+    assert rollup["payments_pending"] == 1
+    assert rollup["hostel_pending"] == 0
+    assert rollup["hostel_allocated"] == 1
+
+    response = await client.get("/api/v1/admin/analytics", headers=admin_headers)
+    assert response.json()["total_revenue"] == 4000
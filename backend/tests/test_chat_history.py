@@ -0,0 +1,128 @@
+"""
+Chat history pagination tests.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.chat import ChatMessage, ChatSession
+
+
+@pytest.mark.asyncio
+async def test_session_list_is_keyset_paginated(
+    client: AsyncClient, db_session: AsyncSession, make_user
+):
+    user, headers = await make_user()
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    sessions = []
+    for i in range(5):
+        # Two sessions share each timestamp to exercise the id tie-breaker
+        session = ChatSession(
+            id=uuid.uuid4(), user_id=user.id, university_id=user.university_id,
+            title=f"Session {i}", updated_at=base + timedelta(minutes=i // 2),
+        )
+        sessions.append(session)
+        db_session.add(session)
+        for j in range(i + 1):
+            db_session.add(ChatMessage(
+                id=uuid.uuid4(), session_id=session.id, role="user",
+                content=f"message {j} " + "x" * 300, created_at=base + timedelta(seconds=j),
+            ))
+    await db_session.flush()
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2} | ({"cursor": cursor} if cursor else {})
+        response = await client.get("/api/v1/chat/history", params=params, headers=headers)
+        assert response.status_code == 200
+        body = response.json()
+        seen.extend(body["sessions"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == 5
+    assert len({s["id"] for s in seen}) == 5
+    by_title = {s["title"]: s for s in seen}
+    assert by_title["Session 4"]["message_count"] == 5
+    assert by_title["Session 4"]["last_message_preview"].startswith("message 4")
+    assert len(by_title["Session 4"]["last_message_preview"]) == 120
+    assert "messages" not in seen[0]
+
+    response = await client.get(
+        "/api/v1/chat/history", params={"cursor": "not-a-cursor"}, headers=headers
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_session_transcript_pages_backwards(
+    client: AsyncClient, db_session: AsyncSession, make_user
+):
+    user, headers = await make_user()
+    session = ChatSession(id=uuid.uuid4(), user_id=user.id, university_id=user.university_id)
+    db_session.add(session)
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for j in range(7):
+        db_session.add(ChatMessage(
+            id=uuid.uuid4(), session_id=session.id, role="user",
+            content=f"message {j}", created_at=base + timedelta(seconds=j),
+        ))
+    await db_session.flush()
+
+    url = f"/api/v1/chat/session/{session.id}"
+    first = (await client.get(url, params={"limit": 3}, headers=headers)).json()
+    assert [m["content"] for m in first["messages"]] == ["message 4", "message 5", "message 6"]
+
+    second = (await client.get(
+        url, params={"limit": 5, "cursor": first["next_cursor"]}, headers=headers
+    )).json()
+    assert [m["content"] for m in second["messages"]] == [f"message {j}" for j in range(4)]
+    assert second["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_send_message_cost_does_not_grow_with_history(
+    client: AsyncClient, db_session: AsyncSession, make_user
+):
+    _, headers = await make_user()
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    async def send(message: str, session_id: str | None = None) -> tuple[dict, int]:
+        statements.clear()
+        event.listen(db_session.bind.sync_engine, "before_cursor_execute", record)
+        try:
+            response = await client.post(
+                "/api/v1/chat/message", headers=headers,
+                json={"message": message, "session_id": session_id},
+            )
+        finally:
+            event.remove(db_session.bind.sync_engine, "before_cursor_execute", record)
+        assert response.status_code == 200
+        return response.json(), len(statements)
+
+    first, _ = await send("hello")
+    assert [m["role"] for m in first["messages"]] == ["user", "assistant"]
+
+    counts = []
+    for i in range(12):
+        body, count = await send(f"question {i}", first["id"])
+        assert [m["content"] for m in body["messages"]][0] == f"question {i}"
+        assert len(body["messages"]) == 2
+        counts.append(count)
+    # Cached user context, bounded history window: same statements every time
+    assert len(set(counts)) == 1
+
+    response = await client.post(
+        "/api/v1/chat/message", headers=headers, params={"transcript": True},
+        json={"message": "last one", "session_id": first["id"]},
+    )
+    assert len(response.json()["messages"]) == 28
@@ -0,0 +1,76 @@
+"""
+Streaming chat (SSE) tests.
+"""
+
+import json
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.principal import load_principal
+from app.database import unit_of_work
+from app.models.chat import ChatMessage
+from app.schemas.chat import ChatMessageRequest
+from app.services.chat_service import ChatService
+
+
+def _parse_sse(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_stream_message_emits_tokens_and_persists_reply(
+    client: AsyncClient, db_session: AsyncSession, make_user, committing_units
+):
+    _, headers = await make_user()
+    await db_session.commit()
+
+    response = await client.post(
+        "/api/v1/chat/message/stream", headers=headers, json={"message": "hello"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = _parse_sse(response.text)
+    names = [name for name, _ in events]
+    assert names[0] == "session" and names[-1] == "done"
+    assert names.count("token") > 1
+
+    streamed = "".join(data["delta"] for name, data in events if name == "token")
+    reply = events[-1][1]["message"]
+    assert reply["role"] == "assistant"
+    assert reply["content"] == streamed
+
+    session_id = uuid.UUID(events[0][1]["session_id"])
+    result = await db_session.execute(
+        select(ChatMessage.role, ChatMessage.content).where(ChatMessage.session_id == session_id)
+    )
+    assert sorted(result.all()) == [("assistant", streamed), ("user", "hello")]
+
+
+@pytest.mark.asyncio
+async def test_user_turn_survives_a_disconnect_mid_stream(
+    db_session: AsyncSession, make_user, committing_units
+):
+    user, _ = await make_user()
+    await db_session.commit()
+    principal = await load_principal(db_session, user.id)
+
+    response = await ChatService.stream_message(unit_of_work, principal, ChatMessageRequest(message="hello"))
+    body = response.body_iterator
+    name, data = _parse_sse(await anext(body))[0]
+    assert name == "session"
+    await anext(body)  # first token, then the client goes away
+    await body.aclose()
+
+    result = await db_session.execute(
+        select(ChatMessage.role, ChatMessage.content).where(ChatMessage.session_id == uuid.UUID(data["session_id"]))
+    )
+    assert result.all() == [("user", "hello")]
@@ -0,0 +1,156 @@
+"""
+Dashboard summary tests.
+"""
+
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import after_commit, unit_of_work
+from app.models.compliance import ComplianceItem, ComplianceType, StudentCompliance
+from app.models.document import Document, DocumentStatus
+from app.models.payment import Payment, PaymentStatus
+from app.models.user import User
+
+
+def _document(user: User, document_type: str, doc_status: DocumentStatus) -> Document:
+    return Document(
+        id=uuid.uuid4(),
+        user_id=user.id,
+        university_id=user.university_id,
+        document_type=document_type,
+        file_name=f"{document_type}.pdf",
+        file_url=f"/uploads/{document_type}.pdf",
+        mime_type="application/pdf",
+        status=doc_status,
+    )
+
+
+@pytest.mark.asyncio
+async def test_dashboard_summary_aggregates(client: AsyncClient, db_session: AsyncSession, make_user):
+    user, headers = await make_user()
+    db_session.add_all([
+        _document(user, "aadhar_card", DocumentStatus.APPROVED),
+        _document(user, "photo", DocumentStatus.PENDING),
+        _document(user, "photo", DocumentStatus.REJECTED),
+        Payment(
+            id=uuid.uuid4(), user_id=user.id, university_id=user.university_id,
+            payment_type="tuition", amount=5000, status=PaymentStatus.COMPLETED,
+        ),
+        Payment(
+            id=uuid.uuid4(), user_id=user.id, university_id=user.university_id,
+            payment_type="hostel", amount=1200, status=PaymentStatus.PENDING,
+        ),
+    ])
+    items = [
+        ComplianceItem(
+            id=uuid.uuid4(), university_id=user.university_id, title=f"Item {i}",
+            compliance_type=ComplianceType.DECLARATION, is_required=True, is_active=True,
+        )
+        for i in range(2)
+    ]
+    db_session.add_all(items)
+    await db_session.flush()
+    db_session.add(StudentCompliance(
+        id=uuid.uuid4(), user_id=user.id, compliance_item_id=items[0].id,
+        university_id=user.university_id, is_completed=True,
+    ))
+    await db_session.flush()
+
+    response = await client.get("/api/v1/dashboard/summary", headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["documents"] == {
+        "total": 3, "approved": 1, "pending": 1, "rejected": 1, "under_review": 0,
+    }
+    assert data["payments"]["status"] == "pending"
+    assert data["payments"]["total_paid"] == 5000
+    assert data["payments"]["total_pending"] == 1200
+    assert data["payments"]["count"] == 2
+    assert data["hostel"]["status"] == "not_applied"
+    assert data["lms"] == {"status": "inactive", "lms_id": None, "platform": "Moodle"}
+    assert data["user"]["name"] == "Asha Rao"
+
+    checklist = {item["id"]: item for item in data["checklist"]["items"]}
+    assert checklist["profile"]["is_completed"] is True
+    assert checklist["documents_upload"]["description"] == "2/4 required documents uploaded"
+    assert checklist["documents_approved"]["description"] == "1/4 documents approved"
+    assert checklist["payment"]["is_completed"] is True
+    assert checklist["compliance"]["description"] == "1/2 items completed"
+
+
+async def _summary_with_statements(
+    client: AsyncClient, db_session: AsyncSession, headers: dict
+) -> tuple[dict, list[str]]:
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = await client.get("/api/v1/dashboard/summary", headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    return response.json(), statements
+
+
+@pytest.mark.asyncio
+async def test_dashboard_summary_is_one_query(client: AsyncClient, db_session: AsyncSession, make_user):
+    _, headers = await make_user()
+    _, statements = await _summary_with_statements(client, db_session, headers)
+    # One lookup for the authenticated principal, one for the whole summary.
+    assert len(statements) == 2
+
+
+@pytest.mark.asyncio
+async def test_dashboard_summary_cached_until_invalidated(client: AsyncClient, db_session: AsyncSession, make_user):
+    _, headers = await make_user()
+    first, _ = await _summary_with_statements(client, db_session, headers)
+    assert first["payments"]["count"] == 0
+
+    cached, statements = await _summary_with_statements(client, db_session, headers)
+    assert cached == first
+    assert len(statements) == 1  # principal lookup only
+
+    response = await client.post(
+        "/api/v1/payments/initiate",
+        headers=headers,
+        json={"payment_type": "tuition", "amount": 2500},
+    )
+    assert response.status_code == 200
+
+    refreshed, statements = await _summary_with_statements(client, db_session, headers)
+    assert len(statements) == 2
+    assert refreshed["payments"]["count"] == 1
+    assert refreshed["payments"]["total_pending"] == 2500
+
+
+@pytest.mark.asyncio
+async def test_failing_post_commit_callback_does_not_undo_the_write(
+    db_session: AsyncSession, make_user, committing_units
+):
+    user, _ = await make_user()
+    await db_session.commit()
+    ran = []
+
+    async def broken() -> None:
+        raise ConnectionError("cache down")
+
+    async def invalidate() -> None:
+        ran.append("invalidate")
+
+    async with unit_of_work() as db:
+        db.add(_document(user, "marksheet", DocumentStatus.PENDING))
+        after_commit(db, broken)
+        after_commit(db, invalidate)
+
+    assert ran == ["invalidate"]
+    assert (await db_session.execute(select(Document.document_type))).scalars().all() == ["marksheet"]
@@ -0,0 +1,187 @@
+"""
+Document upload tests.
+"""
+
+import hashlib
+import io
+import os
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from httpx import AsyncClient
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.datastructures import Headers
+
+from app.database import run_post_commit, run_post_rollback
+from app.models.document import StoredBlob
+from app.models.user import UserRole
+from app.services import storage_service
+from app.services.storage_backends import LocalStorage, set_storage
+from app.services.storage_service import MAX_FILE_SIZE, StorageService
+
+
+@pytest.fixture
+def upload_dir(tmp_path):
+    local = LocalStorage(str(tmp_path))
+    set_storage(local, local)
+    yield tmp_path
+    set_storage(None)
+
+
+@pytest.mark.asyncio
+async def test_upload_streams_to_local_storage(client: AsyncClient, make_user, upload_dir):
+    student, headers = await make_user(UserRole.STUDENT)
+    body = os.urandom(700 * 1024)
+    response = await client.post(
+        "/api/v1/documents/upload", headers=headers,
+        data={"document_type": "marksheet"},
+        files={"file": ("marks.pdf", body, "application/pdf")},
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["file_url"] == f"/api/v1/documents/{response.json()['id']}/file"
+
+    [stored] = [p for p in upload_dir.rglob("*") if p.is_file()]
+    assert stored.relative_to(upload_dir).parts[:2] == (str(student.university_id), "blobs")
+    assert stored.read_bytes() == body
+
+
+@pytest.mark.asyncio
+async def test_oversized_upload_stops_at_first_chunk_past_limit(upload_dir, monkeypatch):
+    monkeypatch.setattr(storage_service.settings, "UPLOAD_CHUNK_SIZE", 64 * 1024)
+    source = io.BytesIO(b"x" * (MAX_FILE_SIZE * 2))
+    # No size known up front, as with a streamed body: only the chunk guard can stop it
+    file = UploadFile(source, filename="big.pdf", headers=Headers({"content-type": "application/pdf"}))
+
+    with pytest.raises(HTTPException) as exc:
+        await StorageService.upload_file(file, "uni/user/documents")
+    assert exc.value.status_code == 400
+    assert source.tell() <= MAX_FILE_SIZE + 64 * 1024
+    assert not [p for p in upload_dir.rglob("*") if p.is_file()]
+
+
+@pytest.mark.asyncio
+async def test_upload_reports_size_and_sha256(upload_dir):
+    body = b"%PDF-1.4 hello"
+    file = UploadFile(io.BytesIO(body), filename="a.pdf", headers=Headers({"content-type": "application/pdf"}))
+    stored = await StorageService.upload_file(file, "uni/user/documents")
+    assert (upload_dir / stored.path).read_bytes() == body
+    assert stored.size == len(body)
+    assert stored.sha256 == hashlib.sha256(body).hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_duplicate_uploads_share_one_blob_until_last_delete(
+    client: AsyncClient, db_session: AsyncSession, make_user, upload_dir, monkeypatch
+):
+    first, first_headers = await make_user(UserRole.STUDENT)
+    second, second_headers = await make_user(UserRole.STUDENT, university_id=first.university_id)
+    writes = []
+    real_write = storage_service._write
+
+    async def counting_write(*args):
+        writes.append(args[2])
+        return await real_write(*args)
+
+    monkeypatch.setattr(storage_service, "_write", counting_write)
+    body = b"%PDF-1.4 marksheet" * 1000
+    ids = []
+    for headers in (first_headers, first_headers, second_headers):
+        response = await client.post(
+            "/api/v1/documents/upload", headers=headers,
+            data={"document_type": "marksheet"},
+            files={"file": ("marks.pdf", body, "application/pdf")},
+        )
+        assert response.status_code == 200, response.text
+        ids.append(response.json()["id"])
+
+    assert len(writes) == 1
+    blob = (await db_session.execute(select(StoredBlob))).scalar_one()
+    assert blob.ref_count == 3
+    assert blob.content_hash == hashlib.sha256(body).hexdigest()
+    stored = upload_dir / blob.storage_path
+
+    for doc_id, headers in zip(ids[:2], (first_headers, first_headers)):
+        response = await client.delete(f"/api/v1/documents/{doc_id}", headers=headers)
+        assert response.status_code == 200
+    await run_post_commit(db_session)
+    await db_session.refresh(blob)
+    assert blob.ref_count == 1
+    assert stored.exists()
+
+    # Another student's document is not theirs to delete
+    response = await client.delete(f"/api/v1/documents/{ids[2]}", headers=first_headers)
+    assert response.status_code == 404
+
+    response = await client.delete(f"/api/v1/documents/{ids[2]}", headers=second_headers)
+    assert response.status_code == 200
+    assert (await db_session.execute(select(StoredBlob))).scalar_one_or_none() is None
+    assert stored.exists()  # removed only once the transaction commits
+    await run_post_commit(db_session)
+    assert not stored.exists()
+
+
+@pytest.mark.asyncio
+async def test_new_blob_is_removed_when_its_transaction_rolls_back(
+    db_session: AsyncSession, make_user, upload_dir
+):
+    student, _ = await make_user(UserRole.STUDENT)
+    await db_session.commit()
+    body = b"%PDF-1.4 rolled back"
+    file = UploadFile(io.BytesIO(body), filename="a.pdf", headers=Headers({"content-type": "application/pdf"}))
+    stored = await StorageService.store_blob(db_session, file, student.university_id)
+    assert (upload_dir / stored.path).exists()
+
+    await db_session.rollback()
+    await run_post_rollback(db_session)
+    assert not (upload_dir / stored.path).exists()
+    assert (await db_session.execute(select(StoredBlob))).scalar_one_or_none() is None
+
+
+@pytest.mark.asyncio
+async def test_file_endpoint_serves_ranges_and_conditional_gets(
+    client: AsyncClient, db_session: AsyncSession, make_user, upload_dir
+):
+    student, headers = await make_user(UserRole.STUDENT)
+    admin, admin_headers = await make_user(UserRole.ADMIN, university_id=student.university_id)
+    _, other_headers = await make_user(UserRole.STUDENT, university_id=student.university_id)
+    _, foreign_admin_headers = await make_user(UserRole.ADMIN)
+    body = bytes(range(256)) * 64
+    response = await client.post(
+        "/api/v1/documents/upload", headers=headers,
+        data={"document_type": "marksheet"},
+        files={"file": ("scan.pdf", body, "application/pdf")},
+    )
+    url = response.json()["file_url"]
+
+    response = await client.get(url, headers=admin_headers)
+    assert response.status_code == 200
+    assert response.content == body
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["etag"] == f'"{hashlib.sha256(body).hexdigest()}"'
+    assert response.headers["cache-control"].startswith("private")
+    etag = response.headers["etag"]
+
+    statements = []
+    record = lambda conn, cursor, sql, params, context, executemany: statements.append(sql)
+    event.listen(db_session.bind.sync_engine, "before_cursor_execute", record)
+    try:
+        response = await client.get(url, headers={**headers, "Range": "bytes=100-199"})
+    finally:
+        event.remove(db_session.bind.sync_engine, "before_cursor_execute", record)
+    assert response.status_code == 206
+    assert response.content == body[100:200]
+    assert response.headers["content-range"] == f"bytes 100-199/{len(body)}"
+    assert not [s for s in statements if "FROM documents" in s]  # access facts came from the cache
+
+    response = await client.get(url, headers={**admin_headers, "If-None-Match": f"W/{etag}"})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    for outsider in (other_headers, foreign_admin_headers):
+        response = await client.get(url, headers=outsider)
+        assert response.status_code == 404
+    response = await client.get(url)
+    assert response.status_code in (401, 403)
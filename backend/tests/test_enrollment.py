@@ -0,0 +1,139 @@
+"""
+Bulk enrollment tests.
+"""
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import UserRole
+
+
+@pytest.mark.asyncio
+async def test_enroll_is_set_based_and_reactivates_dropped(
+    client: AsyncClient, db_session: AsyncSession, make_user, make_course
+):
+    user, headers = await make_user()
+    course, subjects = await make_course(user.university_id, subjects=10)
+    ids = [str(s.id) for s in subjects]
+
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db_session.bind.sync_engine, "before_cursor_execute", record)
+    try:
+        response = await client.post(
+            "/api/v1/courses/enroll", headers=headers,
+            json={"course_id": str(course.id), "subject_ids": ids + ids[:2]},
+        )
+    finally:
+        event.remove(db_session.bind.sync_engine, "before_cursor_execute", record)
+    assert response.status_code == 200
+    assert response.json()["total"] == 10
+    # principal, course+subjects, active enrollments, one INSERT, joined reload
+    assert len(statements) == 5
+
+    response = await client.post(
+        "/api/v1/courses/drop", headers=headers, json={"subject_id": ids[0]}
+    )
+    assert response.json()["total"] == 9
+
+    response = await client.post(
+        "/api/v1/courses/enroll", headers=headers,
+        json={"course_id": str(course.id), "subject_ids": ids[:3]},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 10
+    assert all(e["status"] == "active" and e["dropped_at"] is None for e in body["enrollments"])
+
+
+@pytest.mark.asyncio
+async def test_enroll_rejects_subjects_outside_course(
+    client: AsyncClient, make_user, make_course
+):
+    user, headers = await make_user()
+    course, subjects = await make_course(user.university_id)
+    _, other = await make_course(user.university_id, code="MBA")
+
+    response = await client.post(
+        "/api/v1/courses/enroll", headers=headers,
+        json={"course_id": str(course.id), "subject_ids": [str(subjects[0].id), str(other[0].id)]},
+    )
+    assert response.status_code == 400
+    assert str(other[0].id) in response.json()["detail"]
+
+    response = await client.get("/api/v1/courses/enrollments/me", headers=headers)
+    assert response.json()["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_csv_import_reports_row_errors_without_aborting(
+    client: AsyncClient, make_user, make_course
+):
+    admin, headers = await make_user(UserRole.ADMIN)
+    students = [(await make_user(university_id=admin.university_id))[0] for _ in range(3)]
+    course, subjects = await make_course(admin.university_id)
+    await make_course(admin.university_id, code="MBA")
+
+    lines = ["Email,Course_Code,Subject_Codes"]
+    lines.append(f"{students[0].email.upper()},BTECH,BTECH-001;BTECH-002")
+    lines.append(f"{students[1].email},BTECH,BTECH-001 BTECH-003 BTECH-003")
+    lines.append("nobody@example.com,BTECH,BTECH-001")
+    lines.append(f"{students[2].email},BTECH,MBA-001")
+    lines.append(f"{students[2].email},LAW,BTECH-001")
+    lines.append(f"{students[2].email},BTECH,BTECH-002")
+    csv_bytes = ("\n".join(lines) + "\n").encode()
+
+    response = await client.post(
+        "/api/v1/courses/enrollments/import", headers=headers,
+        files={"file": ("cohort.csv", csv_bytes, "text/csv")},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["rows_total"] == 6
+    assert body["rows_imported"] == 3
+    assert body["enrollments_written"] == 5
+    assert [(e["row"], e["error"].split(" ")[0]) for e in body["errors"]] == [
+        (4, "Unknown"), (5, "Subjects"), (6, "Unknown"),
+    ]
+
+    # Re-importing the same file writes nothing new
+    response = await client.post(
+        "/api/v1/courses/enrollments/import", headers=headers,
+        files={"file": ("cohort.csv", csv_bytes, "text/csv")},
+    )
+    assert response.json()["enrollments_written"] == 0
+
+
+@pytest.mark.asyncio
+async def test_csv_import_requires_columns(client: AsyncClient, make_user):
+    _, headers = await make_user(UserRole.ADMIN)
+    response = await client.post(
+        "/api/v1/courses/enrollments/import", headers=headers,
+        files={"file": ("cohort.csv", b"email,course\n", "text/csv")},
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_csv_import_rejects_non_utf8_before_writing(client: AsyncClient, make_user, make_course):
+    admin, headers = await make_user(UserRole.ADMIN)
+    student, student_headers = await make_user(university_id=admin.university_id)
+    await make_course(admin.university_id)
+    # A cp1252 export: the first row is fine, the second is not UTF-8
+    csv_bytes = (
+        f"email,course_code,subject_codes\n{student.email},BTECH,BTECH-001\nJos\u00e9@example.com,BTECH,BTECH-001\n"
+    ).encode("cp1252")
+
+    response = await client.post(
+        "/api/v1/courses/enrollments/import", headers=headers,
+        files={"file": ("cohort.csv", csv_bytes, "text/csv")},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Line 3 ")
+    response = await client.get("/api/v1/courses/enrollments/me", headers=student_headers)
+    assert response.json()["total"] == 0
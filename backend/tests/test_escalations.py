@@ -0,0 +1,66 @@
+"""
+Admin escalation counter tests.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.document import Document, DocumentStatus
+from app.models.hostel import HostelApplication, RoomType
+from app.models.payment import Payment, PaymentStatus
+from app.models.user import UserRole
+
+
+def _pending_document(user, days_old: int) -> Document:
+    return Document(
+        id=uuid.uuid4(),
+        user_id=user.id,
+        university_id=user.university_id,
+        document_type="photo",
+        file_name="photo.jpg",
+        file_url="/uploads/photo.jpg",
+        mime_type="image/jpeg",
+        status=DocumentStatus.PENDING,
+        created_at=datetime.now(timezone.utc) - timedelta(days=days_old),
+    )
+
+
+@pytest.mark.asyncio
+async def test_escalations_counted_with_aging_bucket(
+    client: AsyncClient, db_session: AsyncSession, make_user
+):
+    admin, headers = await make_user(UserRole.ADMIN)
+    student, _ = await make_user(university_id=admin.university_id)
+    db_session.add_all([
+        _pending_document(student, 0),
+        _pending_document(student, 5),
+        _pending_document(student, 10),
+        HostelApplication(
+            id=uuid.uuid4(), user_id=student.id, university_id=student.university_id,
+            room_type_preference=RoomType.SINGLE,
+        ),
+        Payment(
+            id=uuid.uuid4(), user_id=student.id, university_id=student.university_id,
+            amount=100, payment_type="tuition", status=PaymentStatus.FAILED,
+        ),
+    ])
+    await db_session.flush()
+
+    response = await client.get("/api/v1/admin/escalations", headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["pending_documents"] == 3
+    assert body["aged_pending_documents"] == 2
+    assert body["pending_hostel_applications"] == 1
+    assert body["failed_payments"] == 1
+    assert body["total_escalations"] == 5
+
+    response = await client.get(
+        "/api/v1/admin/escalations", params={"older_than_days": 7}, headers=headers
+    )
+    assert response.json()["aged_pending_documents"] == 1
+    assert response.json()["document_age_days"] == 7
@@ -0,0 +1,85 @@
+"""
+Hostel inventory and batch allocation tests.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.hostel import ApplicationStatus, HostelApplication, RoomType
+from app.models.user import UserRole
+
+
+@pytest.mark.asyncio
+async def test_batch_allocation_accessibility_first_then_fcfs(
+    client: AsyncClient, db_session: AsyncSession, make_user
+):
+    admin, headers = await make_user(UserRole.ADMIN)
+    response = await client.post("/api/v1/hostel/rooms", headers=headers, json={"rooms": [
+        {"block": "A", "floor": 0, "room_number": "001", "room_type": "double", "is_accessible": True},
+        {"block": "A", "floor": 1, "room_number": "101", "room_type": "double"},
+        {"block": "A", "floor": 1, "room_number": "102", "room_type": "single"},
+        {"block": "A", "floor": 1, "room_number": "101", "room_type": "triple"},  # duplicate
+    ]})
+    assert response.json() == {"created": 3, "skipped": 1}
+
+    start = datetime.now(timezone.utc) - timedelta(days=1)
+    applicants = []
+    for i, (room_type, needs) in enumerate([
+        (RoomType.DOUBLE, None),
+        (RoomType.SINGLE, None),
+        (RoomType.DOUBLE, "Wheelchair user"),
+        (RoomType.SINGLE, None),
+        (RoomType.DOUBLE, "Vegetarian mess"),
+    ]):
+        student, _ = await make_user(university_id=admin.university_id)
+        application = HostelApplication(
+            user_id=student.id, university_id=admin.university_id, room_type_preference=room_type,
+            special_requirements=needs, status=ApplicationStatus.PENDING, created_at=start + timedelta(minutes=i),
+        )
+        db_session.add(application)
+        applicants.append(application)
+    await db_session.flush()
+    ids = [str(a.id) for a in applicants]
+
+    dry = (await client.post("/api/v1/hostel/allocate/batch", headers=headers, json={"dry_run": True})).json()
+    assert dry["allocated"] == 4
+
+    statements = []
+    record = lambda conn, cursor, sql, params, context, executemany: statements.append(sql)
+    event.listen(db_session.bind.sync_engine, "before_cursor_execute", record)
+    try:
+        result = (await client.post("/api/v1/hostel/allocate/batch", headers=headers, json={})).json()
+    finally:
+        event.remove(db_session.bind.sync_engine, "before_cursor_execute", record)
+    assert len([s for s in statements if s.startswith("UPDATE hostel_applications")]) == 1
+
+    rooms = {a["application_id"]: a["room_number"] for a in result["allocations"]}
+    assert result["allocated"] == 4
+    assert rooms[ids[2]] == "001"  # accessible room, served first
+    assert rooms[ids[0]] == rooms[ids[4]] == "101"  # roommates packed
+    assert rooms[ids[1]] == "102"
+    assert result["unallocated_application_ids"] == [ids[3]]
+
+    db_session.expire_all()
+    statuses = (await db_session.execute(
+        select(HostelApplication.status).order_by(HostelApplication.created_at)
+    )).scalars().all()
+    assert statuses.count(ApplicationStatus.ALLOCATED) == 4
+
+    inventory = (await client.get("/api/v1/hostel/rooms", headers=headers)).json()
+    assert (inventory["total_beds"], inventory["occupied_beds"]) == (5, 4)
+
+    # The last free bed is in the accessible room; a manual allocation to a full room is refused
+    response = await client.put(
+        f"/api/v1/hostel/{ids[3]}/allocate", headers=headers,
+        json={"status": "allocated", "allocated_block": "A", "allocated_room_number": "102"},
+    )
+    assert response.status_code == 409
+    fallback = (await client.post(
+        "/api/v1/hostel/allocate/batch", headers=headers, json={"allow_other_room_types": True},
+    )).json()
+    assert [a["room_number"] for a in fallback["allocations"]] == ["001"]
@@ -0,0 +1,179 @@
+"""
+LLM gateway tests: concurrency limits, circuit breaker, fake provider and response cache.
+"""
+
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.cache import cache_stats
+from app.services.chat_service import _classify_intent, _response_cache_key
+from app.services.llm_provider import (
+    CircuitBreaker,
+    FakeLLMProvider,
+    LLMGateway,
+    LLMProvider,
+    LLMUnavailable,
+    set_llm,
+)
+
+
+class FailingProvider(LLMProvider):
+    name = "failing"
+
+    async def complete(self, messages, max_tokens, temperature):
+        raise ConnectionError("upstream down")
+
+    async def stream(self, messages, max_tokens, temperature):
+        raise ConnectionError("upstream down")
+        yield ""
+
+
+def _gateway(provider: LLMProvider, **overrides) -> LLMGateway:
+    options = dict(tenant_concurrency=2, queue_timeout=0.05, timeout=1.0)
+    options.update(overrides)
+    breaker = CircuitBreaker(failure_rate=0.5, min_calls=3, window=10, cooldown=60)
+    return LLMGateway(provider, breaker=breaker, **options)
+
+
+MESSAGES = [{"role": "user", "content": "hostel status?"}]
+
+
+@pytest.mark.asyncio
+async def test_tenant_concurrency_is_bounded():
+    gateway = _gateway(FakeLLMProvider(latency=0.2))
+
+    results = await asyncio.gather(
+        *(gateway.complete("uni-a", MESSAGES) for _ in range(3)),
+        gateway.complete("uni-b", MESSAGES),
+        return_exceptions=True,
+    )
+    rejected = [r for r in results if isinstance(r, LLMUnavailable)]
+    assert len(rejected) == 1  # third call for uni-a found no free slot
+    assert results[3] == "You asked: hostel status?"  # other tenants are unaffected
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_and_fails_fast():
+    provider = FailingProvider()
+    gateway = _gateway(provider)
+    for _ in range(3):
+        with pytest.raises(LLMUnavailable):
+            await gateway.complete("uni-a", MESSAGES)
+    assert gateway.breaker.state == CircuitBreaker.OPEN
+
+    gateway.provider = FakeLLMProvider()
+    with pytest.raises(LLMUnavailable, match="circuit open"):
+        await gateway.complete("uni-a", MESSAGES)
+    assert gateway.provider.calls == 0
+
+    gateway.breaker.cooldown = 0  # half-open: one trial call closes the breaker
+    assert await gateway.complete("uni-a", MESSAGES) == "You asked: hostel status?"
+    assert gateway.breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_cancelled_trial_call_frees_the_half_open_slot():
+    gateway = _gateway(FailingProvider())
+    for _ in range(3):
+        with pytest.raises(LLMUnavailable):
+            await gateway.complete("uni-a", MESSAGES)
+    gateway.breaker.cooldown = 0
+    gateway.provider = FakeLLMProvider(latency=5)
+
+    trial = asyncio.create_task(gateway.complete("uni-a", MESSAGES))
+    await asyncio.sleep(0.01)
+    trial.cancel()  # e.g. the client disconnected
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+
+    gateway.provider = FakeLLMProvider()
+    assert await gateway.complete("uni-a", MESSAGES) == "You asked: hostel status?"
+    assert gateway.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_late_outcomes_from_before_the_breaker_opened_are_ignored():
+    breaker = CircuitBreaker(failure_rate=0.5, min_calls=3, window=10, cooldown=60)
+    early_success, early_failure = breaker.allow(), breaker.allow()
+    for _ in range(3):
+        breaker.record_failure(breaker.allow())
+    assert breaker.state == CircuitBreaker.OPEN
+
+    breaker.record_success(early_success)  # finished late, during the cooldown
+    assert breaker.state == CircuitBreaker.OPEN
+
+    breaker.cooldown = 0
+    trial = breaker.allow()
+    assert trial.trial
+    breaker.record_failure(early_failure)  # must not end the running trial
+    assert breaker.allow() is None
+    breaker.record_success(trial)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.stats()["recent_calls"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_times_out_per_chunk():
+    gateway = _gateway(FakeLLMProvider(latency=1.0), timeout=0.05)
+    with pytest.raises(LLMUnavailable):
+        async for _ in gateway.stream("uni-a", MESSAGES):
+            pass
+    assert gateway.breaker.stats()["recent_failures"] == 1
+
+
+@pytest.mark.asyncio
+async def test_chat_uses_configured_provider(client: AsyncClient, make_user):
+    _, headers = await make_user()
+    set_llm(_gateway(FakeLLMProvider()))
+    try:
+        response = await client.post(
+            "/api/v1/chat/message", headers=headers, json={"message": "when is orientation?"}
+        )
+    finally:
+        set_llm(None)
+    assert response.status_code == 200
+    replies = [m["content"] for m in response.json()["messages"] if m["role"] == "assistant"]
+    assert replies == ["You asked: when is orientation?"]
+
+
+@pytest.mark.asyncio
+async def test_intent_replies_cached_until_student_data_changes(client: AsyncClient, make_user):
+    user, headers = await make_user()
+    provider = FakeLLMProvider()
+    set_llm(_gateway(provider))
+
+    async def ask(message: str) -> str:
+        response = await client.post("/api/v1/chat/message", headers=headers, json={"message": message})
+        return response.json()["messages"][-1]["content"]
+
+    try:
+        await ask("is my hostel allotted?")
+        await ask("is my hostel allotted?")
+        await ask("what is the capital of France?")  # no intent: never cached
+        assert provider.calls == 2
+
+        await client.post(
+            "/api/v1/hostel/apply", headers=headers, json={"room_type_preference": "single"}
+        )
+        await ask("is my hostel allotted?")
+        assert provider.calls == 3
+    finally:
+        set_llm(None)
+
+    stats = cache_stats()["chat_responses"]["by_label"][str(user.university_id)]
+    assert stats == {"hits": 1, "misses": 2, "hit_rate": 0.3333}
+
+
+def test_intents_match_whole_words_and_cache_keys_are_per_question():
+    assert _classify_intent("Which day is orientation?") is None
+    assert _classify_intent("What is the exam schedule this week?") is None
+    assert _classify_intent("How do I update my profile?") is None
+    assert _classify_intent("Can you show the classroom for maths?") is None
+    assert _classify_intent("Hi there") == "greeting"
+    assert _classify_intent("Are my fees paid?") == "payments"
+    assert _classify_intent("which rooms are free in the hostel") == "hostel"
+
+    key = _response_cache_key("Is my hostel allotted?", "ctx", "t")
+    assert key == _response_cache_key("is my  hostel allotted", "ctx", "t")
+    assert key != _response_cache_key("How much is the hostel fee?", "ctx", "t")
@@ -0,0 +1,265 @@
+"""
+Mentor matching tests.
+"""
+
+import asyncio
+import json
+import uuid
+from contextlib import asynccontextmanager
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_unit_of_work, run_post_commit
+from app.main import app
+from app.models.mentor import MentorAssignment
+from app.models.user import UserRole
+from app.services import mentor_service
+from app.services.mentor_service import MentorSlot, match_mentors
+
+
+def test_match_mentors_prefers_course_mentors_and_balances_load():
+    cse, ece = uuid.uuid4(), uuid.uuid4()
+    mentors = [
+        MentorSlot(id=uuid.uuid4(), name="CSE", capacity=3, load=0, courses=frozenset({cse})),
+        MentorSlot(id=uuid.uuid4(), name="Any 1", capacity=4, load=2),
+        MentorSlot(id=uuid.uuid4(), name="Any 2", capacity=4, load=0),
+    ]
+    students = [(uuid.uuid4(), cse) for _ in range(5)] + [(uuid.uuid4(), ece) for _ in range(4)]
+
+    matches = match_mentors(students, mentors)
+
+    assert len(matches) == 9
+    assert [matches[s] for s, _ in students[:3]] == [mentors[0].id] * 3  # course mentor first, up to capacity
+    assert [m.load for m in mentors] == [3, 4, 4]
+    assert all(matches[s] != mentors[0].id for s, _ in students[5:])  # covers CSE only
+
+
+@pytest.mark.asyncio
+async def test_assign_batch_single_insert_and_reactivation(
+    client: AsyncClient, db_session: AsyncSession, make_user
+):
+    admin, headers = await make_user(UserRole.ADMIN)
+    uni = admin.university_id
+    mentor_a, _ = await make_user(UserRole.ADMIN, university_id=uni, first_name="Meera")
+    mentor_b, _ = await make_user(UserRole.ADMIN, university_id=uni, first_name="Vikram")
+    students = [(await make_user(university_id=uni))[0] for _ in range(5)]
+    db_session.add(
+        MentorAssignment(student_id=students[0].id, mentor_id=mentor_a.id, university_id=uni, is_active=True)
+    )
+    # Former assignments to either mentor are reactivated, not duplicated
+    db_session.add_all([
+        MentorAssignment(student_id=s.id, mentor_id=m.id, university_id=uni, is_active=False)
+        for s in students[1:] for m in (mentor_a, mentor_b)
+    ])
+    await db_session.flush()
+
+    statements = []
+    record = lambda conn, cursor, sql, params, context, executemany: statements.append(sql)
+    event.listen(db_session.bind.sync_engine, "before_cursor_execute", record)
+    try:
+        response = await client.post("/api/v1/mentor/assign/batch", headers=headers, json={
+            "mentors": [{"mentor_id": str(mentor_a.id), "capacity": 3}, {"mentor_id": str(mentor_b.id), "capacity": 2}],
+        })
+    finally:
+        event.remove(db_session.bind.sync_engine, "before_cursor_execute", record)
+    assert response.status_code == 200
+    result = response.json()
+    assert result["assigned"] == 4
+    assert result["unassigned_student_ids"] == []
+    loads = {m["mentor_name"].split()[0]: (m["students"], m["assigned"]) for m in result["mentors"]}
+    assert loads == {"Meera": (3, 2), "Vikram": (2, 2)}
+    assert len([s for s in statements if s.startswith("INSERT INTO mentor_assignments")]) == 1
+    assert len([s for s in statements if s.startswith("SELECT") and "mentor_assignments" in s]) == 2
+
+    student_ids = sorted(s.id for s in students)
+    db_session.expire_all()
+    rows = (await db_session.execute(select(MentorAssignment.student_id, MentorAssignment.is_active))).all()
+    assert len(rows) == 9
+    assert sorted(s for s, active in rows if active) == student_ids
+
+    again = (await client.post("/api/v1/mentor/assign/batch", headers=headers, json={})).json()
+    assert again["assigned"] == 0
+
+
+@pytest.mark.asyncio
+async def test_assign_batch_default_pool_is_mentor_roles(client: AsyncClient, make_user):
+    admin, headers = await make_user(UserRole.ADMIN)
+    uni = admin.university_id
+    mentor, _ = await make_user(UserRole.MENTOR, university_id=uni)  # new: no assignments yet
+    students = [(await make_user(university_id=uni))[0] for _ in range(3)]
+
+    # No assignments exist in this tenant yet: the pool still comes from roles
+    response = await client.post("/api/v1/mentor/assign/batch", headers=headers, json={"default_capacity": 2})
+    assert response.status_code == 200
+    result = response.json()
+    assert result["assigned"] == 3
+    pool = {m["mentor_id"] for m in result["mentors"]}
+    assert pool == {str(mentor.id), str(admin.id)}
+    assert not pool & {str(s.id) for s in students}
+
+
+@pytest.mark.asyncio
+async def test_assign_batch_rejects_students_listed_as_mentors(client: AsyncClient, make_user):
+    admin, headers = await make_user(UserRole.ADMIN)
+    student, _ = await make_user(university_id=admin.university_id)
+    response = await client.post("/api/v1/mentor/assign/batch", headers=headers, json={
+        "mentors": [{"mentor_id": str(admin.id)}, {"mentor_id": str(student.id)}],
+    })
+    assert response.status_code == 400
+    assert str(student.id) in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_messages_paginate_and_mark_read_in_one_update(
+    client: AsyncClient, db_session: AsyncSession, make_user
+):
+    mentor, mentor_headers = await make_user(UserRole.ADMIN)
+    student, student_headers = await make_user(university_id=mentor.university_id)
+    assignment = MentorAssignment(student_id=student.id, mentor_id=mentor.id, university_id=mentor.university_id)
+    db_session.add(assignment)
+    await db_session.flush()
+    url = f"/api/v1/mentor/{assignment.id}/messages"
+    for i in range(5):
+        await client.post(url, headers=student_headers, json={"content": f"message {i}"})
+
+    students = (await client.get("/api/v1/mentor/students", headers=mentor_headers)).json()
+    assert students["assignments"][0]["unread_messages"] == 5
+
+    statements = []
+    record = lambda conn, cursor, sql, params, context, executemany: statements.append(sql)
+    event.listen(db_session.bind.sync_engine, "before_cursor_execute", record)
+    try:
+        page = (await client.get(url, headers=mentor_headers, params={"limit": 2})).json()
+    finally:
+        event.remove(db_session.bind.sync_engine, "before_cursor_execute", record)
+    assert [m["content"] for m in page["messages"]] == ["message 3", "message 4"]
+    assert all(m["is_read"] and m["sender_name"] == "Asha Rao" for m in page["messages"])
+    assert len([s for s in statements if s.startswith("UPDATE mentor_messages")]) == 1
+
+    older = (await client.get(url, headers=mentor_headers, params={"limit": 2, "cursor": page["next_cursor"]})).json()
+    assert [m["content"] for m in older["messages"]] == ["message 1", "message 2"]
+    last = (await client.get(url, headers=mentor_headers, params={"limit": 2, "cursor": older["next_cursor"]})).json()
+    assert [m["content"] for m in last["messages"]] == ["message 0"]
+    assert last["next_cursor"] is None
+
+    students = (await client.get("/api/v1/mentor/students", headers=mentor_headers)).json()
+    assert students["assignments"][0]["unread_messages"] == 0
+    mine = (await client.get(url, headers=student_headers)).json()
+    assert mine["total"] == 5
+    assert (await client.get(url, headers=mentor_headers, params={"cursor": "bogus"})).status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_message_stands_when_the_broker_is_down(
+    client: AsyncClient, db_session: AsyncSession, make_user, monkeypatch, caplog
+):
+    mentor, _ = await make_user(UserRole.ADMIN)
+    student, student_headers = await make_user(university_id=mentor.university_id)
+    assignment = MentorAssignment(student_id=student.id, mentor_id=mentor.id, university_id=mentor.university_id)
+    db_session.add(assignment)
+    await db_session.flush()
+
+    class DownHub:
+        async def publish(self, channel, event):
+            raise ConnectionError("broker unavailable")
+
+    monkeypatch.setattr(mentor_service, "get_hub", lambda: DownHub())
+    response = await client.post(
+        f"/api/v1/mentor/{assignment.id}/messages", headers=student_headers, json={"content": "Hello"},
+    )
+    assert response.status_code == 200
+    with caplog.at_level("WARNING", logger=mentor_service.__name__):
+        await run_post_commit(db_session)
+    assert "Publishing message event" in caplog.text
+
+
+class _Socket:
+    """Drives the app's ASGI WebSocket protocol on the test's event loop."""
+
+    def __init__(self, path: str, token: str):
+        self.inbox: asyncio.Queue = asyncio.Queue()
+        self.outbox: asyncio.Queue = asyncio.Queue()
+        scope = {
+            "type": "websocket", "asgi": {"version": "3.0"}, "scheme": "ws", "path": path, "root_path": "",
+            "query_string": f"token={token}".encode(), "headers": [], "subprotocols": [],
+            "server": ("test", 80), "client": ("test", 1234),
+        }
+        self.task = asyncio.create_task(app(scope, self.inbox.get, self.outbox.put))
+
+    async def connect(self) -> dict:
+        await self.inbox.put({"type": "websocket.connect"})
+        return await asyncio.wait_for(self.outbox.get(), 2)
+
+    async def send_json(self, data: dict) -> None:
+        await self.inbox.put({"type": "websocket.receive", "text": json.dumps(data)})
+
+    async def receive_json(self) -> dict:
+        message = await asyncio.wait_for(self.outbox.get(), 2)
+        return json.loads(message["text"])
+
+    async def close(self) -> None:
+        await self.inbox.put({"type": "websocket.disconnect", "code": 1000})
+        await asyncio.wait_for(self.task, 2)
+
+
+@pytest.mark.asyncio
+async def test_message_socket_pushes_messages_and_read_receipts(db_session: AsyncSession, make_user):
+    mentor, mentor_headers = await make_user(UserRole.ADMIN)
+    student, student_headers = await make_user(university_id=mentor.university_id)
+    outsider, outsider_headers = await make_user(university_id=mentor.university_id)
+    assignment = MentorAssignment(student_id=student.id, mentor_id=mentor.id, university_id=mentor.university_id)
+    db_session.add(assignment)
+    await db_session.flush()
+
+    @asynccontextmanager
+    async def unit_of_work():
+        yield db_session
+        await db_session.flush()
+        await run_post_commit(db_session)
+
+    app.dependency_overrides[get_unit_of_work] = lambda: unit_of_work
+    path = f"/api/v1/mentor/{assignment.id}/ws"
+    token = lambda headers: headers["Authorization"].split()[1]
+    try:
+        rejected = _Socket(path, token(outsider_headers))
+        assert (await rejected.connect())["type"] == "websocket.close"
+
+        mentor_socket, student_socket = _Socket(path, token(mentor_headers)), _Socket(path, token(student_headers))
+        assert (await mentor_socket.connect())["type"] == "websocket.accept"
+        assert (await student_socket.connect())["type"] == "websocket.accept"
+
+        await student_socket.send_json({"type": "message", "content": "Can we meet tomorrow?"})
+        for socket in (mentor_socket, student_socket):
+            event = await socket.receive_json()
+            assert event["type"] == "message"
+            assert event["message"]["content"] == "Can we meet tomorrow?"
+            assert event["message"]["sender_id"] == str(student.id)
+
+        await mentor_socket.send_json({"type": "read"})
+        for socket in (student_socket, mentor_socket):
+            receipt = await socket.receive_json()
+            assert receipt["type"] == "read" and receipt["reader_id"] == str(mentor.id)
+
+        await student_socket.send_json({"type": "message", "content": ""})
+        assert (await student_socket.receive_json())["type"] == "error"
+
+        # Service errors come back as events; the socket stays open
+        assignment.student_id = outsider.id
+        await db_session.flush()
+        await student_socket.send_json({"type": "message", "content": "Still there?"})
+        assert await student_socket.receive_json() == {"type": "error", "detail": "Not part of this assignment"}
+
+        # A sender deactivated since connecting is disconnected
+        mentor.is_active = False
+        await db_session.flush()
+        await mentor_socket.send_json({"type": "message", "content": "Hello"})
+        closed = await asyncio.wait_for(mentor_socket.outbox.get(), 2)
+        assert closed == {"type": "websocket.close", "code": 1008, "reason": ""}
+
+        await mentor_socket.close()
+        await student_socket.close()
+    finally:
+        app.dependency_overrides.pop(get_unit_of_work, None)
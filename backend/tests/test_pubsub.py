@@ -0,0 +1,26 @@
+"""
+Pub/sub hub tests.
+"""
+
+import pytest
+
+from app.core.pubsub import PubSubHub, SlowConsumer
+
+
+@pytest.mark.asyncio
+async def test_hub_fans_out_and_cuts_off_slow_consumers():
+    hub = PubSubHub(queue_size=2)
+    async with hub.subscribe("thread") as fast, hub.subscribe("thread") as slow, hub.subscribe("other") as other:
+        await hub.publish("thread", {"n": 1})
+        assert await fast.get() == {"n": 1}
+        await hub.publish("thread", {"n": 2})
+        await hub.publish("thread", {"n": 3})
+
+        # `slow` never read: its third event overflows the queue
+        assert [await fast.get(), await fast.get()] == [{"n": 2}, {"n": 3}]
+        with pytest.raises(SlowConsumer):
+            await slow.get()
+        assert other._queue.empty()
+        assert hub.stats()["dropped"] == 1
+        assert hub.stats()["subscribers"] == 3
+    assert hub.stats()["channels"] == 0
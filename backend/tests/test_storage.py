@@ -0,0 +1,171 @@
+"""
+Storage backend tests (against the in-process object store stand-in).
+"""
+
+import asyncio
+import time
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import get_cache
+from app.database import run_post_commit
+from app.models.document import StoredBlob
+from app.models.user import UserRole
+from app.services import storage_service
+from app.services.storage_backends import LocalStorage, SupabaseSDKStorage, SupabaseStorage, set_storage
+from tests.object_store import FakeObjectStore
+
+SUPABASE_URL = "https://stub.supabase.co"
+
+
+@pytest_asyncio.fixture
+async def object_store(tmp_path):
+    store = FakeObjectStore()
+    backend = SupabaseStorage(
+        SUPABASE_URL, store.service_key, timeout=5, max_connections=4, transport=store.transport(),
+    )
+    set_storage(backend, LocalStorage(str(tmp_path)))
+    yield store
+    set_storage(None)
+    await backend.aclose()
+
+
+@pytest.mark.asyncio
+async def test_supabase_backend_streams_upload_and_deletes(
+    client: AsyncClient, db_session: AsyncSession, make_user, object_store, monkeypatch, tmp_path
+):
+    monkeypatch.setattr("app.services.storage_service.settings.UPLOAD_CHUNK_SIZE", 16 * 1024)
+    student, headers = await make_user(UserRole.STUDENT)
+    body = b"%PDF-1.4 " + bytes(range(256)) * 400
+    response = await client.post(
+        "/api/v1/documents/upload", headers=headers,
+        data={"document_type": "marksheet"},
+        files={"file": ("marks.pdf", body, "application/pdf")},
+    )
+    assert response.status_code == 200, response.text
+
+    blob = (await db_session.execute(select(StoredBlob))).scalar_one()
+    assert object_store.objects[("documents", blob.storage_path)] == (body, "application/pdf")
+    assert len(object_store.chunks_received) > 1  # sent as it was read
+    assert response.json()["file_url"] == f"{SUPABASE_URL}/storage/v1/object/public/documents/{blob.storage_path}"
+    assert not list(tmp_path.rglob("*.*"))  # nothing fell back to local disk
+
+    response = await client.get(f"/api/v1/documents/{response.json()['id']}/file", headers=headers)
+    assert response.status_code == 307
+    assert response.headers["location"].startswith(f"{SUPABASE_URL}/storage/v1/object/sign/documents/{blob.storage_path}")
+
+    [document_id] = [d["id"] for d in (await client.get("/api/v1/documents", headers=headers)).json()["documents"]]
+    response = await client.delete(f"/api/v1/documents/{document_id}", headers=headers)
+    assert response.status_code == 200
+    await run_post_commit(db_session)
+    assert object_store.objects == {}
+
+
+@pytest.mark.asyncio
+async def test_remote_failure_falls_back_to_local(
+    client: AsyncClient, make_user, object_store, tmp_path
+):
+    object_store.service_key = "rotated"  # every remote call is now rejected
+    _, headers = await make_user(UserRole.STUDENT)
+    response = await client.post(
+        "/api/v1/documents/upload", headers=headers,
+        data={"document_type": "photo"},
+        files={"file": ("me.png", b"\x89PNG...", "image/png")},
+    )
+    assert response.status_code == 200
+    url = response.json()["file_url"]
+    assert url == f"/api/v1/documents/{response.json()['id']}/file"
+    response = await client.get(url, headers=headers)
+    assert response.content == b"\x89PNG..."
+    assert [p.name for p in tmp_path.rglob("*.png")]
+
+
+class _BlockingBucket:
+    def __init__(self, uploaded: dict):
+        self.uploaded = uploaded
+
+    def upload(self, path, file, file_options):
+        time.sleep(0.2)  # a blocking network call
+        with open(file, "rb") as f:
+            self.uploaded[path] = f.read()
+
+    def get_public_url(self, path):
+        return f"{SUPABASE_URL}/storage/v1/object/public/documents/{path}"
+
+
+class _BlockingClient:
+    def __init__(self):
+        self.uploaded: dict = {}
+        self.storage = self
+
+    def from_(self, bucket):
+        return _BlockingBucket(self.uploaded)
+
+
+@pytest.mark.asyncio
+async def test_sdk_backend_keeps_event_loop_free():
+    sdk = _BlockingClient()
+    backend = SupabaseSDKStorage(sdk, threads=4)
+
+    async def body():
+        yield b"abc"
+        yield b"def"
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    urls = await asyncio.gather(*(backend.put("documents", f"a/{i}.pdf", body(), "application/pdf") for i in range(4)))
+    elapsed = time.perf_counter() - started
+    task.cancel()
+    await backend.aclose()
+
+    assert sdk.uploaded == {f"a/{i}.pdf": b"abcdef" for i in range(4)}
+    assert urls[0].endswith("/documents/a/0.pdf")
+    assert elapsed < 0.6  # the four uploads ran side by side
+    assert ticks >= 10  # and the loop kept running meanwhile
+
+
+@pytest.mark.asyncio
+async def test_admin_document_list_signs_a_page_in_one_call_then_reuses(
+    client: AsyncClient, make_user, object_store, monkeypatch
+):
+    await get_cache("signed_urls").clear()
+    admin, admin_headers = await make_user(UserRole.ADMIN)
+    for i in range(3):
+        _, headers = await make_user(UserRole.STUDENT, university_id=admin.university_id)
+        response = await client.post(
+            "/api/v1/documents/upload", headers=headers,
+            data={"document_type": "marksheet"},
+            files={"file": ("marks.pdf", f"%PDF-1.4 student {i}".encode(), "application/pdf")},
+        )
+        assert response.status_code == 200
+
+    def sign_calls() -> int:
+        return sum(1 for method, path in object_store.requests if "/object/sign/" in path)
+
+    response = await client.get("/api/v1/admin/documents", headers=admin_headers)
+    first = [d["signed_url"] for d in response.json()["documents"]]
+    assert len(first) == 3 and all(url.startswith(f"{SUPABASE_URL}/storage/v1/object/sign/") for url in first)
+    assert sign_calls() == 1
+
+    response = await client.get("/api/v1/admin/documents", headers=admin_headers)
+    assert [d["signed_url"] for d in response.json()["documents"]] == first
+    assert sign_calls() == 1  # served from the cache
+
+    # Inside the refresh margin the URLs are signed afresh, again in one call
+    later = time.time() + 3600 - 60
+    monkeypatch.setattr(storage_service.time, "time", lambda: later)
+    response = await client.get("/api/v1/admin/documents", headers=admin_headers)
+    assert sign_calls() == 2
+    assert not set(d["signed_url"] for d in response.json()["documents"]) & set(first)
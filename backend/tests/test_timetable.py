@@ -0,0 +1,177 @@
+"""
+Timetable tests.
+"""
+
+import uuid
+from datetime import time
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import get_cache
+from app.models.course import Enrollment
+from app.models.user import UserRole
+from app.services import timetable_service
+from app.services.timetable_generator import Room, SubjectDemand, TimetableProblem, generate_timetable
+
+
+async def _enroll(db_session: AsyncSession, user, course, subjects) -> None:
+    db_session.add_all([
+        Enrollment(user_id=user.id, course_id=course.id, subject_id=s.id, university_id=user.university_id)
+        for s in subjects
+    ])
+    await db_session.flush()
+
+
+@pytest.mark.asyncio
+async def test_weekly_timetable_shared_across_subject_sets_and_invalidated(
+    client: AsyncClient, db_session: AsyncSession, make_user, make_course
+):
+    admin, admin_headers = await make_user(UserRole.ADMIN)
+    course, subjects = await make_course(admin.university_id)
+    first, first_headers = await make_user(university_id=admin.university_id)
+    second, second_headers = await make_user(university_id=admin.university_id)
+    await _enroll(db_session, first, course, subjects[:2])
+    await _enroll(db_session, second, course, list(reversed(subjects[:2])))
+
+    response = await client.post(
+        "/api/v1/timetable/schedules", headers=admin_headers,
+        json={"subject_id": str(subjects[0].id), "day_of_week": "monday",
+              "start_time": "10:00", "end_time": "11:30", "room": "A1"},
+    )
+    assert response.status_code == 200
+
+    cache = get_cache("timetable")
+    hits = cache.hits
+    first_view = (await client.get("/api/v1/timetable/weekly", headers=first_headers)).json()
+    second_view = (await client.get("/api/v1/timetable/weekly", headers=second_headers)).json()
+    assert first_view == second_view
+    assert cache.hits == hits + 1
+    assert first_view["total_hours"] == 1.5
+    assert first_view["days"][0]["entries"][0]["subject_code"] == subjects[0].code
+
+    schedule_id = first_view["days"][0]["entries"][0]["schedule_id"]
+    await client.put(
+        f"/api/v1/timetable/schedules/{schedule_id}", headers=admin_headers,
+        json={"day_of_week": "tuesday"},
+    )
+    view = (await client.get("/api/v1/timetable/weekly", headers=first_headers)).json()
+    assert view["days"][0]["entries"] == []
+    assert view["days"][1]["entries"][0]["room"] == "A1"
+
+
+async def _schedule(client: AsyncClient, headers: dict, subject, day: str, start: str, end: str, **fields):
+    return await client.post(
+        "/api/v1/timetable/schedules", headers=headers,
+        json={"subject_id": str(subject.id), "day_of_week": day, "start_time": start, "end_time": end, **fields},
+    )
+
+
+@pytest.mark.asyncio
+async def test_double_booking_rejected_back_to_back_allowed(client: AsyncClient, make_user, make_course):
+    admin, headers = await make_user(UserRole.ADMIN)
+    _, subjects = await make_course(admin.university_id)
+
+    assert (await _schedule(client, headers, subjects[0], "monday", "09:00", "10:00",
+                            room="Lab 1", instructor="Dr. Rao")).status_code == 200
+
+    response = await _schedule(client, headers, subjects[1], "monday", "09:30", "10:30", room="  lab 1 ")
+    assert response.status_code == 409
+    conflict = response.json()["detail"]["conflicts"][0]
+    assert conflict["kind"] == "room"
+    assert conflict["overlap_start"].startswith("09:30")
+    assert conflict["overlap_end"].startswith("10:00")
+
+    response = await _schedule(client, headers, subjects[1], "monday", "09:45", "11:00",
+                               room="Lab 2", instructor="dr. rao")
+    assert [c["kind"] for c in response.json()["detail"]["conflicts"]] == ["instructor"]
+
+    # Half-open slots: ending at 10:00 and starting at 10:00 share nothing
+    assert (await _schedule(client, headers, subjects[1], "monday", "10:00", "11:00",
+                            room="Lab 1", instructor="Dr. Rao")).status_code == 200
+    assert (await _schedule(client, headers, subjects[2], "monday", "11:00", "10:00")).status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_validate_reports_student_clashes(
+    client: AsyncClient, db_session: AsyncSession, make_user, make_course
+):
+    admin, headers = await make_user(UserRole.ADMIN)
+    course, subjects = await make_course(admin.university_id)
+    for _ in range(2):
+        student, _ = await make_user(university_id=admin.university_id)
+        await _enroll(db_session, student, course, subjects[:2])
+    student, student_headers = await make_user(university_id=admin.university_id)
+    await _enroll(db_session, student, course, [subjects[0], subjects[2]])
+
+    await _schedule(client, headers, subjects[0], "wednesday", "09:00", "10:00", room="A1")
+    await _schedule(client, headers, subjects[1], "wednesday", "09:30", "10:30", room="A2")
+    await _schedule(client, headers, subjects[2], "wednesday", "10:00", "11:00", room="A3")
+
+    report = (await client.get("/api/v1/timetable/validate", headers=headers)).json()
+    assert report["total_schedules"] == 3
+    assert report["is_valid"] is False
+    assert report["room_conflicts"] == report["instructor_conflicts"] == []
+    [clash] = report["student_clashes"]
+    assert sorted(clash["subject_codes"]) == [subjects[0].code, subjects[1].code]
+    assert clash["students_affected"] == 2
+
+    view = (await client.get("/api/v1/timetable/weekly", headers=student_headers)).json()
+    assert view["clashes"] == []
+
+
+@pytest.mark.asyncio
+async def test_generate_applies_clash_free_timetable(
+    client: AsyncClient, db_session: AsyncSession, make_user, make_course
+):
+    admin, headers = await make_user(UserRole.ADMIN)
+    course, subjects = await make_course(admin.university_id, subjects=4)
+    _, electives = await make_course(admin.university_id, subjects=2, code="ELEC")
+    for i in range(3):
+        student, _ = await make_user(university_id=admin.university_id)
+        await _enroll(db_session, student, course, subjects + electives[i % 2:i % 2 + 1])
+    # A fixed booking the generator has to work around
+    await _schedule(client, headers, electives[1], "monday", "09:00", "11:00", room="Hall", instructor="Dr. Iyer")
+
+    response = await client.post(
+        "/api/v1/timetable/generate", headers=headers,
+        json={
+            "rooms": [{"name": "Hall", "capacity": 120}, {"name": "Room 2", "capacity": 3}],
+            "subjects": [{"subject_id": str(s.id), "instructor": "Dr. Iyer" if i < 2 else None}
+                         for i, s in enumerate(subjects + electives[:1])],
+            "days": ["monday", "tuesday", "wednesday", "thursday"],
+            "day_start": "09:00", "day_end": "15:00", "apply": True,
+        },
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert result["unplaced"] == []
+    assert result["sessions_placed"] == result["sessions_requested"] == 15  # 5 subjects x 3 credits
+    assert all(s["room"] == "Room 2" for s in result["schedules"])  # best fit for 3 students
+    assert not [s for s in result["schedules"] if s["day_of_week"] == "monday" and s["start_time"] < "11:00"]
+
+    report = (await client.get("/api/v1/timetable/validate", headers=headers)).json()
+    assert report["total_schedules"] == 16
+    assert report["is_valid"] is True
+
+
+def test_generator_pool_is_shared_spawned_and_closed():
+    pool = timetable_service._get_generator_pool()
+    try:
+        assert timetable_service._get_generator_pool() is pool
+        assert pool._mp_context.get_start_method() == "spawn"
+        problem = TimetableProblem(
+            subjects=[SubjectDemand(uuid.uuid4(), f"CS10{i}", 2, students=30) for i in range(3)],
+            rooms=[Room("Hall", 60)],
+            days=["monday", "tuesday"],
+            day_start=time(9, 0),
+            day_end=time(12, 0),
+            period_minutes=60,
+        )
+        result = generate_timetable(problem, attempts=2, pool=pool)
+        assert result.attempts == 2
+        assert result.unplaced == {}
+    finally:
+        timetable_service.close_generator_pool()
+    assert timetable_service._generator_pool is None
@@ -187,13 +187,6 @@ export default function AdminDocumentsPage() {
     }
   };
 
-  const getFileUrl = (url: string) => {
-    if (!url) return "#";
-    if (url.startsWith("http")) return url;
-    const base = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
-    return `${base}${url}`;
-  };
-
   return (
     <div className="space-y-6">
       <div>
@@ -341,16 +334,14 @@ export default function AdminDocumentsPage() {
                     </td>
                     <td className="py-3 px-2">
                       <div className="flex gap-1.5 items-center">
-                        <a
-                          href={getFileUrl(doc.file_url)}
-                          target="_blank"
-                          rel="noopener noreferrer"
+                        <Button
+                          size="sm"
+                          variant="ghost"
                           title="Preview document"
+                          onClick={() => documentService.openFile(doc).catch(() => {})}
                         >
-                          <Button size="sm" variant="ghost">
-                            <Eye className="h-3.5 w-3.5" />
-                          </Button>
-                        </a>
+                          <Eye className="h-3.5 w-3.5" />
+                        </Button>
 
                         {doc.status === "pending" && (
                           <Button
@@ -5,7 +5,7 @@ import { Input } from "@/components/ui/input";
 import { Skeleton } from "@/components/ui/skeleton";
 import {
     chatService,
-    type ChatSessionResponse,
+    type ChatSessionSummary,
 } from "@/services/campus-services";
 import { demoChatSessions, withDemoFallback } from "@/services/demo-data";
 import {
@@ -27,7 +27,7 @@ interface Message {
 
 export default function ChatPage() {
   const [messages, setMessages] = useState<Message[]>([]);
-  const [sessions, setSessions] = useState<ChatSessionResponse[]>([]);
+  const [sessions, setSessions] = useState<ChatSessionSummary[]>([]);
   const [activeSessionId, setActiveSessionId] = useState<string | null>(null);
   const [input, setInput] = useState("");
   const [sending, setSending] = useState(false);
@@ -43,15 +43,7 @@ export default function ChatPage() {
       .then((res) => {
         setSessions(res.sessions || []);
         if (res.sessions?.length > 0) {
-          const latest = res.sessions[0];
-          setActiveSessionId(latest.id);
-          setMessages(
-            latest.messages?.map((m) => ({
-              role: m.role,
-              content: m.content,
-              created_at: m.created_at,
-            })) || [],
-          );
+          loadSession(res.sessions[0].id);
         }
       })
       .catch(() => {})
@@ -80,13 +72,15 @@ export default function ChatPage() {
         activeSessionId || undefined,
       );
       setActiveSessionId(res.id);
-      setMessages(
-        res.messages?.map((m) => ({
+      // Response carries only the new user/assistant pair: replace the optimistic message
+      setMessages((prev) => [
+        ...prev.slice(0, -1),
+        ...(res.messages?.map((m) => ({
           role: m.role,
           content: m.content,
           created_at: m.created_at,
-        })) || [],
-      );
+        })) || []),
+      ]);
       // Update sessions list
       const history = await chatService.getHistory();
       setSessions(history.sessions || []);
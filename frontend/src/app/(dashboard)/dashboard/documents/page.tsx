@@ -264,19 +264,14 @@ export default function DocumentsPage() {
                         : "—"}
                     </td>
                     <td className="py-3 px-2">
-                      <a
-                        href={
-                          doc.file_url?.startsWith("http")
-                            ? doc.file_url
-                            : `${process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000"}${doc.file_url}`
-                        }
-                        target="_blank"
-                        rel="noopener noreferrer"
+                      <button
+                        type="button"
+                        onClick={() => documentService.openFile(doc).catch(() => {})}
                         className="inline-flex items-center gap-1 text-primary hover:underline text-xs"
                       >
                         <Download className="h-3 w-3" />
                         View
-                      </a>
+                      </button>
                     </td>
                   </tr>
                 ))}
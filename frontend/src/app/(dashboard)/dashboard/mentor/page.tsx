@@ -12,6 +12,7 @@ import {
     demoMentorMeetings,
     demoMentorMessages,
     demoMentorProfile,
+    isDemoMode,
     withDemoFallback,
 } from "@/services/demo-data";
 import {
@@ -52,6 +53,25 @@ export default function MentorPage() {
     chatEndRef.current?.scrollIntoView({ behavior: "smooth" });
   }, [messages]);
 
+  // Live updates for the open thread instead of re-fetching it
+  useEffect(() => {
+    if (!mentor?.assignment_id || isDemoMode()) return;
+    const socket = mentorService.openThread(mentor.assignment_id, (event) => {
+      if (event.type === "message") {
+        setMessages((prev) =>
+          prev.some((m) => m.id === event.message.id) ? prev : [...prev, event.message],
+        );
+      } else if (event.type === "read") {
+        setMessages((prev) =>
+          prev.map((m) =>
+            m.sender_id !== event.reader_id && m.created_at <= event.up_to ? { ...m, is_read: true } : m,
+          ),
+        );
+      }
+    });
+    return () => socket.close();
+  }, [mentor?.assignment_id]);
+
   const loadMentor = async () => {
     setLoading(true);
     try {
@@ -91,7 +111,7 @@ export default function MentorPage() {
     setSending(true);
     try {
       const msg = await mentorService.sendMessage(mentor.assignment_id, newMsg);
-      setMessages((prev) => [...prev, msg]);
+      setMessages((prev) => (prev.some((m) => m.id === msg.id) ? prev : [...prev, msg]));
       setNewMsg("");
     } catch (e: any) {
       alert(e.message);
@@ -144,6 +144,22 @@ class ApiClient {
 
     return this.handleResponse<T>(response);
   }
+
+  async blob(path: string): Promise<Blob> {
+    const headers: HeadersInit = {};
+    if (typeof window !== "undefined") {
+      const token = localStorage.getItem("access_token");
+      if (token) {
+        headers["Authorization"] = `Bearer ${token}`;
+      }
+    }
+
+    const response = await fetch(`${this.baseUrl}${path}`, { headers });
+    if (!response.ok) {
+      await this.handleResponse(response);
+    }
+    return response.blob();
+  }
 }
 
 export const apiClient = new ApiClient(API_BASE_URL);
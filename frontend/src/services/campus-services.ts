@@ -106,6 +106,26 @@ export const documentService = {
       rejection_reason: rejectionReason,
     });
   },
+
+  /** Open a document's file in a new tab (signed URL, or an authenticated download). */
+  async openFile(doc: { file_url: string; signed_url?: string | null }): Promise<void> {
+    const url = doc.signed_url || doc.file_url;
+    if (!url || url === "#") return;
+    if (url.startsWith("http")) {
+      window.open(url, "_blank", "noopener,noreferrer");
+      return;
+    }
+    // Open the tab before awaiting so popup blockers allow it
+    const tab = window.open("", "_blank");
+    try {
+      const objectUrl = URL.createObjectURL(await apiClient.blob(url));
+      if (tab) tab.location.href = objectUrl;
+      setTimeout(() => URL.revokeObjectURL(objectUrl), 60_000);
+    } catch (e) {
+      tab?.close();
+      throw e;
+    }
+  },
 };
 
 // ─── Payments ─────────────────────────────────────────
@@ -197,11 +217,23 @@ export interface ChatSessionResponse {
   messages: ChatMessage[];
   created_at: string;
   updated_at: string;
+  next_cursor?: string | null;
+}
+
+export interface ChatSessionSummary {
+  id: string;
+  title: string;
+  message_count: number;
+  last_message_preview: string | null;
+  last_message_role: string | null;
+  last_message_at: string | null;
+  created_at: string;
+  updated_at: string;
 }
 
 export interface ChatSessionListResponse {
-  sessions: ChatSessionResponse[];
-  total: number;
+  sessions: ChatSessionSummary[];
+  next_cursor: string | null;
 }
 
 export const chatService = {
@@ -614,6 +646,11 @@ export interface MentorMessage {
   created_at: string;
 }
 
+export type MentorThreadEvent =
+  | { type: "message"; message: MentorMessage }
+  | { type: "read"; reader_id: string; up_to: string }
+  | { type: "error"; detail: string };
+
 export interface MentorAssignment {
   id: string;
   student_id: string;
@@ -670,8 +707,23 @@ export const mentorService = {
   },
   async getMessages(
     assignmentId: string,
-  ): Promise<{ messages: MentorMessage[]; total: number }> {
-    return apiClient.get(`/api/v1/mentor/${assignmentId}/messages`);
+    cursor?: string,
+  ): Promise<{ messages: MentorMessage[]; total: number; next_cursor: string | null }> {
+    const params = cursor ? `?cursor=${encodeURIComponent(cursor)}` : "";
+    return apiClient.get(`/api/v1/mentor/${assignmentId}/messages${params}`);
+  },
+  /** Live thread: pushes new messages and read receipts; returns the socket so callers can close it. */
+  openThread(
+    assignmentId: string,
+    onEvent: (event: MentorThreadEvent) => void,
+  ): WebSocket {
+    const baseUrl = (process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000").replace(/^http/, "ws");
+    const token = localStorage.getItem("access_token") || "";
+    const socket = new WebSocket(
+      `${baseUrl}/api/v1/mentor/${assignmentId}/ws?token=${encodeURIComponent(token)}`,
+    );
+    socket.onmessage = (e) => onEvent(JSON.parse(e.data));
+    return socket;
   },
   async assignMentor(
     studentId: string,
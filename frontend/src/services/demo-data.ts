@@ -16,7 +16,7 @@ import type {
 } from "./campus-services";
 
 // ─── Helper ───────────────────────────────────────────
-function isDemoMode(): boolean {
+export function isDemoMode(): boolean {
   if (typeof window === "undefined") return false;
   const token = localStorage.getItem("access_token") || "";
   return token.endsWith(".demo") || !process.env.NEXT_PUBLIC_API_URL;
@@ -254,7 +254,7 @@ export const demoLMSStatus: LMSStatus = {
 
 export const demoChatSessions: ChatSessionListResponse = {
   sessions: [],
-  total: 0,
+  next_cursor: null,
 };
 
 export const demoOnboardingProgress: OnboardingProgressResponse = {
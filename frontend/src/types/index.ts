@@ -96,6 +96,7 @@ export interface Document {
   user_id: string;
   document_type: string;
   file_url: string;
+  signed_url?: string | null; // time-limited link, set in admin lists
   file_name: string;
   file_size: number;
   mime_type: string;